@@ -0,0 +1,383 @@
+"""
+Offline benchmark for the Eventbrite scrapers in run.py.
+
+Listing and detail pages from benchmarks/fixtures are served by a local
+HTTP server standing in for Eventbrite, with optional injected latency
+and error rates, and the three scrape_eventbrite_* functions are run against
+it. Events/sec, p50/p95 page latency and CPU time per page are printed and
+saved as JSON in benchmarks/results so runs can be compared across commits.
+The fixtures shipped with the repo are synthetic pages written to match
+Eventbrite's markup, 'record' replaces them with live pages.
+
+Usage:
+    python benchmarks/bench_scrapers.py run [--pages 5] [--latency-ms 80]
+        [--jitter-ms 40] [--error-rate 0.0] [--workers 8]
+    python benchmarks/bench_scrapers.py record --location london
+    python benchmarks/bench_scrapers.py compare OLD.json NEW.json
+"""
+import argparse
+import base64
+import glob
+import json
+import multiprocessing
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASE_PLACEHOLDER = '{{BASE}}'
+# Fixtures have every link to Eventbrite replaced with this placeholder,
+# the stand-in server swaps in its own address when serving them
+
+
+def load_fixtures():
+    """
+    Read the fixture pages from the fixtures directory.
+
+    Returns:
+        tuple: The listing page HTML and a list of detail page HTML.
+    """
+    with open(os.path.join(FIXTURES_DIR, 'listing.html'),
+              encoding='utf-8') as listing_file:
+        listing = listing_file.read()
+    details = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'detail_*.html'))):
+        with open(path, encoding='utf-8') as detail_file:
+            details.append(detail_file.read())
+    return listing, details
+
+
+def serve_fixtures(port_queue, latency_ms, jitter_ms, error_rate, seed):
+    """
+    Run the stand-in Eventbrite server, this runs in its own process so
+    its CPU time isn't counted against the scrapers.
+
+    Args:
+        port_queue (multiprocessing.Queue): The server's port is put here
+                                            once it is listening.
+        latency_ms (float): Delay added to every response.
+        jitter_ms (float): Up to this much extra random delay.
+        error_rate (float): Share of responses (0-1) that are a 503.
+        seed (int): Seed for the random latency and errors.
+    """
+    listing, details = load_fixtures()
+    rng = random.Random(seed)
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        """
+        Serves the listing fixture for /d/ URLs and a detail fixture,
+        chosen by event ID, for /e/ URLs.
+        """
+        protocol_version = 'HTTP/1.1'
+        # HTTP/1.1 so the scraper's kept-alive connections are reused
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """
+            Answer a GET request after the injected latency.
+            """
+            time.sleep((latency_ms + rng.uniform(0, jitter_ms)) / 1000)
+            if rng.random() < error_rate:
+                self._send(503, b'Service Unavailable', {'Retry-After': '0'})
+                return
+
+            base = f'http://{self.headers["Host"]}'
+            path = self.path.split('?')[0]
+            if path.startswith('/d/'):
+                page = listing
+            elif path.startswith('/e/'):
+                event_id = re.search(r'(\d+)/?$', path)
+                index = int(event_id.group(1)) if event_id else 0
+                page = details[index % len(details)]
+            else:
+                self._send(404, b'Not Found')
+                return
+            self._send(200, page.replace(BASE_PLACEHOLDER, base).encode(
+                'utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+
+        def _send(self, status, body, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+            # Keep the benchmark output readable
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def import_run():
+    """
+    Import run.py for benchmarking. Runs offline: the disk cache, the
+    crawl state and the MongoDB freshness lookup are turned off, and dummy
+    credentials are used when none are set so the import doesn't need the
+    real services.
+
+    Returns:
+        module: The run module.
+    """
+    os.environ.setdefault('GOOGLE_CREDENTIALS',
+                          base64.b64encode(b'{}').decode())
+    os.environ.setdefault('MONGO_URI', 'mongodb://127.0.0.1:9/'
+                          '?serverSelectionTimeoutMS=200')
+    os.environ['HTTP_CACHE_DIR'] = ''
+    os.environ['CRAWL_STATE_DIR'] = ''
+    os.environ['EVENT_FRESHNESS_HOURS'] = '0'
+    sys.path.insert(0, REPO_DIR)
+    import run  # pylint: disable=import-outside-toplevel
+    return run
+
+
+def percentile(values, percent):
+    """
+    The value below which the given percent of values fall.
+
+    Args:
+        values (list of float): The measurements.
+        percent (float): 0-100.
+
+    Returns:
+        float: The percentile, nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1,
+                      round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def benchmark_scraper(scrape, pages):
+    """
+    Time a scraper over a number of listing pages.
+
+    Args:
+        scrape (function): Takes a page number and returns the scraper's
+                        (event_data, tags_counter, more_events_check).
+        pages (int): How many listing pages to scrape.
+
+    Returns:
+        dict: events, events_per_sec, page latency and CPU time per page.
+    """
+    latencies = []
+    cpu_times = []
+    events = 0
+    started = time.perf_counter()
+    for page_number in range(1, pages + 1):
+        page_started = time.perf_counter()
+        cpu_started = time.process_time()
+        # process_time counts every thread in this process, so the
+        # detail page worker threads are included
+        event_data, _, _ = scrape(page_number)
+        cpu_times.append(time.process_time() - cpu_started)
+        latencies.append(time.perf_counter() - page_started)
+        events += len(event_data)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'pages': pages,
+        'events': events,
+        'elapsed_sec': round(elapsed, 4),
+        'events_per_sec': round(events / elapsed, 2) if elapsed else 0,
+        'page_latency_p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'page_latency_p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'cpu_ms_per_page': round(statistics.mean(cpu_times) * 1000, 1),
+    }
+
+
+def git_commit():
+    """
+    Returns:
+        str: The short hash of the checked out commit, or 'unknown'.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmark(args):
+    """
+    Start the stand-in server, run every scraper against it and save
+    the results.
+
+    Args:
+        args (argparse.Namespace): The command line options.
+    """
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve_fixtures, daemon=True,
+        args=(port_queue, args.latency_ms, args.jitter_ms, args.error_rate,
+              args.seed))
+    server.start()
+    base = f'http://127.0.0.1:{port_queue.get(timeout=10)}'
+
+    run = import_run()
+    run.EVENTBRITE_URL = base
+    run.EVENTBRITE_UK_URL = base
+    run.HTTP_CACHE_DIR = ''
+    run.CRAWL_STATE_DIR = ''
+    run.EVENT_FRESHNESS_HOURS = 0
+    run.LISTING_ONLY = args.listing_only
+    if args.rate_per_host:
+        run.HTTP_RATE_PER_HOST = args.rate_per_host
+    workers = args.workers
+
+    scrapers = {
+        'scrape_eventbrite_events': lambda page: run.scrape_eventbrite_events(
+            'london', '', 'music', page, '', '', max_workers=workers),
+        'scrape_eventbrite_categories':
+            lambda page: run.scrape_eventbrite_categories(
+                'london', 'music', '', page, '', '', max_workers=workers),
+        'scrape_eventbrite_top_events':
+            lambda page: run.scrape_eventbrite_top_events(
+                'london', max_workers=workers),
+    }
+
+    results = {}
+    try:
+        for name, scrape in scrapers.items():
+            results[name] = benchmark_scraper(scrape, args.pages)
+            print(f'{name}: {json.dumps(results[name])}')
+    finally:
+        server.terminate()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'pages': args.pages,
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate,
+            'workers': workers if workers is not None else run.SCRAPE_WORKERS,
+            'listing_only': args.listing_only,
+            'rate_per_host': run.HTTP_RATE_PER_HOST,
+            'html_parser': run.HTML_PARSER,
+            'python': sys.version.split()[0],
+        },
+        'http': run.http_session_stats(),
+        'results': results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f'{datetime.now():%Y%m%d-%H%M%S}_{report["commit"]}.json')
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f'Results saved to {output}')
+
+
+def record_fixtures(args):
+    """
+    Record a live Eventbrite listing page and some of its detail pages as
+    fixtures, with every Eventbrite link swapped for the placeholder.
+
+    Args:
+        args (argparse.Namespace): The command line options.
+    """
+    run = import_run()
+    listing_url = (f'{run.EVENTBRITE_UK_URL}/d/united-kingdom--'
+                   f'{args.location}/events/')
+
+    def to_fixture(html):
+        return re.sub(r'https://www\.eventbrite\.(?:com|co\.uk)',
+                      BASE_PLACEHOLDER, html)
+
+    listing = run.http_get(listing_url)
+    listing.raise_for_status()
+    event_urls = list(dict.fromkeys(re.findall(
+        r'href="(https://www\.eventbrite\.[^"]+/e/[^"]+)"', listing.text)))
+    # dict.fromkeys drops the duplicate card links but keeps their order
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with open(os.path.join(FIXTURES_DIR, 'listing.html'), 'w',
+              encoding='utf-8') as listing_file:
+        listing_file.write(to_fixture(listing.text))
+    for path in glob.glob(os.path.join(FIXTURES_DIR, 'detail_*.html')):
+        os.remove(path)
+    for number, event_url in enumerate(event_urls[:args.details], 1):
+        detail = run.http_get(event_url)
+        detail.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, f'detail_{number}.html'), 'w',
+                  encoding='utf-8') as detail_file:
+            detail_file.write(to_fixture(detail.text))
+    print(f'Recorded the listing page and {min(len(event_urls), args.details)}'
+          f' detail pages to {FIXTURES_DIR}')
+
+
+def compare_results(args):
+    """
+    Print how each scraper's numbers changed between two result files.
+
+    Args:
+        args (argparse.Namespace): The command line options.
+    """
+    with open(args.old, encoding='utf-8') as old_file:
+        old = json.load(old_file)
+    with open(args.new, encoding='utf-8') as new_file:
+        new = json.load(new_file)
+    print(f'{old["commit"]} -> {new["commit"]}')
+    for name, new_result in new['results'].items():
+        old_result = old['results'].get(name)
+        if not old_result:
+            continue
+        print(f'\n{name}')
+        for metric in ('events_per_sec', 'page_latency_p50_ms',
+                       'page_latency_p95_ms', 'cpu_ms_per_page'):
+            before, after = old_result[metric], new_result[metric]
+            change = (after - before) / before * 100 if before else 0
+            print(f'  {metric}: {before} -> {after} ({change:+.1f}%)')
+
+
+def main():
+    """
+    Parse the command line and run the chosen command.
+    """
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmark')
+    run_parser.add_argument('--pages', type=int, default=5)
+    run_parser.add_argument('--latency-ms', type=float, default=80)
+    run_parser.add_argument('--jitter-ms', type=float, default=40)
+    run_parser.add_argument('--error-rate', type=float, default=0.0)
+    run_parser.add_argument('--workers', type=int, default=None)
+    run_parser.add_argument('--rate-per-host', type=float, default=None)
+    run_parser.add_argument('--listing-only', action='store_true')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--output', default=None)
+    run_parser.set_defaults(handler=run_benchmark)
+
+    record_parser = commands.add_parser(
+        'record', help='record live Eventbrite pages as fixtures')
+    record_parser.add_argument('--location', default='london')
+    record_parser.add_argument('--details', type=int, default=3)
+    record_parser.set_defaults(handler=record_fixtures)
+
+    compare_parser = commands.add_parser(
+        'compare', help='compare two saved results')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.set_defaults(handler=compare_results)
+
+    args = arg_parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
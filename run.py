@@ -8,62 +8,51 @@ so they can be accessed by the user with links from the console.
 
 Modules and librarys used are below:
 """
+import argparse
+import atexit
 import base64
 import calendar
 import csv
+import hashlib
 import itertools
+import json
 import math
+import multiprocessing
 import os
+import random
 import re
+import sqlite3
 import sys
 import threading
 import time
+import zlib
 from collections import Counter
-from datetime import datetime
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, as_completed)
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit
 import matplotlib.pyplot as plt
 import openpyxl
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 from dateutil import parser
 from dotenv import load_dotenv
 from geopy.distance import geodesic
 from google.cloud import storage
 from openpyxl.utils import get_column_letter
+from pymongo import ASCENDING, DESCENDING, TEXT, UpdateOne
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
-from pymongo.errors import ConnectionFailure, OperationFailure
+from pymongo.errors import (
+    BulkWriteError, ConnectionFailure, OperationFailure, PyMongoError)
 
 load_dotenv()
-encoded_json = os.getenv('GOOGLE_CREDENTIALS')
-decoded_json = base64.b64decode(encoded_json).decode()
-# Decode the required credentials from the environment variable
-
-with open('/tmp/service_account.json', 'w', encoding='utf-8') as f:
-    f.write(decoded_json)
-    # Write the decoded credentials to a JSON file
-
-os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = '/tmp/service_account.json'
-# Use the decoded credentials to authenticate with Google Cloud
 
 # Hashtable to cache recently searched events
 cache = {}
 
-uri = os.getenv('MONGO_URI')
-# Create a new client and connect to the server
-client = MongoClient(uri, server_api=ServerApi('1'))
-# Send a ping to confirm a successful connection
-try:
-    client.admin.command('ping')
-    print("Pinged your deployment. You successfully connected to MongoDB!")
-except ConnectionFailure as e:
-    print(f'Connection error: {e}')
-except OperationFailure as e:
-    print(f'Operation failure: {e}')
-
-db = client['Event_Hoarder']
-collection = db['Event_Data']
-# MongoDB database and collection
-
 # Directory to save Excel and CSV files
 UPLOAD_FOLDER = 'data_visuals'
 if not os.path.exists(UPLOAD_FOLDER):
@@ -72,6 +61,148 @@ if not os.path.exists(UPLOAD_FOLDER):
 stored_urls = []
 processed_files = set()
 
+# Where the scrapers send their listing page requests, overridable so the
+# benchmarks can point them at a local stand-in server
+EVENTBRITE_URL = os.getenv('EVENTBRITE_URL', 'https://www.eventbrite.com')
+EVENTBRITE_UK_URL = os.getenv('EVENTBRITE_UK_URL',
+                              'https://www.eventbrite.co.uk')
+
+# Eventbrite's top event categories, searched by option 3 and the bulk crawl
+TOP_CATEGORIES = [
+    'Home & Lifestyle', 'Business', 'Health', 'Performing & Visual Arts',
+    'Family & Education', 'Holidays', 'Music', 'Community',
+    'Hobbies', 'Charity & Causes', 'Food & Drink', 'Science & Tech',
+    'Sports & Fitness', 'Travel & Outdoor', 'Spirituality', 'Nightlife',
+    'Dating', 'Film & Media', 'Fashion', 'Government', 'Auto, Boat & Air',
+    'School Activities'
+]
+
+# Number of event detail pages fetched at the same time by the scrapers,
+# set SCRAPE_WORKERS=1 to fetch them one after another
+SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', '8'))
+
+# Events scraped within this many hours are reused from MongoDB instead of
+# having their detail page fetched again, 0 turns this off
+EVENT_FRESHNESS_HOURS = float(os.getenv('EVENT_FRESHNESS_HOURS', '6'))
+
+# Events saved while browsing are written in the background, up to
+# MONGO_WRITE_BATCH at a time and at most MONGO_FLUSH_SECONDS after saving
+MONGO_WRITE_BATCH = int(os.getenv('MONGO_WRITE_BATCH', '500'))
+MONGO_FLUSH_SECONDS = float(os.getenv('MONGO_FLUSH_SECONDS', '2'))
+
+# Where events are stored, 'mongodb' for the MONGO_URI deployment or
+# 'sqlite' for a local database file at SQLITE_PATH that needs no network
+EVENT_STORE = os.getenv('EVENT_STORE', 'mongodb')
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'events.db')
+
+# How many of the best matches a keyword search of the collection shows
+TEXT_SEARCH_LIMIT = int(os.getenv('TEXT_SEARCH_LIMIT', '50'))
+
+# Stored events are read from the store this many at a time when viewing or
+# exporting the collection, so the whole collection is never held at once
+MONGO_CURSOR_BATCH = int(os.getenv('MONGO_CURSOR_BATCH', '100'))
+
+# A search run before first shows the events stored for it, then refreshes
+# them from Eventbrite in the background, 0 always scrapes from scratch
+SERVE_STORED_SEARCHES = os.getenv('SERVE_STORED_SEARCHES', '1') == '1'
+
+# Progress of each search is saved here page by page so an interrupted
+# scrape resumes where it stopped, an empty CRAWL_STATE_DIR turns this off.
+# Saved pages older than CRAWL_STATE_HOURS are scraped again.
+CRAWL_STATE_DIR = os.getenv('CRAWL_STATE_DIR', '.crawl_state')
+CRAWL_STATE_HOURS = float(os.getenv('CRAWL_STATE_HOURS', '24'))
+
+# While viewing a search, once only PREFETCH_THRESHOLD events are left to
+# show the next PREFETCH_DEPTH listing pages are scraped in the background
+PREFETCH_DEPTH = int(os.getenv('PREFETCH_DEPTH', '1'))
+PREFETCH_THRESHOLD = int(os.getenv('PREFETCH_THRESHOLD', '5'))
+
+# Listing-only mode reads event details from the data embedded in listing
+# pages and only fetches detail pages for events with missing fields
+LISTING_ONLY = os.getenv('LISTING_ONLY', '0') == '1'
+
+try:
+    import lxml  # noqa: F401 pylint: disable=unused-import
+    DEFAULT_HTML_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_HTML_PARSER = 'html.parser'
+HTML_PARSER = os.getenv('HTML_PARSER', DEFAULT_HTML_PARSER)
+# lxml is a much faster parser backend for BeautifulSoup when installed,
+# html.parser is built into Python and is used otherwise
+
+# Shared HTTP session settings, one pool of kept-alive connections per host
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', str(max(SCRAPE_WORKERS, 10))))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '20'))
+HTTP_USER_AGENT = os.getenv(
+    'HTTP_USER_AGENT',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)'
+    ' Chrome/124.0 Safari/537.36 Event-Hoarder')
+
+try:
+    import brotli  # noqa: F401 pylint: disable=unused-import
+    HTTP_ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    HTTP_ACCEPT_ENCODING = 'gzip, deflate'
+# Only ask for brotli when it can be decoded, urllib3 needs the brotli package
+
+# On-disk HTTP cache, set HTTP_CACHE_DIR to an empty string to turn it off
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_MB', '200')) * 1024 * 1024
+HTTP_CACHE_TTLS = {
+    'listing': int(os.getenv('HTTP_CACHE_TTL_LISTING', str(15 * 60))),
+    'detail': int(os.getenv('HTTP_CACHE_TTL_DETAIL', str(6 * 60 * 60))),
+    'geocode': int(os.getenv('HTTP_CACHE_TTL_GEOCODE',
+                             str(30 * 24 * 60 * 60))),
+    'other': int(os.getenv('HTTP_CACHE_TTL_OTHER', str(60 * 60))),
+}
+# Seconds a cached response is used without asking the server again,
+# listing pages change the most so they go stale the quickest
+
+# Optional archive of every fetched listing and detail page, so events can
+# be parsed again with 'python run.py reprocess' instead of re-scraping.
+# Off unless ARCHIVE_DIR is set.
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', '')
+ARCHIVE_SEGMENT_BYTES = int(os.getenv('ARCHIVE_SEGMENT_MB', '64')) * 2 ** 20
+
+# Per-host pacing, retries and circuit breaker for outbound requests.
+# HTTP_RATE_PER_HOST caps requests per second to a host, 0 (the default)
+# sends as fast as the concurrency limit allows and only slows down once
+# the host answers 429/503.
+HTTP_RATE_PER_HOST = float(os.getenv('HTTP_RATE_PER_HOST', '0'))
+HTTP_BURST = int(os.getenv('HTTP_BURST', '10'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '30'))
+HTTP_CIRCUIT_THRESHOLD = int(os.getenv('HTTP_CIRCUIT_THRESHOLD', '5'))
+HTTP_CIRCUIT_COOLDOWN = float(os.getenv('HTTP_CIRCUIT_COOLDOWN', '60'))
+
+http_session = None
+http_session_lock = threading.Lock()
+http_stats = Counter()
+http_cache = None
+page_archive = None
+host_throttles = {}
+
+
+def write_google_credentials():
+    """
+    Write the Google Cloud credentials from the GOOGLE_CREDENTIALS
+    environment variable to a file the storage client can read. Called
+    when the program starts rather than on import, so crawl worker
+    processes don't each write it again.
+    """
+    encoded_json = os.getenv('GOOGLE_CREDENTIALS')
+    decoded_json = base64.b64decode(encoded_json).decode()
+    # Decode the required credentials from the environment variable
+
+    with open('/tmp/service_account.json', 'w', encoding='utf-8') as f:
+        f.write(decoded_json)
+        # Write the decoded credentials to a JSON file
+
+    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = (
+        '/tmp/service_account.json')
+    # Use the decoded credentials to authenticate with Google Cloud
+
 
 def upload_to_gcs(bucket_name, source_file_name, destination_blob_name):
     """
@@ -179,363 +310,3852 @@ class Spinner:
         sys.stdout.flush()
 
 
-def view_data_files():
+class HttpDiskCache:
     """
-    View files uploaded to Google Cloud Storage from global list stored_urls.
+    An on-disk cache of HTTP responses. Each cached URL is a body file and
+    a small JSON file holding its ETag/Last-Modified headers, named after
+    a hash of the URL. Responses younger than their URL class's TTL are
+    served straight from disk, older ones are revalidated with a
+    conditional request, and the least recently used entries are removed
+    once the cache grows past max_bytes.
     """
-    if not stored_urls:
-        print('\n-------------------------------------\n'
-              'No files uploaded yet.'
-              '\n-------------------------------------')
-    else:
-        for url in stored_urls:
-            print(url)
-    input('DO NOT USE CTRL-C TO COPY\nGo back? Press Enter to'
-          ' continue.')
-    return
+    def __init__(self, directory, max_bytes, ttls):
+        """
+        Initializes the cache and creates its directory if needed.
 
+        Args:
+            directory (str): Where the cached responses are stored.
+            max_bytes (int): How big the cache can grow before
+                            entries are evicted.
+            ttls (dict): Seconds a response stays fresh, per URL class.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.lock = threading.Lock()
+        self.total_bytes = None
+        # Worked out from the directory on the first store
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def url_class(url):
+        """
+        Sort a URL into the class that decides how long it stays fresh.
 
-def check_and_delete_old_events():
-    """
-    Check for events in the global collection with start dates that have
-    already passed and delete them.
-    """
-    current_date = datetime.now().date()
-    events = collection.find({})
+        Args:
+            url (str): The requested URL.
 
-    for event in events:
-        unique_id = event.get('url', 'N/A')
-        if unique_id == 'N/A':
-            continue
+        Returns:
+            str: 'geocode', 'detail', 'listing' or 'other'.
+        """
+        if 'maps.googleapis.com' in url:
+            return 'geocode'
+        if '/e/' in url:
+            return 'detail'
+        if '/d/' in url:
+            return 'listing'
+        return 'other'
+
+    @classmethod
+    def is_cacheable(cls, url, response):
+        """
+        Check a 200 response is worth caching. The geocoding API answers
+        errors such as OVER_QUERY_LIMIT and REQUEST_DENIED with a 200 and
+        a JSON status, those would otherwise be kept for a month.
 
-        start_date = event.get('event_date_time', 'N/A')
+        Args:
+            url (str): The requested URL.
+            response (requests.Response): The 200 response.
 
+        Returns:
+            bool: False for a geocoding response whose status isn't OK.
+        """
+        if cls.url_class(url) != 'geocode':
+            return True
         try:
-            checked_start_date = datetime.strptime(
-                start_date, '%Y-%m-%d %H:%M:%S').date()
-        except ValueError:
-            collection.delete_one({'url': unique_id})
-            continue
+            return response.json().get('status') == 'OK'
+        except (ValueError, AttributeError):
+            return False
 
-        if current_date > checked_start_date:
-            collection.delete_one({'url': unique_id})
+    def _paths(self, url):
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        # The URL itself isn't stored, geocoding URLs carry the API key
+        return (os.path.join(self.directory, f'{name}.body'),
+                os.path.join(self.directory, f'{name}.json'))
 
+    def lookup(self, url):
+        """
+        Find the cached response for a URL.
 
-check_and_delete_old_events()
+        Args:
+            url (str): The requested URL.
 
+        Returns:
+            tuple: (meta dict, body bytes, is_fresh bool),
+                or None if the URL isn't cached.
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, 'rb') as body_file:
+                body = body_file.read()
+            os.utime(body_path)
+            # The body file's modified time is the LRU clock
+        except (OSError, ValueError):
+            return None
+        age = time.time() - meta.get('stored_at', 0)
+        is_fresh = age < self.ttls.get(meta.get('url_class'), 0)
+        return meta, body, is_fresh
+
+    def store(self, url, response):
+        """
+        Save a successful response, replacing any older copy.
 
-def save_to_mongodb(search_key, collected_events):
-    """
-    Save user viewed events to MongoDB.
+        Args:
+            url (str): The requested URL.
+            response (requests.Response): The 200 response to cache.
+        """
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url_class': self.url_class(url),
+            'stored_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'encoding': response.encoding,
+        }
+        body = response.content
+        try:
+            old_size = os.path.getsize(body_path)
+        except OSError:
+            old_size = 0
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self._scan_size()
+            else:
+                self.total_bytes += len(body) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
 
-    Args:
-        search_key (str): The phrase the user used to search for events.
-        collected_events (list of dict): The user's collected events.
-    """
-    for event in collected_events:
-        if isinstance(event, dict):
-            unique_id = event.get('url', 'N/A')
-            if unique_id == 'N/A':
-                continue
+    def refresh(self, url, meta):
+        """
+        Mark a cached response as fresh again after the server answered
+        a conditional request with 304 Not Modified.
 
-            event_data = {
-                'search_key': search_key,
-                'url': unique_id,
-                'name': event.get('name', 'N/A'),
-                'location': event.get('location', 'N/A'),
-                'event_date_time': event.get('event_date_time', 'N/A'),
-                'show_date_time': event.get('show_date_time', 'N/A'),
-                'summary': event.get('summary', 'N/A'),
-                'event_price': event.get('event_price', 'N/A'),
-                'event_organiser_name': event.get(
-                    'event_organiser_name', 'N/A'),
-                'event_organiser_link': event.get(
-                    'event_organiser_link', 'N/A'),
-            }
+        Args:
+            url (str): The requested URL.
+            meta (dict): The entry's metadata from lookup.
+        """
+        _, meta_path = self._paths(url)
+        meta['stored_at'] = time.time()
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def _write(path, data):
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+        # Write to a temporary file and swap it in so another thread
+        # never reads half a file
+
+    def _scan_size(self):
+        return sum(entry.stat().st_size for entry in os.scandir(
+            self.directory) if entry.name.endswith('.body'))
+
+    def _evict(self):
+        bodies = sorted(
+            (entry for entry in os.scandir(self.directory)
+             if entry.name.endswith('.body')),
+            key=lambda entry: entry.stat().st_mtime)
+        # Oldest used first
+        total = sum(entry.stat().st_size for entry in bodies)
+        target = self.max_bytes * 0.9
+        # Evict down to 90% so the next few stores don't evict again
+        for entry in bodies:
+            if total <= target:
+                break
+            total -= entry.stat().st_size
+            for path in (entry.path, entry.path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        self.total_bytes = total
 
-            collection.update_one(
-                {'url': unique_id}, {'$set': event_data}, upsert=True)
-        else:
-            print(f"Skipping invalid event: {event}")
+    @staticmethod
+    def to_response(url, meta, body):
+        """
+        Build a requests Response from a cached entry, so callers can't
+        tell it apart from one that came over the network.
 
+        Args:
+            url (str): The requested URL.
+            meta (dict): The entry's metadata.
+            body (bytes): The cached body.
 
-def save_to_csv(events):
+        Returns:
+            requests.Response: A 200 response with from_cache set to True.
+        """
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = body  # pylint: disable=protected-access
+        response.url = url
+        response.encoding = meta.get('encoding')
+        response.headers['Content-Type'] = meta.get('content_type') or ''
+        response.from_cache = True
+        return response
+
+
+class PageArchive:
     """
-    Save events in the mongodb collection to a CSV file.
+    An append-only archive of the raw listing and detail pages the scrapers
+    fetch, so events can be parsed again (eg. after Eventbrite renames a
+    CSS class) without fetching anything. Each page is zlib compressed and
+    appended to a segment file as a JSON header line, holding its URL,
+    fetch time and compressed size, followed by the compressed page. Once
+    a segment passes segment_bytes a new one is started, and every process
+    writes its own segments so parallel crawls never interleave records.
+    """
+    def __init__(self, directory, segment_bytes):
+        """
+        Initializes the archive and creates its directory if needed.
 
-    Args:
-        events (list of dict): The users collected events.
+        Args:
+            directory (str): Where the segment files are stored.
+            segment_bytes (int): How big a segment grows before
+                                the next one is started.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.lock = threading.Lock()
+        self.segment = None
+        self.segment_size = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, url, content):
+        """
+        Add a fetched page to the archive.
+
+        Args:
+            url (str): The page's URL.
+            content (bytes): The page's body.
+        """
+        body = zlib.compress(content, 6)
+        header = json.dumps({'url': url, 'fetched_at': time.time(),
+                             'size': len(body)}).encode('utf-8') + b'\n'
+        with self.lock:
+            if (self.segment is None
+                    or self.segment_size >= self.segment_bytes):
+                if self.segment is not None:
+                    self.segment.close()
+                name = f'{datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}.seg'
+                # Named by start time so segments sort oldest first
+                self.segment = open(  # pylint: disable=consider-using-with
+                    os.path.join(self.directory, name), 'ab')
+                self.segment_size = 0
+            self.segment.write(header + body)
+            self.segment.flush()
+            self.segment_size += len(header) + len(body)
+
+    def scan(self):
+        """
+        Read the header of every record, oldest first, without
+        decompressing any pages.
+
+        Yields:
+            tuple: (url, fetched_at, segment path, offset, size)
+                for each record.
+        """
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.endswith('.seg'))
+        for name in names:
+            path = os.path.join(self.directory, name)
+            with open(path, 'rb') as segment:
+                while True:
+                    line = segment.readline()
+                    try:
+                        header = json.loads(line)
+                    except ValueError:
+                        break
+                        # The end of the segment, or a record cut off
+                        # when a scrape was killed mid-write
+                    offset = segment.tell()
+                    yield (header['url'], header['fetched_at'], path,
+                           offset, header['size'])
+                    segment.seek(header['size'], os.SEEK_CUR)
+
+    def iter_latest(self):
+        """
+        Read the most recently fetched copy of every archived page.
+
+        Yields:
+            tuple: (url, fetched_at, content) for each archived URL.
+        """
+        latest = {}
+        for url, fetched_at, path, offset, size in self.scan():
+            if url not in latest or fetched_at >= latest[url][0]:
+                latest[url] = (fetched_at, path, offset, size)
+        records = sorted(latest.items(), key=lambda item: item[1][1:3])
+        # In file order, so each segment is read front to back
+        for path, segment_records in itertools.groupby(
+                records, key=lambda item: item[1][1]):
+            with open(path, 'rb') as segment:
+                for url, (fetched_at, _, offset, size) in segment_records:
+                    segment.seek(offset)
+                    try:
+                        content = zlib.decompress(segment.read(size))
+                    except zlib.error:
+                        print(f'Skipping damaged archive record for {url}')
+                        continue
+                    yield url, fetched_at, content
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised instead of sending a request to a host whose circuit breaker
+    is open after too many failures in a row.
     """
-    directory = 'data_visuals'
-    file_name = os.path.join(directory, 'collected_events.csv')
-    file_exists = os.path.exists(file_name)
 
-    fields = [
-        'name', 'location', 'show_date_time', 'event_price', 'summary',
-        'url', 'event_organiser_name', 'event_organiser_link'
-        ]
 
-    with open(file_name, 'a', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=fields)
+class HostThrottle:
+    """
+    Paces the requests sent to one host. A concurrency limit caps how many
+    requests are in flight, and when a rate is set a token bucket limits
+    the request rate too. Both are halved whenever the host answers
+    429/503 and slowly grown back on success. After HTTP_CIRCUIT_THRESHOLD
+    failures in a row the circuit opens and requests fail fast for
+    HTTP_CIRCUIT_COOLDOWN seconds.
+    """
+    def __init__(self, rate, max_concurrency):
+        """
+        Initializes the throttle at its full rate and concurrency.
 
-        if not file_exists:
-            writer.writeheader()
+        Args:
+            rate (float): The most requests per second to send,
+                        0 for no limit.
+            max_concurrency (int): The most requests in flight at once.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.tokens = float(HTTP_BURST)
+        self.updated = time.monotonic()
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait until a request may be sent to the host.
 
-        for event in events:
-            filtered_event = {
-                field: event[field] for field in fields if field in event}
-            # this will only include the fields that are in the fields
-            # list above, so that fields that only have a programmatic purpose
-            # are not included in the CSV it works by creating a new
-            # dictionary with only the fields that are in the fields list
-            writer.writerow(filtered_event)
+        Returns:
+            bool: True if the request had to wait.
 
-    print(f'\n-------------------------------------\nEvents saved to'
-          f'{file_name}, download/view with option 7,'
-          '\nOr from the main menu with option 5.'
-          f'\n-------------------------------------')
-    upload_to_gcs(
-        'data-visuals-serving', file_name, os.path.basename(file_name))
-    # os.path.basename() example: 'data_visuals/collected_events.csv'
-    # -> 'collected_events.csv'
-    return
+        Raises:
+            CircuitOpenError: If the host's circuit is open.
+        """
+        waited = False
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if now < self.open_until:
+                    raise CircuitOpenError(
+                        f'Too many failed requests, pausing for '
+                        f'{math.ceil(self.open_until - now)}s')
+                self.tokens = min(float(HTTP_BURST), self.tokens + (
+                    now - self.updated) * self.rate)
+                self.updated = now
+                # Top up the bucket for the time since the last request
+
+                if self.in_flight >= max(1, int(self.concurrency)):
+                    wait = None
+                    # Wait for a running request to finish
+                elif now < self.paused_until:
+                    wait = self.paused_until - now
+                    # The host asked us to back off with Retry-After
+                elif self.max_rate > 0 and self.tokens < 1:
+                    wait = (1 - self.tokens) / self.rate
+                    # Without a rate limit only the concurrency limit and
+                    # Retry-After hold requests back
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return waited
+                waited = True
+                self.condition.wait(wait)
 
+    def release(self, outcome, retry_after=0.0):
+        """
+        Record how a request went and adjust the pace to match.
 
-def save_to_excel(events, filename='data_visuals/events_data.xlsx'):
+        Args:
+            outcome (str): 'ok', 'throttled' (429/503) or 'error'
+                        (other 5xx or a connection error).
+            retry_after (float, optional): Seconds the host asked us to
+                                        wait. Defaults to 0.0.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == 'ok':
+                self.consecutive_failures = 0
+                self.concurrency = min(float(self.max_concurrency),
+                                       self.concurrency + 0.25)
+                self.rate = min(self.max_rate, self.rate * 1.05)
+                # Additive increase, so the pace creeps back up
+                # after the host has pushed back
+            else:
+                self.consecutive_failures += 1
+                if outcome == 'throttled':
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    self.rate = max(self.max_rate / 20, self.rate / 2)
+                    # Multiplicative decrease, halve the pace straight away.
+                    # Without a rate limit the halved concurrency is what
+                    # slows the requests down.
+                    self.paused_until = max(
+                        self.paused_until,
+                        now + min(retry_after, HTTP_BACKOFF_MAX))
+                    # Never pause longer than our own backoff cap,
+                    # whatever the host asks for
+                if self.consecutive_failures >= HTTP_CIRCUIT_THRESHOLD:
+                    self.open_until = now + HTTP_CIRCUIT_COOLDOWN
+                    with http_session_lock:
+                        http_stats['circuit_opened'] += 1
+                    # Once the cooldown is over one more failure
+                    # opens it again, one success closes it
+            self.condition.notify_all()
+
+
+def get_host_throttle(url):
     """
-    Save events in the mongodb collection to an Excel file.
+    Find the throttle for a URL's host, creating it on first use.
 
     Args:
-        events (list of dict): The users collected events.
-        filename (str, optional): The filename for the Excel file,
-                                Defaults to 'data_visuals/events_data.xlsx'.
+        url (str): The URL about to be requested.
+
+    Returns:
+        HostThrottle: The throttle shared by every request to that host.
     """
-    filename = check_file_unique(filename)
-    workbook = openpyxl.Workbook()
-    # Create a new Excel workbook
-    sheet = workbook.active
-    # active means the first sheet in the workbook
-    sheet.title = 'Events Data'
-    # Set the title of the sheet to 'Events Data'
-    headers = [
-        'Event Name', 'Date', 'Location', 'Price',
-        'Summary', 'URL', 'Organiser', 'Organiser Link']
-    column_widths = [71, 58, 111, 12, 81, 140, 71, 140]
-    # Set the column headers and their widths
+    host = urlsplit(url).netloc
+    with http_session_lock:
+        if host not in host_throttles:
+            host_throttles[host] = HostThrottle(HTTP_RATE_PER_HOST,
+                                                HTTP_POOL_SIZE)
+        return host_throttles[host]
 
-    for col_num, (header, width) in enumerate(zip(headers, column_widths), 1):
-        # for every col_num and its corresponding header and width, enumerate
-        # will return the index and value of each column, and then associate
-        # the declared headers and column_widths stated above with the index
-        col_letter = get_column_letter(col_num)
-        # get_column_letter() is a built in function from openpyxl that
-        # returns the letter of the specified column,
-        # example: 1 -> 'A', 2 -> 'B'
-        sheet[f'{col_letter}1'] = header
-        # Will set the headers stated above in the first row of the sheet
-        # iterating through columns A, B, C, D, E, F
-        sheet.column_dimensions[col_letter].width = width
-        # column_dimensions is a dictionary that stores the width of each
-        # column, the width is set to the width in the column_widths list
 
-    for row_num, event in enumerate(events, 2):
-        sheet[f'A{row_num}'] = event.get('name', 'N/A')
-        sheet[f'B{row_num}'] = event.get('show_date_time', 'N/A')
-        sheet[f'C{row_num}'] = event.get('location', 'N/A')
-        sheet[f'D{row_num}'] = event.get('event_price', 'N/A')
-        sheet[f'E{row_num}'] = event.get('summary', 'N/A')
-        sheet[f'F{row_num}'] = event.get('url', 'N/A')
-        sheet[f'G{row_num}'] = event.get('event_organiser_name', 'N/A')
-        sheet[f'H{row_num}'] = event.get('event_organiser_link', 'N/A')
+def parse_retry_after(value):
+    """
+    Read a Retry-After header, which is either seconds or an HTTP date.
 
-    workbook.save(filename)
-    print(f'\n-------------------------------------\nEvents saved to'
-          f'{filename}, download/view from the main menu.'
-          f'\n-------------------------------------')
-    upload_to_gcs('data-visuals-serving', filename, os.path.basename(filename))
-    return
+    Args:
+        value (str): The header value, or None.
 
+    Returns:
+        float: Seconds to wait, 0.0 if the header is missing or unreadable.
+    """
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
 
-def parsed_scraped_date(date_time):
+
+def backoff_delay(attempt, retry_after=0.0):
     """
-    Turn the user friendley (readable) event date and time into a
-    computer readable datetime object.
+    Work out how long to wait before retrying a request, doubling with each
+    attempt and jittered so parallel workers don't all retry together.
 
     Args:
-        date_time (str): User friendly date and time string.
+        attempt (int): How many times the request has been tried.
+        retry_after (float, optional): The host's Retry-After, the delay is
+                                    never shorter than this, up to
+                                    HTTP_BACKOFF_MAX.
 
     Returns:
-        string: A date_time string in the format '%Y-%m-%d %H:%M:%S'.
+        float: Seconds to wait.
     """
-    if 'No date and time available' in date_time or not date_time.strip():
-        return 'N/A'
-    # If the date_time is not available, return 'N/A'
-    replacements = {
-        'Monday': '',
-        'Mon': '',
-        'Tuesday': '',
-        'Tue': '',
-        'Wednesday': '',
-        'Wed': '',
-        'Thursday': '',
-        'Thu': '',
-        'Friday': '',
-        'Fri': '',
-        'Saturday': '',
-        'Sat': '',
-        'Sunday': '',
-        'Sun': '',
-        'Starts on': '',
-        'GMT': '',
-        'GMT+1': '',
-        'January': 'Jan',
-        'February': 'Feb',
-        'March': 'Mar',
-        'April': 'Apr',
-        'May': 'May',
-        'June': 'Jun',
-        'July': 'Jul',
-        'August': 'Aug',
-        'September': 'Sep',
-        'October': 'Oct',
-        'November': 'Nov',
-        'December': 'Dec',
-        'pm': 'PM',
-        'am': 'AM',
-        '·': '',
-        ' - ': ' ',
-        '+1': '',
-    }
+    delay = min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt)
+    return max(min(retry_after, HTTP_BACKOFF_MAX),
+               random.uniform(delay / 2, delay))
 
-    for key, value in replacements.items():
-        date_time = date_time.replace(key, value)
-    # Replace the long names of the days and months with their abbreviations
-    # Also replace other unwanted strings
 
-    # Remove any extra spaces and commas
-    date_time = ' '.join(date_time.split()).replace(',', '')
+def get_http_cache():
+    """
+    Create the shared disk cache the first time it is needed.
+
+    Returns:
+        HttpDiskCache: The cache, or None when HTTP_CACHE_DIR is empty.
+    """
+    global http_cache  # pylint: disable=global-statement
+    if not HTTP_CACHE_DIR:
+        return None
+    with http_session_lock:
+        if http_cache is None:
+            http_cache = HttpDiskCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES,
+                                       HTTP_CACHE_TTLS)
+    return http_cache
+
+
+def get_page_archive():
+    """
+    Create the shared page archive the first time it is needed.
+
+    Returns:
+        PageArchive: The archive, or None when ARCHIVE_DIR is empty.
+    """
+    global page_archive  # pylint: disable=global-statement
+    if not ARCHIVE_DIR:
+        return None
+    with http_session_lock:
+        if page_archive is None:
+            page_archive = PageArchive(ARCHIVE_DIR, ARCHIVE_SEGMENT_BYTES)
+    return page_archive
+
+
+def get_http_session():
+    """
+    Create the shared requests session the first time it is needed and
+    return it on every call after. All outbound requests go through this
+    one session so TCP/TLS connections are kept alive and reused.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global http_session  # pylint: disable=global-statement
+    with http_session_lock:
+        if http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                                  pool_maxsize=HTTP_POOL_SIZE)
+            # pool_connections is how many hosts get their own pool,
+            # pool_maxsize is how many open connections each host pool keeps
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'User-Agent': HTTP_USER_AGENT,
+                'Accept-Encoding': HTTP_ACCEPT_ENCODING,
+                'Connection': 'keep-alive',
+            })
+            http_session = session
+    return http_session
+
+
+def http_get(url, revalidate=False, **kwargs):
+    """
+    Send a GET request through the shared session, with the default
+    timeout applied unless one is given. Responses are served from and
+    saved to the disk cache, stale cached copies are revalidated with
+    If-None-Match/If-Modified-Since. Requests are paced per host, and
+    429s, 5xx responses and connection errors are retried with backoff.
+
+    Args:
+        url (str): The URL to request.
+        revalidate (bool, optional): Check a cached copy with the server
+                                even if it is still fresh.
+                                Defaults to False.
+        **kwargs: Passed on to requests.Session.get.
+
+    Returns:
+        requests.Response: The response from the server or the cache.
+
+    Raises:
+        requests.RequestException: If the request still fails after
+                                HTTP_MAX_RETRIES, or the host's
+                                circuit is open.
+    """
+    kwargs.setdefault('timeout', HTTP_TIMEOUT)
+    disk_cache = get_http_cache() if 'params' not in kwargs else None
+    cached = disk_cache.lookup(url) if disk_cache else None
+
+    if cached:
+        meta, body, is_fresh = cached
+        if is_fresh and not revalidate:
+            return disk_cache.to_response(url, meta, body)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        kwargs['headers'] = headers
+        # Ask the server to only send the page if it has changed
+
+    throttle = get_host_throttle(url)
+    session = get_http_session()
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        waited = throttle.acquire()
+        with http_session_lock:
+            http_stats['requests'] += 1
+            http_stats['paced'] += waited
+        retry_after = 0.0
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError):
+            throttle.release('error')
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+        except BaseException:
+            throttle.release('error')
+            raise
+            # Give the host's slot back on any other failure too, or the
+            # leaked slots end up blocking every request to it
+        else:
+            if response.status_code in (429, 503):
+                retry_after = parse_retry_after(
+                    response.headers.get('Retry-After'))
+                throttle.release('throttled', retry_after)
+                with http_session_lock:
+                    http_stats['throttled'] += 1
+            elif response.status_code >= 500:
+                throttle.release('error')
+            else:
+                throttle.release('ok')
+                break
+            if attempt == HTTP_MAX_RETRIES:
+                break
+                # Out of retries, hand the error response back
+        with http_session_lock:
+            http_stats['retried'] += 1
+        time.sleep(backoff_delay(attempt, retry_after))
+
+    if cached and response.status_code == 304:
+        disk_cache.refresh(url, meta)
+        return disk_cache.to_response(url, meta, body)
+    if (disk_cache and response.status_code == 200
+            and disk_cache.is_cacheable(url, response)):
+        disk_cache.store(url, response)
+    archive = get_page_archive()
+    if (archive and response.status_code == 200
+            and HttpDiskCache.url_class(url) in ('listing', 'detail')):
+        archive.append(url, response.content)
+        # Pages revalidated with a 304 were archived when first fetched
+    return response
+
+
+def http_session_stats():
+    """
+    Count how many connections the shared session has opened and how
+    many requests were served over an already open (reused) connection,
+    along with how often requests waited on the local pace, were
+    throttled by the host (429/503) and retried.
+
+    Returns:
+        dict: 'requests', 'connections_opened', 'connections_reused',
+            'paced', 'throttled', 'retried' and 'circuit_opened'.
+    """
+    opened = 0
+    pooled_requests = 0
+    if http_session is not None:
+        for adapter in set(http_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    pooled_requests += pool.num_requests
+                    # urllib3 counts both per host pool, every request
+                    # that didn't need a new connection reused one
+    return {
+        'requests': http_stats['requests'],
+        'connections_opened': opened,
+        'connections_reused': max(pooled_requests - opened, 0),
+        'paced': http_stats['paced'],
+        'throttled': http_stats['throttled'],
+        'retried': http_stats['retried'],
+        'circuit_opened': http_stats['circuit_opened'],
+    }
+
+
+def view_data_files():
+    """
+    View files uploaded to Google Cloud Storage from global list stored_urls.
+    """
+    if not stored_urls:
+        print('\n-------------------------------------\n'
+              'No files uploaded yet.'
+              '\n-------------------------------------')
+    else:
+        for url in stored_urls:
+            print(url)
+    input('DO NOT USE CTRL-C TO COPY\nGo back? Press Enter to'
+          ' continue.')
+    return
+
+
+# The indexes every query on the collection relies on, as (keys, options)
+EVENT_INDEXES = [
+    ([('url', ASCENDING)], {'unique': True}),
+    # Events are upserted and looked up by URL
+    ([('search_key', ASCENDING)], {}),
+    ([('event_date_time', ASCENDING)], {}),
+    # The expiry sweep's range delete
+    ([('event_start', ASCENDING), ('_id', ASCENDING)], {}),
+    ([('price_min', ASCENDING), ('_id', ASCENDING)], {}),
+    # The sort menu pages through events in (event_start or price_min,
+    # _id) order, these also serve queries on event_start or price_min
+    ([('name', TEXT), ('summary', TEXT), ('location', TEXT),
+      ('event_organiser_name', TEXT)],
+     {'name': 'event_text', 'weights': {
+         'name': 10, 'location': 5, 'event_organiser_name': 5,
+         'summary': 1}}),
+    # The keyword search, a match in the name counts the most
+]
+TEXT_TOKEN_PATTERN = re.compile(r'\w+')
+# The words a keyword search looks for, punctuation is ignored
+
+# Errors from either event store, caught wherever the program carries on
+# without its stored events
+STORAGE_ERRORS = (PyMongoError, sqlite3.Error)
+
+
+class MongoEventStore:
+    """
+    The events and search catalogue kept in MongoDB Atlas. Queries are
+    filters of fields the events must equal, eg. {'search_key': key},
+    the same as for SQLiteEventStore.
+    """
+    LABEL = 'MongoDB'
+    # How the store is named in summaries
+    CATALOGUE_BUILT_ID = '__built_from_events__'
+    # Marks that searches saved before the catalogue existed have been added
+
+    def __init__(self, uri):
+        """
+        Connects to the MongoDB deployment, the indexes are created on
+        first use.
+
+        Args:
+            uri (str): The MongoDB connection string.
+        """
+        self.client = MongoClient(uri, server_api=ServerApi('1'))
+        # Send a ping to confirm a successful connection
+        try:
+            self.client.admin.command('ping')
+            print("Pinged your deployment. You successfully connected to"
+                  " MongoDB!")
+        except ConnectionFailure as e:
+            print(f'Connection error: {e}')
+        except OperationFailure as e:
+            print(f'Operation failure: {e}')
+        db = self.client['Event_Hoarder']
+        self.collection = db['Event_Data']
+        # MongoDB database and collection
+        self.search_catalogue = db['Search_Keys']
+        # One document per search key, with its event count and parameters
+        self.indexes_ready = False
+        self.indexes_lock = threading.Lock()
+
+    def ensure_indexes(self):
+        """
+        Create the EVENT_INDEXES the first time the collection is used.
+        Safe to call before every query, once the indexes exist it returns
+        straight away. Indexes the collection already has are skipped, so
+        a plain url index made in place of the unique one is only warned
+        about the run it is made.
+
+        Raises:
+            PyMongoError: If MongoDB can't be reached, the indexes are
+                        tried again on the next call.
+        """
+        with self.indexes_lock:
+            if self.indexes_ready:
+                return
+            existing = self.collection.index_information()
+            has_text_index = any(
+                direction == TEXT or field == '_fts'
+                for info in existing.values() for field, direction
+                in info['key'])
+            # MongoDB lists a text index's key as ('_fts', 'text')
+            for keys, options in EVENT_INDEXES:
+                name = options.get('name') or '_'.join(
+                    f'{field}_{direction}' for field, direction in keys)
+                # The name MongoDB gives an index by default
+                if name in existing or (keys[0][1] == TEXT
+                                        and has_text_index):
+                    continue
+                try:
+                    self.collection.create_index(keys, **options)
+                except OperationFailure as e:
+                    if keys[0][1] == TEXT:
+                        print(f'Could not create the keyword search index'
+                              f' ({e}), a collection can only have one.')
+                        continue
+                        # Keyword searches use the text index it has
+                    if not options.get('unique'):
+                        raise
+                    print(f'Could not make {keys[0][0]} unique, the'
+                          f' collection has duplicates ({e}).'
+                          f' Using a plain index.')
+                    self.collection.create_index(keys)
+                    # Still fast lookups, the duplicates are left alone
+            self.indexes_ready = True
+
+    def upsert_events(self, events):
+        """
+        Insert or update events by URL in one unordered bulk write, so a
+        page of events costs one round trip rather than one per event.
+
+        Args:
+            events (list of dict): The events, each with a 'url'.
+
+        Returns:
+            Counter: How many events were 'inserted', 'modified' and
+                    'matched', and how many writes 'failed'.
+        """
+        counts = Counter()
+        self.ensure_indexes()
+        try:
+            result = self.collection.bulk_write(
+                [UpdateOne({'url': event['url']}, {'$set': event},
+                           upsert=True) for event in events],
+                ordered=False)
+            # Unordered, so one bad event doesn't stop the rest being saved
+        except BulkWriteError as e:
+            counts.update(inserted=e.details.get('nUpserted', 0),
+                          modified=e.details.get('nModified', 0),
+                          matched=e.details.get('nMatched', 0),
+                          failed=len(e.details.get('writeErrors', [])))
+            print(f'Some events could not be saved: {e}')
+            return counts
+        counts.update(inserted=result.upserted_count,
+                      modified=result.modified_count,
+                      matched=result.matched_count)
+        return counts
+
+    def update_events(self, updates):
+        """
+        Set fields on stored events, in one unordered bulk write.
+
+        Args:
+            updates (list of tuple): (url, fields) for each event.
+
+        Returns:
+            Counter: How many events were 'matched' and 'modified'.
+        """
+        result = self.collection.bulk_write(
+            [UpdateOne({'url': url}, {'$set': fields})
+             for url, fields in updates], ordered=False)
+        return Counter(matched=result.matched_count,
+                       modified=result.modified_count)
+
+    def delete_expired(self):
+        """
+        Delete the events matching expired_events_filter in one indexed
+        delete_many.
+
+        Returns:
+            int: How many events were deleted.
+        """
+        self.ensure_indexes()
+        return self.collection.delete_many(
+            expired_events_filter()).deleted_count
+
+    def find_fresh_events(self, event_urls, cutoff):
+        """
+        Find the events stored under any of the given URLs and scraped
+        since cutoff, in one query.
+
+        Args:
+            event_urls (list of str): The event URLs.
+            cutoff (datetime): The oldest scrape still fresh.
+
+        Returns:
+            dict: The events, keyed by URL.
+        """
+        self.ensure_indexes()
+        stored_events = self.collection.find(
+            {'url': {'$in': event_urls}, 'scraped_at': {'$gte': cutoff}},
+            {'_id': 0, 'search_key': 0})
+        # $in matches any of the URLs, the projection leaves out the fields
+        # that belong to the stored search rather than the event
+        return {event['url']: event for event in stored_events}
+
+    def stored_event_keys(self, event_urls):
+        """
+        Find which of the given events are already stored, matched by
+        event_url_key so an event stored under a differently formatted URL
+        still counts. Each URL is looked up with anchored prefix matches,
+        see event_url_prefixes, which the url index answers as range
+        scans, a batch at a time.
+
+        Args:
+            event_urls (list of str): The event URLs.
+
+        Returns:
+            set of str: The event_url_key of each event that is stored.
+        """
+        self.ensure_indexes()
+        wanted = {event_url_key(url) for url in event_urls}
+        stored = set()
+        for chunk in itertools.batched(event_url_prefixes(event_urls), 200):
+            stored.update(
+                event_url_key(event['url']) for event in self.collection.find(
+                    {'$or': [{'url': {'$regex': f'^{re.escape(prefix)}'}}
+                             for prefix in chunk]}, {'_id': 0, 'url': 1}))
+        return stored & wanted
+        # A prefix also matches longer event IDs, those are dropped here
+
+    def iter_events(self, query, display=False):
+        """
+        Read the events matching query from a cursor, MONGO_CURSOR_BATCH
+        at a time.
+
+        Args:
+            query (dict): Fields the events must equal.
+            display (bool, optional): Only read the fields display_events
+                                    prints, with the summary cut just past
+                                    the length shown. Defaults to False.
+
+        Yields:
+            dict: Each event, without its _id.
+        """
+        projection = EVENT_DISPLAY_PROJECTION if display else {'_id': 0}
+        with self.collection.find(query, projection,
+                                  batch_size=MONGO_CURSOR_BATCH) as cursor:
+            yield from cursor
+
+    def find_events(self, query):
+        """
+        The events matching query, without the fields that belong to the
+        search they were saved under.
+
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            list of dict: The events.
+        """
+        self.ensure_indexes()
+        return list(self.collection.find(query, {'_id': 0, 'search_key': 0}))
+
+    def events_by_id(self, event_ids):
+        """
+        Load the full events with the given _ids.
+
+        Args:
+            event_ids (list): _ids from iter_sorted_pages.
+
+        Returns:
+            dict: The events still stored, keyed by _id.
+        """
+        return {event['_id']: event for event in self.collection.find(
+            {'_id': {'$in': event_ids}})}
+
+    def iter_untyped_events(self, redo=False):
+        """
+        The events saved before typed_event_fields existed.
+
+        Args:
+            redo (bool, optional): Every event instead. Defaults to False.
+
+        Yields:
+            dict: The 'url' of each event and the fields the typed ones
+                are worked out from.
+        """
+        query = {} if redo else {'event_start': {'$exists': False}}
+        yield from self.collection.find(
+            query, {'_id': 0, 'url': 1, 'event_date_time': 1,
+                    'event_price': 1})
+
+    def count_events(self, query):
+        """
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            int: How many events match query.
+        """
+        return self.collection.count_documents(query)
+
+    def count_untyped_events(self, query):
+        """
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            int: How many events matching query were saved before
+                typed_event_fields existed, see iter_untyped_events.
+        """
+        return self.collection.count_documents(
+            {'$and': [query, {'event_start': {'$exists': False}}]})
+
+    def top_organisers(self, limit):
+        """
+        Find the organisers with the most events stored.
+
+        Args:
+            limit (int): How many organisers to return.
+
+        Returns:
+            list of dict: Each organiser's page link as '_id', its 'name'
+                        and how many stored 'events' it has, most events
+                        first.
+        """
+        return list(self.collection.aggregate([
+            {'$match': {'event_organiser_link': {'$nin': [None, '', 'N/A']}}},
+            {'$group': {'_id': '$event_organiser_link',
+                        'name': {'$first': '$event_organiser_name'},
+                        'events': {'$sum': 1}}},
+            {'$sort': {'events': -1}},
+            {'$limit': limit},
+        ]))
+
+    def average_price(self, query):
+        """
+        Average price of the events matching query, worked out by MongoDB
+        from the typed price_min field.
+
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            float: The average price, 0 if no event has a price.
+        """
+        result = list(self.collection.aggregate([
+            {'$match': priced_events_filter(query)},
+            {'$group': {'_id': None, 'average': {'$avg': '$price_min'}}},
+        ]))
+        return (result[0]['average'] if result else None) or 0
+        # $avg is null when none of the grouped events has a price
+
+    def median_price(self, query):
+        """
+        Median price of the events matching query. The prices are sorted
+        by MongoDB on the price_min index and only the one or two middle
+        prices are read, which gives the exact median on any server
+        version.
+
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            float: The median price, 0 if no event has a price.
+        """
+        priced = priced_events_filter(query)
+        n = self.collection.count_documents(priced)
+        if not n:
+            return 0
+        middle = [event['price_min'] for event in self.collection.find(
+            priced, {'_id': 0, 'price_min': 1}).sort(
+                'price_min', ASCENDING).skip((n - 1) // 2).limit(2 - n % 2)]
+        # One middle price for an odd count, the two either side for even
+        return sum(middle) / len(middle)
+
+    def date_counts(self, query, date_format):
+        """
+        Count the events matching query by their start date, grouped by
+        MongoDB on date_format, eg. '%Y-%m' for months.
+
+        Args:
+            query (dict): Fields the events must equal.
+            date_format (str): strftime style format the dates are
+                            grouped on.
+
+        Returns:
+            list of tuple: (formatted date, count) sorted by date.
+        """
+        return [(group['_id'], group['count'])
+                for group in self.collection.aggregate([
+                    {'$match': {'$and': [
+                        query, {'event_start': {'$type': 'date'}}]}},
+                    {'$group': {'_id': {'$dateToString': {
+                        'format': date_format, 'date': '$event_start'}},
+                        'count': {'$sum': 1}}},
+                    {'$sort': {'_id': 1}},
+                ])]
+
+    def price_range(self, query):
+        """
+        Args:
+            query (dict): Fields the events must equal.
+
+        Returns:
+            tuple: The lowest and highest price of the events matching
+                query, (None, None) if no event has a price.
+        """
+        result = list(self.collection.aggregate([
+            {'$match': priced_events_filter(query)},
+            {'$group': {'_id': None, 'low': {'$min': '$price_min'},
+                        'high': {'$max': '$price_min'}}},
+        ]))
+        if not result:
+            return None, None
+        return result[0]['low'], result[0]['high']
+
+    def price_bin_counts(self, query, edges):
+        """
+        Count the prices of the events matching query in each bin with
+        MongoDB's $bucket.
+
+        Args:
+            query (dict): Fields the events must equal.
+            edges (list of float): The bins' edges, lowest first.
+
+        Returns:
+            list of int: The count in each bin, the top edge counts in
+                        the last bin as with plt.hist.
+        """
+        counts = [0] * (len(edges) - 1)
+        for bucket in self.collection.aggregate([
+                {'$match': priced_events_filter(query)},
+                {'$bucket': {'groupBy': '$price_min', 'boundaries': edges,
+                             'default': 'last'}}]):
+            # $bucket leaves the top edge out of the last bin, the highest
+            # prices land in the default bucket and are added to it here
+            index = (len(counts) - 1 if bucket['_id'] == 'last'
+                     else edges.index(bucket['_id']))
+            counts[index] += bucket['count']
+        return counts
+
+    def iter_sorted_pages(self, query, choice, page_size=5):
+        """
+        Page through the events matching query in the order of a sort
+        menu option, using the (field, _id) indexes. Each page starts
+        after the last event of the one before (keyset pagination), so
+        every page is one indexed range query however far in the user
+        has gone.
+
+        Args:
+            query (dict): Fields the events must equal.
+            choice (str): The sort menu option, '1' to '4'.
+            page_size (int, optional): Events per page. Defaults to 5.
+
+        Yields:
+            list of dict: The next page of events, with the displayed
+                        fields, their _id and the field they are sorted on.
+        """
+        order_filter, field, direction = sorted_events_order(choice)
+        after = '$gt' if direction == ASCENDING else '$lt'
+        projection = {**EVENT_DISPLAY_PROJECTION, '_id': 1, field: 1}
+        last = None
+        while True:
+            conditions = [query, order_filter]
+            if last is not None:
+                conditions.append({'$or': [
+                    {field: {after: last[field]}},
+                    {field: last[field], '_id': {after: last['_id']}}]})
+                # Strictly after the last event shown, ties on field are
+                # broken by _id
+            page = list(self.collection.find(
+                {'$and': conditions}, projection).sort(
+                    [(field, direction), ('_id', direction)]).limit(page_size))
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last = page[-1]
+
+    def search_text(self, keywords, query, limit):
+        """
+        Find the events matching any of the keywords with the text index,
+        best matches first.
+
+        Args:
+            keywords (list of str): The words to look for.
+            query (dict): Fields the events must equal.
+            limit (int): The most events to return.
+
+        Returns:
+            list of dict: The matching events, each with its 'score'.
+        """
+        self.ensure_indexes()
+        return list(self.collection.find(
+            {'$text': {'$search': ' '.join(keywords)}, **query},
+            {'_id': 0, 'score': {'$meta': 'textScore'}}).sort(
+                [('score', {'$meta': 'textScore'})]).limit(limit))
+
+    def record_search(self, search_key, params):
+        """
+        Add a search to the search catalogue, or update it.
+
+        Args:
+            search_key (str): The search's key.
+            params (dict): The arguments run_search needs for it.
+        """
+        self.search_catalogue.update_one(
+            {'_id': search_key},
+            {'$set': {'params': params, 'last_searched': datetime.now()},
+             '$setOnInsert': {'event_count': 0}}, upsert=True)
+
+    def update_search_counts(self, search_keys, scraped=True):
+        """
+        Recount the events stored under each search key, one indexed
+        count each.
+
+        Args:
+            search_keys (iterable of str): The search keys that changed.
+            scraped (bool, optional): Update their last scraped time too.
+                                    Defaults to True.
+        """
+        updates = []
+        for search_key in search_keys:
+            fields = {'event_count': self.collection.count_documents(
+                {'search_key': search_key})}
+            if scraped:
+                fields['last_scraped'] = datetime.now()
+            updates.append(UpdateOne({'_id': search_key}, {'$set': fields},
+                                     upsert=True))
+        if updates:
+            self.search_catalogue.bulk_write(updates, ordered=False)
+
+    def searches(self):
+        """
+        The searches that have events stored, most recently scraped first.
+        The first time the catalogue is used with a collection saved
+        before it existed, the missing searches are added from the
+        events, once.
+
+        Returns:
+            list of dict: One catalogue entry per search, see
+                        get_search_catalogue.
+        """
+        if self.search_catalogue.find_one(
+                {'_id': self.CATALOGUE_BUILT_ID}) is None:
+            self.search_catalogue.bulk_write([
+                UpdateOne({'_id': entry['_id']},
+                          {'$set': {'event_count': entry['event_count'],
+                                    'last_scraped': entry['last_scraped']}},
+                          upsert=True)
+                for entry in self.collection.aggregate([
+                    {'$group': {'_id': '$search_key',
+                                'event_count': {'$sum': 1},
+                                'last_scraped': {'$max': '$scraped_at'}}}])
+                if entry['_id'] is not None] + [
+                UpdateOne({'_id': self.CATALOGUE_BUILT_ID},
+                          {'$set': {'built_at': datetime.now()}},
+                          upsert=True)])
+            # The marker has no event_count, so it's never listed
+        return list(self.search_catalogue.find(
+            {'event_count': {'$gt': 0}}).sort('last_scraped', -1))
+
+    def clear(self):
+        """
+        Delete every event and the search catalogue.
+        """
+        self.collection.delete_many({})
+        self.search_catalogue.delete_many({})
+
+    def diagnostics(self):
+        """
+        Show the indexes with how often each has been used, and explain
+        the queries the program runs most so it's clear which are served
+        by an index (IXSCAN) and which read the whole collection
+        (COLLSCAN).
+
+        Returns:
+            dict: Each query's label mapped to its summarise_explain
+                result.
+        """
+        self.ensure_indexes()
+        print(f'\n-------------------------------------'
+              f'\nEvents stored: {self.collection.estimated_document_count()}'
+              f'\n-------------------------------------\nIndexes:')
+        for index in self.collection.aggregate([{'$indexStats': {}}]):
+            print(f'  {index["name"]}: used {index["accesses"]["ops"]} times'
+                  f' since {index["accesses"]["since"]:%Y-%m-%d %H:%M}')
+
+        sample = self.collection.find_one(
+            {}, {'_id': 0, 'url': 1, 'search_key': 1}) or {}
+        # Real values, so the plans match what the program sees
+        queries = [
+            ('Event by URL (saving, freshness check)',
+             {'url': sample.get('url', '')}),
+            ('Events of a search (recent searches, stored results)',
+             {'search_key': sample.get('search_key', '')}),
+            ('Expired events (startup sweep)', expired_events_filter()),
+            ('Upcoming events', {'event_start': {'$gte': datetime.now()}}),
+            ('Events up to £10', {'price_min': {'$lte': 10}}),
+            ('Keyword search', {'$text': {'$search': 'music'}}),
+        ]
+        plans = {label: summarise_explain(
+            self.collection.find(query).explain())
+            for label, query in queries}
+        plans['Recent searches menu (search catalogue)'] = summarise_explain(
+            self.search_catalogue.find({'event_count': {'$gt': 0}}).sort(
+                'last_scraped', -1).explain())
+
+        print('-------------------------------------\nQuery plans:')
+        for label, plan in plans.items():
+            print(f'  {label}'
+                  f'\n    {" <- ".join(plan["stages"])}'
+                  f' {", ".join(plan["indexes"]) or "(no index)"}'
+                  f'\n    keys examined: {plan["keys_examined"]},'
+                  f' documents examined: {plan["docs_examined"]},'
+                  f' returned: {plan["returned"]}, {plan["millis"]}ms')
+        print('-------------------------------------')
+        return plans
+
+
+class SQLiteEventStore:
+    """
+    The events and search catalogue kept in a local SQLite file, for
+    running on one machine or without a network. The file is in WAL mode
+    so the background writer can save events while the menus read them,
+    and each thread has its own connection. Takes the same queries and
+    returns the same events as MongoEventStore, with the row id as _id.
+    """
+    LABEL = 'the SQLite database'
+    # How the store is named in summaries
+    EVENT_COLUMNS = (
+        'url', 'search_key', 'name', 'location', 'event_date_time',
+        'show_date_time', 'summary', 'event_price', 'event_organiser_name',
+        'event_organiser_link', 'tags', 'scraped_at', 'event_start',
+        'price_min', 'price_max', 'price_currency', 'is_free',
+        'is_sold_out')
+    DATE_COLUMNS = frozenset(
+        ('scraped_at', 'event_start', 'last_searched', 'last_scraped'))
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            search_key TEXT, name TEXT, location TEXT,
+            event_date_time TEXT, show_date_time TEXT, summary TEXT,
+            event_price TEXT, event_organiser_name TEXT,
+            event_organiser_link TEXT, tags TEXT, scraped_at TEXT,
+            event_start TEXT, price_min REAL, price_max REAL,
+            price_currency TEXT, is_free INTEGER, is_sold_out INTEGER);
+        CREATE INDEX IF NOT EXISTS events_search_key ON events (search_key);
+        CREATE INDEX IF NOT EXISTS events_event_date_time
+            ON events (event_date_time);
+        CREATE INDEX IF NOT EXISTS events_event_start ON events (event_start);
+        CREATE INDEX IF NOT EXISTS events_price_min ON events (price_min);
+        CREATE TABLE IF NOT EXISTS searches (
+            search_key TEXT PRIMARY KEY, params TEXT,
+            event_count INTEGER NOT NULL DEFAULT 0,
+            last_searched TEXT, last_scraped TEXT);
+        CREATE INDEX IF NOT EXISTS searches_last_scraped
+            ON searches (last_scraped);
+    '''
+    # Every index also holds the row id, so the event_start and price_min
+    # indexes are already in the (field, _id) order the sort menu pages in
+    TEXT_COLUMNS = ('name', 'summary', 'location', 'event_organiser_name')
+    TEXT_SCHEMA = f'''
+        CREATE VIRTUAL TABLE events_text USING fts5(
+            {", ".join(TEXT_COLUMNS)}, content='events', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3');
+        CREATE TRIGGER events_text_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_text (rowid, {", ".join(TEXT_COLUMNS)})
+            VALUES (new.id, {", ".join(f"new.{c}" for c in TEXT_COLUMNS)});
+        END;
+        CREATE TRIGGER events_text_delete AFTER DELETE ON events BEGIN
+            INSERT INTO events_text (
+                events_text, rowid, {", ".join(TEXT_COLUMNS)})
+            VALUES ('delete', old.id,
+                    {", ".join(f"old.{c}" for c in TEXT_COLUMNS)});
+        END;
+        CREATE TRIGGER events_text_update AFTER UPDATE OF
+            {", ".join(TEXT_COLUMNS)} ON events BEGIN
+            INSERT INTO events_text (
+                events_text, rowid, {", ".join(TEXT_COLUMNS)})
+            VALUES ('delete', old.id,
+                    {", ".join(f"old.{c}" for c in TEXT_COLUMNS)});
+            INSERT INTO events_text (rowid, {", ".join(TEXT_COLUMNS)})
+            VALUES (new.id, {", ".join(f"new.{c}" for c in TEXT_COLUMNS)});
+        END;
+    '''
+    # An FTS5 inverted index of the searchable text, kept up to date by
+    # the triggers. Words are also indexed by their first 2 and 3
+    # letters, so prefix searches don't scan the whole index
+    TEXT_WEIGHTS = (10.0, 1.0, 5.0, 5.0)
+    # bm25 weight of each of TEXT_COLUMNS, as in the MongoDB text index
+    PRICED = ('price_min IS NOT NULL AND is_free IS NOT 1'
+              ' AND is_sold_out IS NOT 1')
+    # The events priced_events_filter matches
+    SORT_ORDERS = {
+        '1': ('is_free = 1', 'price_min', 'ASC'),
+        '2': (PRICED, 'price_min', 'ASC'),
+        '3': ('price_min IS NOT NULL AND is_free IS NOT 1', 'price_min',
+              'DESC'),
+        '4': ('event_start > ?', 'event_start', 'ASC'),
+    }
+    # The sorted_events_order of each sort menu option
+    DISPLAY_COLUMNS = (
+        'id AS _id, name, location, show_date_time, event_price, url,'
+        ' event_organiser_name, event_organiser_link,'
+        ' substr(summary, 1, 121) AS summary')
+
+    def __init__(self, path):
+        """
+        Opens the database file, creating it and its tables and indexes
+        if they don't exist yet.
+
+        Args:
+            path (str): Where the database file is kept.
+        """
+        self.path = path
+        self.local = threading.local()
+        self.text_search = True
+        with self.connection() as connection:
+            connection.executescript(self.SCHEMA)
+            if connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'events_text'"
+                    ).fetchone() is None:
+                try:
+                    connection.executescript(self.TEXT_SCHEMA)
+                    connection.execute(
+                        "INSERT INTO events_text (events_text)"
+                        " VALUES ('rebuild')")
+                    # Index the events stored before the search existed
+                except sqlite3.OperationalError as e:
+                    self.text_search = False
+                    print(f'Keyword search is off, this SQLite has no'
+                          f' FTS5 ({e})')
+        print(f'Using the local event database {path}')
+
+    def connection(self):
+        """
+        Returns:
+            sqlite3.Connection: This thread's connection to the database.
+        """
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            # Wait for another process's write rather than fail
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            # Safe in WAL mode, commits don't wait on the disk
+            self.local.connection = connection
+        return connection
+
+    def ensure_indexes(self):
+        """
+        The tables and indexes are made when the store is opened.
+        """
+
+    @classmethod
+    def to_column(cls, column, value):
+        """
+        Args:
+            column (str): The column value is stored in.
+            value: The event's value.
+
+        Returns:
+            The value as SQLite stores it, dates as ISO text and tags as
+            JSON.
+        """
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ')
+        if column in ('tags', 'params') and value is not None:
+            return json.dumps(value)
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Args:
+            row (sqlite3.Row): A row read from the database.
+
+        Returns:
+            dict: The row as an event or catalogue entry like the ones
+                MongoDB returns.
+        """
+        event = {}
+        for column in row.keys():
+            value = row[column]
+            if value is None:
+                pass
+            elif column in cls.DATE_COLUMNS:
+                value = datetime.fromisoformat(value)
+            elif column in ('tags', 'params'):
+                value = json.loads(value)
+            elif column in ('is_free', 'is_sold_out'):
+                value = bool(value)
+            event[column] = value
+        return event
+
+    def where(self, query, *conditions):
+        """
+        Turn a query into an SQL WHERE clause.
+
+        Args:
+            query (dict): Fields the events must equal.
+            *conditions (str): More SQL conditions to add.
+
+        Returns:
+            tuple: The clause and its parameters.
+
+        Raises:
+            ValueError: If query has a field the events table doesn't.
+        """
+        clauses = list(conditions)
+        params = []
+        for field, value in query.items():
+            if field not in self.EVENT_COLUMNS:
+                raise ValueError(f'Events can not be filtered on {field}')
+            clauses.append(f'{field} = ?')
+            params.append(self.to_column(field, value))
+        return ' AND '.join(clauses) or '1', params
+
+    def upsert_events(self, events):
+        """
+        Insert or update events by URL in one transaction.
+
+        Args:
+            events (list of dict): The events, each with a 'url'.
+
+        Returns:
+            Counter: How many events were 'inserted', 'modified' and
+                    'matched'.
+        """
+        urls = {event['url'] for event in events}
+        changed = 0
+        connection = self.connection()
+        with connection:
+            known = sum(connection.execute(
+                f'SELECT COUNT(*) FROM events WHERE url IN'
+                f' ({",".join("?" * len(chunk))})', chunk).fetchone()[0]
+                for chunk in itertools.batched(urls, 500))
+            # Counted in chunks, SQLite limits the parameters per query
+            for columns, group in itertools.groupby(
+                    events, key=lambda event: tuple(
+                        column for column in self.EVENT_COLUMNS
+                        if column in event)):
+                # Each run of events with the same fields is written
+                # together, only those fields are set so the columns an
+                # event doesn't carry keep their stored values, as with
+                # $set. Runs keep the events in order, the last write of a
+                # URL wins
+                fields = [column for column in columns if column != 'url']
+                differs = ' OR '.join(
+                    f'{column} IS NOT excluded.{column}' for column in fields)
+                conflict = (
+                    f'DO UPDATE SET'
+                    f' {", ".join(f"{c} = excluded.{c}" for c in fields)}'
+                    f' WHERE {differs}' if fields else 'DO NOTHING')
+                # Only rows with a field that differs are updated, so the
+                # row count is the events inserted or really modified
+                changed += connection.executemany(
+                    f'INSERT INTO events ({", ".join(columns)})'
+                    f' VALUES ({", ".join("?" * len(columns))})'
+                    f' ON CONFLICT (url) {conflict}',
+                    [[self.to_column(column, event[column])
+                      for column in columns] for event in group]).rowcount
+        inserted = len(urls) - known
+        return Counter(inserted=inserted, modified=changed - inserted,
+                       matched=known)
+
+    def update_events(self, updates):
+        """
+        Set fields on stored events, in one transaction.
+
+        Args:
+            updates (list of tuple): (url, fields) for each event.
+
+        Returns:
+            Counter: How many events were 'matched' and 'modified'.
+        """
+        counts = Counter()
+        connection = self.connection()
+        with connection:
+            for url, fields in updates:
+                if not fields:
+                    continue
+                changed = connection.execute(
+                    f'UPDATE events SET'
+                    f' {", ".join(f"{field} = ?" for field in fields)}'
+                    f' WHERE url = ?',
+                    [self.to_column(field, value)
+                     for field, value in fields.items()] + [url]).rowcount
+                counts.update(matched=changed, modified=changed)
+        return counts
+
+    def delete_expired(self):
+        """
+        Delete the events expired_events_filter matches, using the
+        event_date_time index.
+
+        Returns:
+            int: How many events were deleted.
+        """
+        connection = self.connection()
+        with connection:
+            return connection.execute(
+                "DELETE FROM events WHERE event_date_time < ?"
+                " OR event_date_time IS NULL"
+                " OR event_date_time NOT GLOB ?",
+                (datetime.now().strftime('%Y-%m-%d 00:00:00'),
+                 EVENT_DATE_GLOB)).rowcount
+
+    def find_fresh_events(self, event_urls, cutoff):
+        """
+        See MongoEventStore.find_fresh_events.
+        """
+        fresh = {}
+        for chunk in itertools.batched(event_urls, 500):
+            for row in self.connection().execute(
+                    f'SELECT * FROM events WHERE url IN'
+                    f' ({",".join("?" * len(chunk))}) AND scraped_at >= ?',
+                    [*chunk, self.to_column('scraped_at', cutoff)]):
+                event = self.from_row(row)
+                del event['id']
+                event.pop('search_key', None)
+                fresh[event['url']] = event
+        return fresh
+
+    def stored_event_keys(self, event_urls):
+        """
+        See MongoEventStore.stored_event_keys.
+        """
+        wanted = {event_url_key(url) for url in event_urls}
+        stored = set()
+        for chunk in itertools.batched(event_url_prefixes(event_urls), 200):
+            for (url,) in self.connection().execute(
+                    'SELECT url FROM events WHERE '
+                    + ' OR '.join(['(url >= ? AND url < ?)'] * len(chunk)),
+                    [bound for prefix in chunk
+                     for bound in (prefix, prefix + '\U0010ffff')]):
+                stored.add(event_url_key(url))
+            # Each prefix is a range on the url index
+        return stored & wanted
+
+    def iter_events(self, query, display=False):
+        """
+        See MongoEventStore.iter_events.
+        """
+        clause, params = self.where(query)
+        cursor = self.connection().execute(
+            f'SELECT {self.DISPLAY_COLUMNS if display else "*"}'
+            f' FROM events WHERE {clause} ORDER BY id', params)
+        while True:
+            rows = cursor.fetchmany(MONGO_CURSOR_BATCH)
+            if not rows:
+                return
+            for row in rows:
+                event = self.from_row(row)
+                event.pop('id', None)
+                event.pop('_id', None)
+                yield event
+
+    def find_events(self, query):
+        """
+        See MongoEventStore.find_events.
+        """
+        events = list(self.iter_events(query))
+        for event in events:
+            event.pop('search_key', None)
+        return events
+
+    def events_by_id(self, event_ids):
+        """
+        See MongoEventStore.events_by_id.
+        """
+        found = {}
+        for chunk in itertools.batched(event_ids, 500):
+            for row in self.connection().execute(
+                    f'SELECT * FROM events WHERE id IN'
+                    f' ({",".join("?" * len(chunk))})', chunk):
+                event = self.from_row(row)
+                found[event.pop('id')] = event
+        return found
+
+    def iter_untyped_events(self, redo=False):
+        """
+        See MongoEventStore.iter_untyped_events.
+        """
+        last_id = 0
+        while True:
+            rows = self.connection().execute(
+                'SELECT id, url, event_date_time, event_price FROM events'
+                ' WHERE id > ?' + ('' if redo else ' AND event_start IS NULL')
+                + ' ORDER BY id LIMIT ?',
+                (last_id, MONGO_CURSOR_BATCH)).fetchall()
+            # Read a batch at a time by row id, so the events can be
+            # updated through the same connection in between
+            if not rows:
+                return
+            last_id = rows[-1]['id']
+            for row in rows:
+                yield self.from_row(row)
+
+    def count_events(self, query):
+        """
+        See MongoEventStore.count_events.
+        """
+        clause, params = self.where(query)
+        return self.connection().execute(
+            f'SELECT COUNT(*) FROM events WHERE {clause}',
+            params).fetchone()[0]
+
+    def count_untyped_events(self, query):  # pylint: disable=unused-argument
+        """
+        See MongoEventStore.count_untyped_events, every event in the
+        SQLite store is saved with its typed fields.
+        """
+        return 0
+
+    def top_organisers(self, limit):
+        """
+        See MongoEventStore.top_organisers.
+        """
+        return [self.from_row(row) for row in self.connection().execute(
+            "SELECT event_organiser_link AS _id,"
+            " MAX(event_organiser_name) AS name, COUNT(*) AS events"
+            " FROM events WHERE event_organiser_link NOT IN ('', 'N/A')"
+            " GROUP BY event_organiser_link ORDER BY events DESC LIMIT ?",
+            (limit,))]
+
+    def average_price(self, query):
+        """
+        See MongoEventStore.average_price.
+        """
+        clause, params = self.where(query, self.PRICED)
+        return self.connection().execute(
+            f'SELECT AVG(price_min) FROM events WHERE {clause}',
+            params).fetchone()[0] or 0
+
+    def median_price(self, query):
+        """
+        See MongoEventStore.median_price, the prices are read in order
+        from the price_min index.
+        """
+        clause, params = self.where(query, self.PRICED)
+        connection = self.connection()
+        n = connection.execute(
+            f'SELECT COUNT(*) FROM events WHERE {clause}',
+            params).fetchone()[0]
+        if not n:
+            return 0
+        middle = [price for (price,) in connection.execute(
+            f'SELECT price_min FROM events WHERE {clause}'
+            f' ORDER BY price_min LIMIT ? OFFSET ?',
+            [*params, 2 - n % 2, (n - 1) // 2])]
+        return sum(middle) / len(middle)
+
+    def date_counts(self, query, date_format):
+        """
+        See MongoEventStore.date_counts, grouped with SQLite's strftime.
+        """
+        clause, params = self.where(query, 'event_start IS NOT NULL')
+        return [tuple(row) for row in self.connection().execute(
+            f'SELECT strftime(?, event_start) AS day, COUNT(*) FROM events'
+            f' WHERE {clause} GROUP BY day ORDER BY day',
+            [date_format, *params])]
+
+    def price_range(self, query):
+        """
+        See MongoEventStore.price_range.
+        """
+        clause, params = self.where(query, self.PRICED)
+        return tuple(self.connection().execute(
+            f'SELECT MIN(price_min), MAX(price_min) FROM events'
+            f' WHERE {clause}', params).fetchone())
+
+    def price_bin_counts(self, query, edges):
+        """
+        See MongoEventStore.price_bin_counts.
+        """
+        bins = len(edges) - 1
+        counts = [0] * bins
+        clause, params = self.where(query, self.PRICED)
+        for index, count in self.connection().execute(
+                f'SELECT MIN(CAST((price_min - ?) / ? AS INTEGER), ?) AS bin,'
+                f' COUNT(*) FROM events WHERE {clause} GROUP BY bin',
+                [edges[0], (edges[-1] - edges[0]) / bins, bins - 1,
+                 *params]):
+            counts[index] += count
+        return counts
+
+    def iter_sorted_pages(self, query, choice, page_size=5):
+        """
+        See MongoEventStore.iter_sorted_pages, each page is a range read
+        of the event_start or price_min index.
+        """
+        condition, field, direction = self.SORT_ORDERS[choice]
+        clause, params = self.where(query, condition)
+        if '?' in condition:
+            params.insert(0, self.to_column(field, datetime.now()))
+        after = '>' if direction == 'ASC' else '<'
+        last = None
+        while True:
+            keyset = ('' if last is None
+                      else f' AND ({field}, id) {after} (?, ?)')
+            # Strictly after the last event shown, ties on field are
+            # broken by the row id
+            rows = self.connection().execute(
+                f'SELECT {self.DISPLAY_COLUMNS}, {field} AS sort_value'
+                f' FROM events WHERE {clause}{keyset}'
+                f' ORDER BY {field} {direction}, id {direction} LIMIT ?',
+                [*params, *(last or ()), page_size]).fetchall()
+            page = [self.from_row(row) for row in rows]
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last = (rows[-1]['sort_value'], rows[-1]['_id'])
+
+    def search_text(self, keywords, query, limit):
+        """
+        See MongoEventStore.search_text. Words also match the start of
+        longer ones, eg. 'work' finds 'workshop', and the matches are
+        ranked with bm25.
+
+        Raises:
+            ValueError: If this SQLite can't do keyword searches.
+        """
+        if not self.text_search:
+            raise ValueError('Keyword search needs SQLite with FTS5')
+        clause, params = self.where(query, 'events_text MATCH ?')
+        events = []
+        for row in self.connection().execute(
+                f'SELECT events.*, -bm25(events_text,'
+                f' {", ".join(map(str, self.TEXT_WEIGHTS))}) AS score'
+                f' FROM events_text'
+                f' JOIN events ON events.id = events_text.rowid'
+                f' WHERE {clause} ORDER BY score DESC LIMIT ?',
+                [' OR '.join(f'"{keyword}"*' for keyword in keywords),
+                 *params, limit]):
+            # Each keyword is quoted, so nothing typed is read as FTS5
+            # syntax, and * matches it as a prefix
+            event = self.from_row(row)
+            del event['id']
+            events.append(event)
+        return events
+
+    def record_search(self, search_key, params):
+        """
+        See MongoEventStore.record_search.
+        """
+        connection = self.connection()
+        with connection:
+            connection.execute(
+                'INSERT INTO searches (search_key, params, last_searched)'
+                ' VALUES (?, ?, ?) ON CONFLICT (search_key) DO UPDATE SET'
+                ' params = excluded.params,'
+                ' last_searched = excluded.last_searched',
+                (search_key, self.to_column('params', params),
+                 self.to_column('last_searched', datetime.now())))
+
+    def update_search_counts(self, search_keys, scraped=True):
+        """
+        See MongoEventStore.update_search_counts.
+        """
+        now = self.to_column('last_scraped', datetime.now())
+        connection = self.connection()
+        with connection:
+            for search_key in search_keys:
+                count = connection.execute(
+                    'SELECT COUNT(*) FROM events WHERE search_key = ?',
+                    (search_key,)).fetchone()[0]
+                connection.execute(
+                    'INSERT INTO searches (search_key, event_count,'
+                    ' last_scraped) VALUES (?, ?, ?)'
+                    ' ON CONFLICT (search_key) DO UPDATE SET'
+                    ' event_count = excluded.event_count' + (
+                        ', last_scraped = excluded.last_scraped'
+                        if scraped else ''),
+                    (search_key, count, now if scraped else None))
+
+    def searches(self):
+        """
+        See MongoEventStore.searches.
+        """
+        return [self.from_row(row) for row in self.connection().execute(
+            'SELECT search_key AS _id, event_count, last_scraped, params'
+            ' FROM searches WHERE event_count > 0'
+            ' ORDER BY last_scraped DESC')]
+
+    def clear(self):
+        """
+        Delete every event and the search catalogue.
+        """
+        connection = self.connection()
+        with connection:
+            connection.execute('DELETE FROM events')
+            connection.execute('DELETE FROM searches')
+
+    def diagnostics(self):
+        """
+        Show the indexes, and SQLite's plan for the queries the program
+        runs most, so it's clear which use an index (SEARCH ... USING
+        INDEX) and which read the whole table (SCAN).
+
+        Returns:
+            dict: Each query's label mapped to its plan's steps.
+        """
+        connection = self.connection()
+        (stored,) = connection.execute(
+            'SELECT COUNT(*) FROM events').fetchone()
+        print(f'\n-------------------------------------'
+              f'\nEvents stored: {stored}'
+              f'\n-------------------------------------\nIndexes:')
+        for table in ('events', 'searches'):
+            for index in connection.execute(f'PRAGMA index_list({table})'):
+                print(f'  {index["name"]}')
+        queries = [
+            ('Event by URL (saving, freshness check)',
+             'SELECT * FROM events WHERE url = ?', ('',)),
+            ('Events of a search (recent searches, stored results)',
+             'SELECT * FROM events WHERE search_key = ?', ('',)),
+            ('Expired events (startup sweep)',
+             "SELECT id FROM events WHERE event_date_time < ?"
+             " OR event_date_time IS NULL OR event_date_time NOT GLOB ?",
+             ('', EVENT_DATE_GLOB)),
+            ('Upcoming events',
+             'SELECT * FROM events WHERE event_start >= ?', ('',)),
+            ('Events up to £10',
+             'SELECT * FROM events WHERE price_min <= ?', (10,)),
+            ('Recent searches menu (search catalogue)',
+             'SELECT * FROM searches WHERE event_count > 0'
+             ' ORDER BY last_scraped DESC', ()),
+        ]
+        if self.text_search:
+            queries.append(
+                ('Keyword search',
+                 'SELECT rowid FROM events_text WHERE events_text MATCH ?',
+                 ('"music"*',)))
+        plans = {label: [row['detail'] for row in connection.execute(
+            f'EXPLAIN QUERY PLAN {sql}', params)]
+            for label, sql, params in queries}
+        print('-------------------------------------\nQuery plans:')
+        for label, steps in plans.items():
+            print(f'  {label}\n    {" / ".join(steps)}')
+        print('-------------------------------------')
+        return plans
+
+
+def open_event_store():
+    """
+    Open the event store EVENT_STORE names.
+
+    Returns:
+        MongoEventStore or SQLiteEventStore: The store.
+
+    Raises:
+        ValueError: If EVENT_STORE isn't 'mongodb' or 'sqlite'.
+    """
+    if EVENT_STORE == 'sqlite':
+        return SQLiteEventStore(SQLITE_PATH)
+    if EVENT_STORE != 'mongodb':
+        raise ValueError(f"EVENT_STORE must be 'mongodb' or 'sqlite',"
+                         f" not {EVENT_STORE!r}")
+    return MongoEventStore(os.getenv('MONGO_URI'))
+
+
+event_store = None
+event_store_lock = threading.Lock()
+
+
+def get_event_store():
+    """
+    Open the event store the first time it is needed and return it on
+    every call after, so importing run.py doesn't connect to anything.
+
+    Returns:
+        MongoEventStore or SQLiteEventStore: The shared store.
+    """
+    global event_store  # pylint: disable=global-statement
+    with event_store_lock:
+        if event_store is None:
+            event_store = open_event_store()
+    return event_store
+
+
+def ensure_indexes():
+    """
+    Make sure the event store's indexes exist, see
+    MongoEventStore.ensure_indexes.
+    """
+    get_event_store().ensure_indexes()
+
+
+def check_and_delete_old_events():
+    """
+    Delete the stored events with start dates that have already passed,
+    or with no readable start date, in one indexed delete rather than
+    reading every event.
+
+    Returns:
+        int: How many events were deleted.
+    """
+    deleted = get_event_store().delete_expired()
+    if deleted:
+        update_search_counts(
+            [entry['_id'] for entry in get_event_store().searches()],
+            scraped=False)
+        # Keep the recently searched menu's counts right
+    return deleted
+
+
+# The shape parsed_scraped_date stores event dates in, anything else in
+# event_date_time is a placeholder or a date that couldn't be read
+EVENT_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+EVENT_DATE_GLOB = ('[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                   ' [0-9][0-9]:[0-9][0-9]:[0-9][0-9]')
+# The same shape for SQLite's GLOB, which matches the whole value
+
+
+def expired_events_filter():
+    """
+    The query matching events whose start date has passed or
+    can't be read, used by check_and_delete_old_events.
+
+    Returns:
+        dict: The MongoDB query.
+    """
+    start_of_today = datetime.now().strftime('%Y-%m-%d 00:00:00')
+    return {'$or': [
+        {'event_date_time': {'$lt': start_of_today}},
+        # Dates are stored as zero padded '%Y-%m-%d %H:%M:%S' strings,
+        # so earlier dates sort before today as text
+        {'event_date_time': {'$not': EVENT_DATE_PATTERN}},
+        # Placeholders like 'N/A', malformed dates like '12 Nov' and no
+        # date at all, checked against the index keys
+    ]}
+
+
+def start_expiry_sweep():
+    """
+    Run check_and_delete_old_events on a background thread, so starting
+    the program doesn't wait on it however big the collection gets.
+
+    Returns:
+        threading.Thread: The running sweep.
+    """
+    def sweep():
+        try:
+            check_and_delete_old_events()
+        except STORAGE_ERRORS as e:
+            print(f'Could not remove old events: {e}')
+            # Carry on without the database rather than fail
+
+    thread = threading.Thread(target=sweep, daemon=True)
+    thread.start()
+    return thread
+
+
+PRICE_AMOUNT_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+CURRENCY_CODE_PATTERN = re.compile(r'\b[A-Z]{3}\b')
+CURRENCY_SYMBOLS = {'£': 'GBP', '€': 'EUR', '$': 'USD'}
+
+
+def parse_event_price(price_str):
+    """
+    Read the numbers out of an event_price like '£12.50 – £30', 'Free'
+    or 'Sold Out', so prices can be sorted and filtered by MongoDB.
+
+    Args:
+        price_str (str): The price as shown on Eventbrite.
+
+    Returns:
+        dict: 'price_min' and 'price_max' (floats, None if there's no
+            price), 'price_currency' (ISO code or None), 'is_free'
+            and 'is_sold_out'.
+    """
+    text = price_str if isinstance(price_str, str) else ''
+    lowered = text.strip().lower()
+    amounts = [float(amount.replace(',', ''))
+               for amount in PRICE_AMOUNT_PATTERN.findall(text)]
+    is_free = (lowered in ('free', 'donation')
+               or bool(amounts) and max(amounts) == 0)
+    # Donation events count as free, the same as the sort menu
+    if is_free and not amounts:
+        amounts = [0.0]
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items()
+                     if symbol in text), None)
+    if currency is None:
+        code = CURRENCY_CODE_PATTERN.search(text)
+        currency = code.group() if code else None
+    return {
+        'price_min': min(amounts) if amounts else None,
+        'price_max': max(amounts) if amounts else None,
+        'price_currency': currency,
+        'is_free': is_free,
+        'is_sold_out': 'sold out' in lowered,
+    }
+
+
+def parse_event_start(event_date_time):
+    """
+    Turn a stored event_date_time string into a datetime.
+
+    Args:
+        event_date_time (str): eg. '2024-11-07 12:30:00', or 'N/A'.
+
+    Returns:
+        datetime: The start time, or None if the string isn't a date.
+    """
+    try:
+        return datetime.strptime(event_date_time, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
+def typed_event_fields(event):
+    """
+    The native BSON versions of an event's date and price, stored next to
+    the display strings so MongoDB can sort, filter and index them.
+
+    Args:
+        event (dict): An event with 'event_date_time' and 'event_price'.
+
+    Returns:
+        dict: 'event_start' and the parse_event_price fields.
+    """
+    fields = {'event_start': parse_event_start(event.get('event_date_time'))}
+    fields.update(parse_event_price(event.get('event_price')))
+    return fields
+
+
+def write_event_upserts(events):
+    """
+    Save events to the event store, adding new ones and updating the ones
+    already stored by URL, a page of events in one write.
+
+    Args:
+        events (list of dict): The events to save, each with a 'url'.
+
+    Returns:
+        Counter: How many events were 'inserted', 'modified' and
+                'matched', and how many writes 'failed'.
+    """
+    counts = Counter()
+    if not events:
+        return counts
+    try:
+        return get_event_store().upsert_events(events)
+    except STORAGE_ERRORS as e:
+        counts['failed'] = len(events)
+        print(f'Error saving events: {e}')
+        return counts
+
+
+class EventWriteBuffer:
+    """
+    Collects events to save and writes them on a background thread, so
+    saving events doesn't hold up the display. Events from several pages
+    are written together, once batch_size are waiting or flush_seconds
+    after the first one arrived, whichever comes first.
+    """
+    def __init__(self, batch_size, flush_seconds):
+        """
+        Initializes the buffer, the writer thread starts on first use.
+
+        Args:
+            batch_size (int): The most events saved in one write.
+            flush_seconds (float): How long an event can wait
+                                for more to join it.
+        """
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.pending = []
+        self.pending_keys = set()
+        self.writing = False
+        self.flushing = False
+        self.totals = Counter()
+        # Running counts over every write
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def add(self, events, search_key=None):
+        """
+        Queue events to be written in the background.
+
+        Args:
+            events (list of dict): The events to queue.
+            search_key (str, optional): The search they are saved under,
+                                    its catalogue count is updated once
+                                    they are written.
+        """
+        with self.condition:
+            self.pending.extend(events)
+            if search_key is not None:
+                self.pending_keys.add(search_key)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                deadline = time.monotonic() + self.flush_seconds
+                while (len(self.pending) < self.batch_size
+                       and not self.flushing
+                       and time.monotonic() < deadline):
+                    self.condition.wait(deadline - time.monotonic())
+                    # Give the next pages a chance to join this write
+                batch = self.pending[:self.batch_size]
+                del self.pending[:self.batch_size]
+                search_keys = set(self.pending_keys)
+                if not self.pending:
+                    self.pending_keys.clear()
+                # Keys with events still queued are counted again
+                # after the next batch
+                self.writing = True
+            counts = Counter(failed=len(batch))
+            try:
+                counts = write_event_upserts(batch)
+                update_search_counts(search_keys)
+            except STORAGE_ERRORS as e:
+                print(f'Could not update the search catalogue: {e}')
+            except Exception as e:  # pylint: disable=broad-except
+                print(f'Error saving events: {e!r}')
+                # Drop the batch rather than let the writer thread die,
+                # flush() would then wait on it forever
+            finally:
+                with self.condition:
+                    self.totals.update(counts)
+                    self.writing = False
+                    self.condition.notify_all()
+
+    def flush(self, report=False):
+        """
+        Write everything queued now and wait until it is saved, eg. before
+        reading the collection back or when the program exits.
+
+        Args:
+            report (bool, optional): Print how many events were saved
+                                since the last report. Defaults to False.
+        """
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            while self.thread is not None and (self.pending or self.writing):
+                self.condition.wait()
+            self.flushing = False
+            totals = Counter(self.totals)
+            if report:
+                self.totals.clear()
+        if report and totals:
+            print(f'-------------------------------------'
+                  f'\nSaved events: {totals["inserted"]} new,'
+                  f' {totals["modified"]} updated,'
+                  f' {totals["failed"]} failed'
+                  f'\n-------------------------------------')
+
+
+event_writer = EventWriteBuffer(MONGO_WRITE_BATCH, MONGO_FLUSH_SECONDS)
+atexit.register(event_writer.flush, report=True)
+# Don't lose events still waiting to be written when the program exits
+
+
+def save_to_mongodb(search_key, collected_events, wait=True):
+    """
+    Save user viewed events to the event store, every event in one write.
+
+    Args:
+        search_key (str): The phrase the user used to search for events.
+        collected_events (list of dict): The user's collected events.
+        wait (bool, optional): Write now and return the counts. When False
+                            the events are queued with the other pages'
+                            and written in the background.
+                            Defaults to True.
+
+    Returns:
+        Counter: How many events were 'inserted', 'modified', 'matched'
+                or 'failed', or None when not waiting.
+    """
+    operations = []
+    # The events to save, in the form they are stored
+    for event in collected_events:
+        if isinstance(event, dict):
+            unique_id = event.get('url', 'N/A')
+            if unique_id == 'N/A':
+                continue
+
+            event_data = {
+                'search_key': search_key,
+                'url': unique_id,
+                'name': event.get('name', 'N/A'),
+                'location': event.get('location', 'N/A'),
+                'event_date_time': event.get('event_date_time', 'N/A'),
+                'show_date_time': event.get('show_date_time', 'N/A'),
+                'summary': event.get('summary', 'N/A'),
+                'event_price': event.get('event_price', 'N/A'),
+                'event_organiser_name': event.get(
+                    'event_organiser_name', 'N/A'),
+                'event_organiser_link': event.get(
+                    'event_organiser_link', 'N/A'),
+                'tags': event.get('tags', []),
+                'scraped_at': event.get('scraped_at', datetime.now()),
+                # When the event's page was scraped, used to decide if
+                # the next search can reuse it instead of scraping again
+            }
+            event_data.update(typed_event_fields(event_data))
+            # Native date and price fields for the store to query on
+
+            operations.append(event_data)
+        else:
+            print(f"Skipping invalid event: {event}")
+
+    if not wait:
+        event_writer.add(operations, search_key)
+        return None
+    counts = write_event_upserts(operations)
+    try:
+        update_search_counts([search_key])
+    except STORAGE_ERRORS as e:
+        print(f'Could not update the search catalogue: {e}')
+    return counts
+
+
+def find_fresh_events(event_urls):
+    """
+    Look up, in one query, which of the given event URLs are already in
+    the collection and were scraped within the last EVENT_FRESHNESS_HOURS.
+
+    Args:
+        event_urls (list of str): The event URLs found on a listing page.
+
+    Returns:
+        dict: The stored event documents that are still fresh, keyed by URL.
+    """
+    if not event_urls or EVENT_FRESHNESS_HOURS <= 0:
+        return {}
+    cutoff = datetime.now() - timedelta(hours=EVENT_FRESHNESS_HOURS)
+    try:
+        return get_event_store().find_fresh_events(event_urls, cutoff)
+    except STORAGE_ERRORS as e:
+        print(f'Could not check for stored events: {e}')
+        return {}
+        # Scrape everything rather than fail the search
+
+
+def find_top_organisers(limit):
+    """
+    Find the organisers with the most events in the collection.
+
+    Args:
+        limit (int): How many organisers to return.
+
+    Returns:
+        list of dict: Each organiser's page link as '_id', its 'name' and
+                    how many stored 'events' it has, most events first.
+    """
+    return get_event_store().top_organisers(limit)
+
+
+def record_search(search_key, params):
+    """
+    Add a search to the search catalogue, or update it, with the
+    parameters needed to run it again.
+
+    Args:
+        search_key (str): The search's key.
+        params (dict): The arguments run_search needs for it.
+    """
+    try:
+        get_event_store().record_search(search_key, params)
+    except STORAGE_ERRORS as e:
+        print(f'Could not record the search: {e}')
+
+
+def update_search_counts(search_keys, scraped=True):
+    """
+    Recount the events stored under each search key in the search
+    catalogue. Each count is one indexed count on search_key, so this
+    costs the same however big the collection is.
+
+    Args:
+        search_keys (iterable of str): The search keys that changed.
+        scraped (bool, optional): Events were just saved under these keys,
+                                so update their last scraped time too.
+                                Defaults to True.
+    """
+    get_event_store().update_search_counts(search_keys, scraped)
+
+
+def get_search_catalogue():
+    """
+    The searches that have events stored, most recently scraped first.
+    The first time the catalogue is used with a collection saved before
+    it existed, the missing searches are added from the events, once.
+
+    Returns:
+        list of dict: One catalogue entry per search, with its key as
+                    '_id', 'event_count', 'last_scraped' and, for searches
+                    run since the catalogue was added, 'params'.
+    """
+    return get_event_store().searches()
+
+
+def find_stored_search(search_key):
+    """
+    Look up the events saved under a search key, so a search that has
+    been run before can show them straight away while it is refreshed.
+
+    Args:
+        search_key (str): The search's key, eg. 'music_london'.
+
+    Returns:
+        list of dict: The stored events, empty if there are none or
+                    SERVE_STORED_SEARCHES is off.
+    """
+    if not SERVE_STORED_SEARCHES:
+        return []
+    event_writer.flush()
+    # Include events from the last search still waiting to be written
+    try:
+        return get_event_store().find_events({'search_key': search_key})
+    except STORAGE_ERRORS as e:
+        print(f'Could not load stored events: {e}')
+        return []
+        # Fall back to scraping the search from scratch
+
+
+def save_to_csv(events):
+    """
+    Save events in the mongodb collection to a CSV file.
+
+    Args:
+        events (iterable of dict): The users collected events.
+    """
+    directory = 'data_visuals'
+    file_name = os.path.join(directory, 'collected_events.csv')
+    file_exists = os.path.exists(file_name)
+
+    fields = [
+        'name', 'location', 'show_date_time', 'event_price', 'summary',
+        'url', 'event_organiser_name', 'event_organiser_link'
+        ]
+
+    with open(file_name, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+
+        if not file_exists:
+            writer.writeheader()
+
+        for event in events:
+            filtered_event = {
+                field: event[field] for field in fields if field in event}
+            # this will only include the fields that are in the fields
+            # list above, so that fields that only have a programmatic purpose
+            # are not included in the CSV it works by creating a new
+            # dictionary with only the fields that are in the fields list
+            writer.writerow(filtered_event)
+
+    print(f'\n-------------------------------------\nEvents saved to'
+          f'{file_name}, download/view with option 7,'
+          '\nOr from the main menu with option 5.'
+          f'\n-------------------------------------')
+    upload_to_gcs(
+        'data-visuals-serving', file_name, os.path.basename(file_name))
+    # os.path.basename() example: 'data_visuals/collected_events.csv'
+    # -> 'collected_events.csv'
+    return
+
+
+def save_to_excel(events, filename='data_visuals/events_data.xlsx'):
+    """
+    Save events in the mongodb collection to an Excel file.
+
+    Args:
+        events (iterable of dict): The users collected events.
+        filename (str, optional): The filename for the Excel file,
+                                Defaults to 'data_visuals/events_data.xlsx'.
+    """
+    filename = check_file_unique(filename)
+    workbook = openpyxl.Workbook()
+    # Create a new Excel workbook
+    sheet = workbook.active
+    # active means the first sheet in the workbook
+    sheet.title = 'Events Data'
+    # Set the title of the sheet to 'Events Data'
+    headers = [
+        'Event Name', 'Date', 'Location', 'Price',
+        'Summary', 'URL', 'Organiser', 'Organiser Link']
+    column_widths = [71, 58, 111, 12, 81, 140, 71, 140]
+    # Set the column headers and their widths
+
+    for col_num, (header, width) in enumerate(zip(headers, column_widths), 1):
+        # for every col_num and its corresponding header and width, enumerate
+        # will return the index and value of each column, and then associate
+        # the declared headers and column_widths stated above with the index
+        col_letter = get_column_letter(col_num)
+        # get_column_letter() is a built in function from openpyxl that
+        # returns the letter of the specified column,
+        # example: 1 -> 'A', 2 -> 'B'
+        sheet[f'{col_letter}1'] = header
+        # Will set the headers stated above in the first row of the sheet
+        # iterating through columns A, B, C, D, E, F
+        sheet.column_dimensions[col_letter].width = width
+        # column_dimensions is a dictionary that stores the width of each
+        # column, the width is set to the width in the column_widths list
+
+    for row_num, event in enumerate(events, 2):
+        sheet[f'A{row_num}'] = event.get('name', 'N/A')
+        sheet[f'B{row_num}'] = event.get('show_date_time', 'N/A')
+        sheet[f'C{row_num}'] = event.get('location', 'N/A')
+        sheet[f'D{row_num}'] = event.get('event_price', 'N/A')
+        sheet[f'E{row_num}'] = event.get('summary', 'N/A')
+        sheet[f'F{row_num}'] = event.get('url', 'N/A')
+        sheet[f'G{row_num}'] = event.get('event_organiser_name', 'N/A')
+        sheet[f'H{row_num}'] = event.get('event_organiser_link', 'N/A')
+
+    workbook.save(filename)
+    print(f'\n-------------------------------------\nEvents saved to'
+          f'{filename}, download/view from the main menu.'
+          f'\n-------------------------------------')
+    upload_to_gcs('data-visuals-serving', filename, os.path.basename(filename))
+    return
+
+
+def parsed_scraped_date(date_time):
+    """
+    Turn the user friendley (readable) event date and time into a
+    computer readable datetime object.
+
+    Args:
+        date_time (str): User friendly date and time string.
+
+    Returns:
+        string: A date_time string in the format '%Y-%m-%d %H:%M:%S'.
+    """
+    if 'No date and time available' in date_time or not date_time.strip():
+        return 'N/A'
+    # If the date_time is not available, return 'N/A'
+    replacements = {
+        'Monday': '',
+        'Mon': '',
+        'Tuesday': '',
+        'Tue': '',
+        'Wednesday': '',
+        'Wed': '',
+        'Thursday': '',
+        'Thu': '',
+        'Friday': '',
+        'Fri': '',
+        'Saturday': '',
+        'Sat': '',
+        'Sunday': '',
+        'Sun': '',
+        'Starts on': '',
+        'GMT': '',
+        'GMT+1': '',
+        'January': 'Jan',
+        'February': 'Feb',
+        'March': 'Mar',
+        'April': 'Apr',
+        'May': 'May',
+        'June': 'Jun',
+        'July': 'Jul',
+        'August': 'Aug',
+        'September': 'Sep',
+        'October': 'Oct',
+        'November': 'Nov',
+        'December': 'Dec',
+        'pm': 'PM',
+        'am': 'AM',
+        '·': '',
+        ' - ': ' ',
+        '+1': '',
+    }
+
+    for key, value in replacements.items():
+        date_time = date_time.replace(key, value)
+    # Replace the long names of the days and months with their abbreviations
+    # Also replace other unwanted strings
+
+    # Remove any extra spaces and commas
+    date_time = ' '.join(date_time.split()).replace(',', '')
+
+    # Identify and correct multiple months in the date_time
+    month_abbrs = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    month_count = {month: date_time.count(month) for month in month_abbrs}
+    # Counts the occurrences of each month abbreviation in the date_time
+    months_found = [month for month, count in month_count.items() if count > 0]
+
+    if len(months_found) > 1:
+        # Replace first month witht he last one specified
+        first_month = months_found[0]
+        last_month = months_found[-1]
+        date_time = date_time.replace(first_month, last_month, 1)
+
+    # For cases where users enter date ranges, only take the first date
+    date_time_parts = date_time.split(' ')
+    # Only take the first 5 parts of the date_time
+    if len(date_time_parts) > 3:
+        date_time = ' '.join(date_time_parts[:3])
+    # If the length of the date_time is less than 3, return the date_time as is
+    # If the length of the date_time is greater than 3,
+    # only take the first 5 parts of the date_time
+    # parts example: ['2024-10-19', '16:30:00']
+
+    try:
+        # Use dateutil.parser to parse the date
+        dt = parser.parse(date_time, fuzzy=True)
+        # example: 2024-10-19 16:30:00
+    except ValueError:
+        # parser.parse will try to parse the date and time from the string
+        # fuzzy=True allows for more flexibility in the date format
+        parts = date_time.split()
+        # example ['2024-10-19', '16:30:00']
+        if len(parts) >= 2:
+            try:
+                year, month, day = map(int, parts[0].split('-'))
+                last_valid_day = calendar.monthrange(year, month)[1]
+
+                if day > last_valid_day:
+                    day = last_valid_day
+
+                corrected_date = f'{year}-{month}-{day} {parts[1]}'
+                dt = parser.parse(corrected_date, fuzzy=True)
+            except ValueError:
+                return 'N/A'
+
+    # Format the datetime object into the desired format
+    formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    return formatted_date
+
+
+# Only the fields display_events prints are read when viewing stored
+# events, summaries are cut just past the length shown
+EVENT_DISPLAY_PROJECTION = {
+    '_id': 0, 'name': 1, 'location': 1, 'show_date_time': 1,
+    'event_price': 1, 'url': 1, 'event_organiser_name': 1,
+    'event_organiser_link': 1,
+    'summary': {'$substrCP': [{'$ifNull': ['$summary', '']}, 0, 121]},
+}
+
+
+def print_event(data):
+    """
+    Print one event in the readable format used by every events view,
+    events without a date and time are skipped.
+
+    Args:
+        data (dict): The event's data.
+
+    Returns:
+        bool: True if the event was printed.
+    """
+    if not isinstance(data, dict):
+        return False  # Skip invalid event data
+    show_date_time = data.get('show_date_time', 'No date and time available')
+    if show_date_time == 'No date and time available':
+        return False  # Skip invalid event data
+    summary = data.get('summary', '')
+    truncated_summary = (
+        summary[:120] + '...' if len(summary) > 120 else summary)
+    print(f'-------------------------------------\n{data["name"]},'
+          f'\n{data["location"]}\n{data["show_date_time"]}'
+          f'\nPrice: {data["event_price"]}'
+          f'\nSummary: {truncated_summary}'
+          f'\nEvent URL: {data["url"]}'
+          f'\nOrganiser: {data["event_organiser_name"]}'
+          f'\nOrganiser\'s Link: {data["event_organiser_link"]}'
+          f'\n-------------------------------------')
+    return True
+
+
+def display_stored_events(query):
+    """
+    Print the stored events matching query straight from a cursor,
+    MONGO_CURSOR_BATCH at a time and with only the displayed fields, so
+    viewing a large collection doesn't load it into memory.
+
+    Args:
+        query (dict): Fields the events to show must equal,
+                    eg. {'search_key': 'music_london'}.
+
+    Returns:
+        int: The number of events read from the collection.
+    """
+    count = 0
+    for data in get_event_store().iter_events(query, display=True):
+        print_event(data)
+        count += 1
+    print('-------------------------------------'
+          '\nEvents displayed in relevance bottom to top.')
+    return count
+
+
+def load_stored_events(query):
+    """
+    Full stored events matching query, read lazily for exports and the
+    data tasks once the user has chosen one.
+
+    Args:
+        query (dict): Fields the events must equal.
+
+    Returns:
+        iterator: The events, fetched MONGO_CURSOR_BATCH at a time.
+    """
+    return get_event_store().iter_events(query)
+
+
+def display_events(events, start_index, end_index, user_selection, search_key):
+    """
+    Display events to the user in a readable, friendley format.
+
+    Args:
+        events (list of dict): Scraped event data.
+        start_index (int): The start index of the events to display.
+        end_index (int): The end index of the events to display.
+        user_selection (str): A backend string to determine what to do
+        search_key (str): The phrase the user used to search for events.
+
+    Returns:
+        List of dict: The events displayed to the user.
+    """
+    collected_events = events[start_index:end_index]
+    for data in collected_events:
+        print_event(data)
 
-    # Identify and correct multiple months in the date_time
-    month_abbrs = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    month_count = {month: date_time.count(month) for month in month_abbrs}
-    # Counts the occurrences of each month abbreviation in the date_time
-    months_found = [month for month, count in month_count.items() if count > 0]
+    if user_selection == 'data-manipulation':
+        return print('-------------------------------------'
+                     '\nEvents displayed in relevance bottom to top.')
 
-    if len(months_found) > 1:
-        # Replace first month witht he last one specified
-        first_month = months_found[0]
-        last_month = months_found[-1]
-        date_time = date_time.replace(first_month, last_month, 1)
+    if user_selection in ('eventbrite', 'eventbrite_top',
+                          'eventbrite_top_no_category'):
+        save_to_mongodb(search_key, collected_events, wait=False)
+        # Written in the background, the user doesn't wait on the store
+
+    if user_selection == 'data-manipulation-done':
+        offer_to_save(collected_events)
+        return
+
+    # Cache the events in the hashtable
+    cache[search_key] = events
+
+
+def offer_to_save(events):
+    """
+    Ask the user if the events just shown should be saved to a CSV or
+    Excel file, and save them if so.
+
+    Args:
+        events (iterable of dict): The events shown to the user.
+    """
+    save_choice = input('-------------------------------------'
+                        '\nWould you like to save the events to a CSV or'
+                        ' Excel file? (C/E)\nOr type anything else'
+                        ' to continue: ').strip().lower()
+    if save_choice == 'c':
+        try:
+            save_to_csv(events)
+        except ValueError as e:
+            print(f'Error saving events to CSV: {e}')
+    elif save_choice == 'e':
+        try:
+            save_to_excel(events)
+        except ValueError as e:
+            print(f'Error saving events to Excel: {e}')
+
+
+def iter_event_details(pending_events, scrape_detail, max_workers=None):
+    """
+    Run scrape_detail over every event found on a listing page, using a
+    bounded pool of worker threads so the detail pages are fetched in
+    parallel instead of one round trip after another. Each result is
+    handed back as soon as it and every event before it are done.
+
+    Args:
+        pending_events (list of dict): Events found on the listing page,
+                                    each with at least a 'url' key.
+        scrape_detail (function): Fetches and parses one event's detail page,
+                                returns a tuple of (event_info, event_tags).
+        max_workers (int, optional): How many detail pages to fetch at once.
+                                    Defaults to SCRAPE_WORKERS.
+
+    Yields:
+        tuple: The scrape_detail results in the same order
+            as pending_events.
+    """
+    if max_workers is None:
+        max_workers = SCRAPE_WORKERS
+
+    if max_workers <= 1 or len(pending_events) <= 1:
+        for event_info in pending_events:
+            yield scrape_detail(event_info)
+        return
+        # No point starting threads for a single worker or a single event
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(pending_events)))
+    try:
+        yield from executor.map(scrape_detail, pending_events)
+        # executor.map hands back the results in the order the events
+        # were given, not the order the fetches finished in, so the page
+        # reads the same as it would if scraped one event at a time
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # If the caller stops early, drop the fetches not yet started
+
+
+def collect_events(event_iterator):
+    """
+    Run one of the iter_eventbrite_* generators to the end and gather
+    everything it yields.
+
+    Args:
+        event_iterator (generator): Yields (event_info, event_tags) and
+                                    returns more_events_check.
+
+    Returns:
+        tuple: A tuple containing:
+            - event_data (list): A list of dictionaries,
+                each representing an event.
+            - tags_counter (Counter): A Counter object counting
+                the occurrences of tags.
+            - more_events_check (bool): A boolean indicating if there
+                are more events to fetch.
+    """
+    event_data = []
+    tags_counter = Counter()
+    while True:
+        try:
+            event_info, event_tags = next(event_iterator)
+        except StopIteration as stop:
+            return event_data, tags_counter, stop.value
+            # A generator's return value comes back on StopIteration
+        tags_counter.update(event_tags)
+        event_data.append(event_info)
+
+
+class EventStream:
+    """
+    Consumes one of the iter_eventbrite_* generators on a background
+    thread, appending each event to a list as soon as it is scraped, so
+    the first events can be shown while the rest of the page loads.
+    In merge mode an event already in the list (by URL) is replaced
+    rather than added again, for refreshing stored search results.
+    """
+    def __init__(self, event_iterator, events=None, merge=False):
+        """
+        Initializes the stream and starts consuming straight away.
+
+        Args:
+            event_iterator (generator): Yields (event_info, event_tags)
+                                        and returns more_events_check.
+            events (list, optional): The list the events are appended to,
+                                    a new list by default.
+            merge (bool, optional): Replace events already in the list
+                                instead of adding them again.
+                                Defaults to False.
+        """
+        self.event_iterator = event_iterator
+        self.events = events if events is not None else []
+        self.merge = merge
+        self.positions = {}
+        # Event URL -> index in self.events, only kept in merge mode
+        self.changed = []
+        # Events the merge added or changed, to be saved
+        if merge:
+            self._index_events()
+        self.count = 0
+        # How many events this stream has scraped
+        self.tags_counter = Counter()
+        self.more_events_check = False
+        self.done = False
+        self.condition = threading.Condition()
+        self.stop_running = threading.Event()
+        threading.Thread(target=self._consume, daemon=True).start()
+
+    def _consume(self):
+        """
+        Pull events from the generator until it finishes or is stopped.
+        """
+        try:
+            while not self.stop_running.is_set():
+                try:
+                    event_info, event_tags = next(self.event_iterator)
+                except StopIteration as stop:
+                    self.more_events_check = stop.value
+                    break
+                with self.condition:
+                    self.tags_counter.update(event_tags)
+                    self._add(event_info)
+                    self.count += 1
+                    self.condition.notify_all()
+                    # Wake up anything waiting in wait_for
+        except requests.RequestException as e:
+            print(f'\nCould not fetch events: {e}')
+        finally:
+            self.event_iterator.close()
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    def _index_events(self):
+        self.positions = {event.get('url'): index
+                          for index, event in enumerate(self.events)
+                          if isinstance(event, dict)}
+
+    def _add(self, event_info):
+        """
+        Add a scraped event to the list, in merge mode replacing the
+        stored copy of it if there is one.
+        """
+        index = self.positions.get(event_info['url'])
+        if index is None:
+            self.events.append(event_info)
+            if self.merge:
+                self.positions[event_info['url']] = len(self.events) - 1
+                self.changed.append(event_info)
+            return
+        stored = self.events[index]
+        if any(stored.get(field) != value for field, value in
+               event_info.items() if field != 'scraped_at'):
+            self.changed.append(event_info)
+        self.events[index] = event_info
+        # Replaced in place, so it keeps its spot on the page
+
+    def wait_for(self, count):
+        """
+        Block until the list holds at least count events
+        or the stream has finished.
+
+        Args:
+            count (int): How many events are needed in the list.
+
+        Returns:
+            int: How many events the list holds.
+        """
+        with self.condition:
+            while len(self.events) < count and not self.done:
+                self.condition.wait()
+            return len(self.events)
+
+    def fetched(self):
+        """
+        Returns:
+            int: How many events this stream has added to the list.
+        """
+        return self.count
+
+    def move_to(self, events):
+        """
+        Add the events scraped so far to another list, and append
+        the rest there as they arrive. Used when a prefetched page
+        is shown after the page before it.
+
+        Args:
+            events (list of dict): The list to move to.
+        """
+        with self.condition:
+            scraped, self.events = self.events, events
+            if self.merge:
+                self._index_events()
+                self.changed = []
+                for event_info in scraped:
+                    self._add(event_info)
+                # Compared again against the list they are moving to
+            else:
+                events.extend(scraped)
+
+    def stop(self):
+        """
+        Stop consuming, eg. when the user leaves the search.
+        """
+        self.stop_running.set()
+
+
+class ListingPrefetcher:
+    """
+    Scrapes the next listing pages of a search in the background while the
+    user is still reading the current one, so pressing "Y" at the end of
+    the page doesn't mean waiting for Eventbrite.
+    """
+    def __init__(self, start_page, depth=None):
+        """
+        Initializes the prefetcher, no pages are fetched until prefetch.
+
+        Args:
+            start_page (function): Takes a page number and the list to add
+                                the events to, returns an EventStream or
+                                None if the search can't be paged.
+            depth (int, optional): How many pages to fetch ahead.
+                                Defaults to PREFETCH_DEPTH.
+        """
+        self.start_page = start_page
+        self.depth = PREFETCH_DEPTH if depth is None else depth
+        self.streams = {}
+        # page number -> EventStream filling its own list
+
+    def prefetch(self, last_page):
+        """
+        Make sure the pages after last_page, up to the prefetch depth,
+        are being scraped.
+
+        Args:
+            last_page (int): The last page number already shown or loading.
+        """
+        for page_number in range(last_page + 1, last_page + 1 + self.depth):
+            if page_number not in self.streams:
+                stream = self.start_page(page_number, None)
+                if stream is None:
+                    return
+                self.streams[page_number] = stream
+
+    def take(self, page_number, events):
+        """
+        Hand over the stream for a page, moving its events to the list
+        being shown, or start the page now if it wasn't prefetched.
+
+        Args:
+            page_number (int): The page about to be shown.
+            events (list of dict): The list being shown to the user.
+
+        Returns:
+            EventStream: The page's stream, or None if the search
+                        can't be paged.
+        """
+        stream = self.streams.pop(page_number, None)
+        if stream is None:
+            return self.start_page(page_number, events)
+        stream.move_to(events)
+        return stream
+
+    def cancel(self):
+        """
+        Stop every prefetched page, eg. when the user leaves the search.
+        """
+        for stream in self.streams.values():
+            stream.stop()
+        self.streams.clear()
+
+
+class CrawlFrontier:
+    """
+    The saved progress of one search, so a scrape that dies part way
+    (a timeout, a killed session, a dropped connection) carries on where
+    it stopped instead of starting again from page 1. Each listing page
+    of the search gets a small JSON file under CRAWL_STATE_DIR holding the
+    events found on it, the events whose details are done and, once the
+    page is finished, whether there are more pages after it. One file per
+    page means crawl processes working on different pages of the same
+    search never write over each other.
+    """
+    def __init__(self, directory, listing_url, max_age_hours=None):
+        """
+        Initializes the frontier for the search a listing URL belongs to.
+
+        Args:
+            directory (str): Where the crawl state is stored.
+            listing_url (str): Any page of the search, the page parameter
+                            is ignored.
+            max_age_hours (float, optional): Saved pages older than this
+                                        are scraped again. Defaults to
+                                        CRAWL_STATE_HOURS.
+        """
+        self.search_url, _ = self.split_page(listing_url)
+        name = hashlib.sha256(self.search_url.encode('utf-8')).hexdigest()
+        self.directory = os.path.join(directory, name[:32])
+        self.max_age = 3600 * (CRAWL_STATE_HOURS if max_age_hours is None
+                               else max_age_hours)
+
+    @staticmethod
+    def split_page(listing_url):
+        """
+        Separate a listing URL's page number from the rest of the search.
+
+        Args:
+            listing_url (str): The listing page URL.
+
+        Returns:
+            tuple: The URL without its page parameter, and the page
+                number (1 when the URL has none).
+        """
+        parts = urlsplit(listing_url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        page_number = next((int(value) for key, value in query
+                            if key == 'page' and value.isdigit()), 1)
+        search_url = parts._replace(query=urlencode(
+            [(key, value) for key, value in query if key != 'page'])).geturl()
+        return search_url, page_number
+
+    def _path(self, page_number):
+        return os.path.join(self.directory, f'page-{page_number}.json')
+
+    def load(self, page_number):
+        """
+        Read a page's saved progress.
+
+        Args:
+            page_number (int): The listing page.
+
+        Returns:
+            dict: The page's 'events' (in listing order), 'completed'
+                (event URL -> finished event) and 'more' (None until the
+                page is finished), or None if the page has no saved
+                progress or it is too old to trust.
+        """
+        try:
+            with open(self._path(page_number), encoding='utf-8') as file:
+                state = json.load(file, object_hook=read_crawl_state_value)
+        except (OSError, ValueError):
+            return None
+            # Missing or half written, either way scrape the page again
+        if time.time() - state.get('started_at', 0) > self.max_age:
+            return None
+        return state
+
+    def save(self, page_number, state):
+        """
+        Write a page's progress, swapping the file in whole so a crash
+        mid-write leaves the previous checkpoint intact.
+
+        Args:
+            page_number (int): The listing page.
+            state (dict): The page's progress, as returned by load.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(page_number)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file, default=write_crawl_state_value)
+        os.replace(temp_path, path)
+
+    def start_page(self, page_number, events):
+        """
+        Record the events found on a freshly fetched listing page, none of
+        them finished yet.
+
+        Args:
+            page_number (int): The listing page.
+            events (list of dict): The events found on it.
+
+        Returns:
+            dict: The page's new progress.
+        """
+        state = {'search_url': self.search_url, 'started_at': time.time(),
+                 'events': events, 'completed': {}, 'more': None}
+        self.save(page_number, state)
+        return state
+
+    def finish_page(self, page_number, state, more):
+        """
+        Record that a page is finished. Finished pages are scraped again
+        rather than resumed, so only the last page of the search keeps a
+        small marker for last_page, the other pages' progress is removed.
+
+        Args:
+            page_number (int): The listing page.
+            state (dict): The page's progress, as returned by load.
+            more (bool): If there may be more pages after this one.
+        """
+        if more:
+            try:
+                os.remove(self._path(page_number))
+            except OSError:
+                pass
+            return
+        self.save(page_number, {
+            'search_url': state['search_url'],
+            'started_at': state['started_at'],
+            'events': [], 'completed': {}, 'more': False})
+
+    def last_page(self):
+        """
+        Find the last page of the search, if a saved page has said there
+        are no more after it.
+
+        Returns:
+            int: The page number, or None if it isn't known yet.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return None
+        finished = []
+        for name in names:
+            match = re.fullmatch(r'page-(\d+)\.json', name)
+            if match:
+                state = self.load(int(match.group(1)))
+                if state is not None and state['more'] is False:
+                    finished.append(int(match.group(1)))
+        return min(finished, default=None)
+
+
+def write_crawl_state_value(value):
+    """
+    json.dump fallback for the crawl state, datetimes are written as
+    {'$date': ISO string} so they come back as datetimes.
+    """
+    if isinstance(value, datetime):
+        return {'$date': value.isoformat()}
+    raise TypeError(f'{type(value).__name__} can not be saved as JSON')
+
+
+def read_crawl_state_value(value):
+    """
+    json.load object hook undoing write_crawl_state_value.
+    """
+    if len(value) == 1 and '$date' in value:
+        return datetime.fromisoformat(value['$date'])
+    return value
+
+
+def prune_crawl_state(directory=None, max_age_hours=None):
+    """
+    Remove the saved crawl progress older than CRAWL_STATE_HOURS, which
+    CrawlFrontier.load would ignore anyway, so the directory doesn't keep
+    growing with every search.
+
+    Args:
+        directory (str, optional): The crawl state directory.
+                                Defaults to CRAWL_STATE_DIR.
+        max_age_hours (float, optional): Defaults to CRAWL_STATE_HOURS.
+
+    Returns:
+        int: How many files were removed.
+    """
+    directory = CRAWL_STATE_DIR if directory is None else directory
+    if not directory:
+        return 0
+    cutoff = time.time() - 3600 * (CRAWL_STATE_HOURS if max_age_hours is None
+                                   else max_age_hours)
+    removed = 0
+    try:
+        searches = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for search in searches:
+        if not search.is_dir():
+            continue
+        for entry in os.scandir(search.path):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+                # Removed by another process in the meantime
+        try:
+            os.rmdir(search.path)
+        except OSError:
+            pass
+            # Still has pages in it
+    return removed
+
+
+def get_crawl_frontier(listing_url):
+    """
+    Find the frontier for a listing page's search.
+
+    Args:
+        listing_url (str): The listing page about to be scraped.
+
+    Returns:
+        CrawlFrontier: The frontier, or None when CRAWL_STATE_DIR is empty.
+    """
+    if not CRAWL_STATE_DIR:
+        return None
+    return CrawlFrontier(CRAWL_STATE_DIR, listing_url)
+
+
+def _tag_text(tag):
+    return tag.get_text(strip=True)
+
+
+def _address_text(tag):
+    event_location = tag.get_text(separator=' ', strip=True)
+    # Code with help from Co-Pilot
+    return re.sub(r'Show map$', '', event_location)
+    # End of Co-Pilot code, this code removes the 'Show map' text
+    # from the location even if its preceeded by another word,
+    # the issue was "United KingdomShow map"
+
+
+def _spaced_text(tag):
+    return tag.get_text(separator=' ', strip=True)
+
+
+def _paragraph_text(tag):
+    return ' '.join(p_element.get_text(separator=' ', strip=True)
+                    for p_element in tag.find_all('p'))
+
+
+def _link_href(tag):
+    return tag.get('href')
+
+
+# The table of rules the detail page extractor works from, each rule is
+# (field, tag name, classes the tag must have, how to read it, which match
+# to keep). When more than one rule fills the same field the rule listed
+# first wins, so the later ones are fallbacks for older page layouts.
+DETAIL_FIELD_RULES = [
+    ('event_price', 'div', 'conversion-bar__panel-info', _tag_text, 'first'),
+    ('event_price', 'span', 'eds-text-bm eds-text-weight--heavy',
+     _tag_text, 'first'),
+    ('location', 'div', 'location-info__address', _address_text, 'first'),
+    ('location', 'div', 'location-info__address-text',
+     _spaced_text, 'first'),
+    ('summary', 'div', 'eds-text--left', _paragraph_text, 'first'),
+    ('summary', 'p', 'summary', _tag_text, 'first'),
+    ('show_date_time', 'span', 'date-info__full-datetime',
+     _tag_text, 'first'),
+    ('event_organiser_name', 'a',
+     'descriptive-organizer-info-mobile__name-link', _tag_text, 'last'),
+    ('event_organiser_link', 'a',
+     'descriptive-organizer-info-mobile__name-link', _link_href, 'last'),
+    ('tags', 'a', 'tags-link listing-tag eds-l-mar-top-4 eds-text-bs'
+     ' eds-text--center', _tag_text, 'all'),
+]
+
+# What each field is set to when none of its rules match
+DETAIL_FIELD_DEFAULTS = {
+    'event_price': 'Free',
+    'location': 'No location available',
+    'summary': 'No summary available',
+    'show_date_time': 'No date and time available',
+    'event_organiser_name': 'No organiser available',
+    'event_organiser_link': None,
+}
+
+DETAIL_RULES_BY_TAG = {}
+for rule_priority, (rule_field, rule_tag, rule_classes, rule_reader,
+                    rule_keep) in enumerate(DETAIL_FIELD_RULES):
+    DETAIL_RULES_BY_TAG.setdefault(rule_tag, []).append(
+        (rule_priority, rule_field, frozenset(rule_classes.split()),
+         rule_reader, rule_keep))
+# Group the rules by tag name so each element only gets checked against
+# the rules that could match it
+
+STRAINER_CLASSES = frozenset(
+    rule_classes.split()[0] for _, _, rule_classes, _, _ in DETAIL_FIELD_RULES)
+DETAIL_PAGE_STRAINER = SoupStrainer(
+    class_=lambda value: bool(value) and not STRAINER_CLASSES.isdisjoint(
+        value.split()))
+# The SoupStrainer makes BeautifulSoup build only the parts of the page
+# that have one of the classes above (and everything inside them), rather
+# than the whole page with its scripts, menus and footers
+LISTING_PAGE_STRAINER = SoupStrainer('a', class_='event-card-link')
+LISTING_DATA_STRAINER = SoupStrainer(['a', 'script'])
+# Listing-only mode also needs the page's <script> blobs, the event cards
+# are still picked out of the same parse
+
+
+def extract_matched_details(page_content):
+    """
+    Pull the fields a DETAIL_FIELD_RULES rule found out of an event detail
+    page in one walk over the parts of the page the rules match.
+
+    Args:
+        page_content (bytes or str): The HTML of the event detail page.
+
+    Returns:
+        dict: Each field a rule matched mapped to the value read, plus a
+            'tags' list of the tags shown on the page. Fields no rule
+            matched are left out.
+    """
+    soup = BeautifulSoup(page_content, HTML_PARSER,
+                         parse_only=DETAIL_PAGE_STRAINER)
+    matched = {}
+    # field -> (priority of the rule that matched, value read)
+    tags = []
+
+    for element in soup.find_all(True):
+        element_classes = element.get('class')
+        if not element_classes:
+            continue
+        for priority, field, classes, reader, keep in DETAIL_RULES_BY_TAG.get(
+                element.name, ()):
+            if not classes.issubset(element_classes):
+                continue
+            if keep == 'all':
+                tags.append(reader(element))
+            elif (field not in matched or priority < matched[field][0]
+                  or (keep == 'last' and priority == matched[field][0])):
+                matched[field] = (priority, reader(element))
+                # A better rule always replaces a fallback, and a 'last'
+                # rule keeps the final match on the page
+
+    details = {field: value for field, (_, value) in matched.items()}
+    details['tags'] = tags
+    return details
+
+
+def extract_event_details(page_content):
+    """
+    Pull every field the app uses out of an event detail page, with the
+    DETAIL_FIELD_DEFAULTS for any the page doesn't have.
+
+    Args:
+        page_content (bytes or str): The HTML of the event detail page.
+
+    Returns:
+        dict: The event_price, location, summary, show_date_time,
+            event_organiser_name and event_organiser_link of the event,
+            plus a 'tags' list of the tags shown on the page.
+    """
+    details = dict(DETAIL_FIELD_DEFAULTS)
+    details.update(extract_matched_details(page_content))
+    return details
+
+
+# Fields an event needs before it can skip its detail page fetch
+EVENT_DETAIL_FIELDS = (
+    'location', 'show_date_time', 'event_date_time', 'summary',
+    'event_price', 'event_organiser_name', 'event_organiser_link',
+)
+
+SERVER_DATA_PATTERN = re.compile(r'window\.__SERVER_DATA__\s*=\s*')
+EVENT_ID_PATTERN = re.compile(r'-(\d+)/?(?:\?|#|$)')
+
+
+def event_url_key(event_url):
+    """
+    Make a key that matches the same event across the differently formatted
+    URLs Eventbrite uses, eg. with and without '?aff=' tracking parameters
+    or with a .com rather than .co.uk domain.
+
+    Args:
+        event_url (str): An event page URL.
+
+    Returns:
+        str: The Eventbrite event ID, or the URL without its query string.
+    """
+    match = EVENT_ID_PATTERN.search(event_url or '')
+    if match:
+        return match.group(1)
+    return (event_url or '').split('?')[0].rstrip('/')
+
+
+def event_url_prefixes(event_urls):
+    """
+    The prefixes a stored URL of each event would start with, its URL
+    without the query string on its own host and on both Eventbrite
+    hosts the scrapers use, for looking events up by event_url_key.
+
+    Args:
+        event_urls (list of str): Event page URLs.
+
+    Returns:
+        list of str: The prefixes, sorted and without duplicates.
+    """
+    hosts = {urlsplit(EVENTBRITE_URL).netloc,
+             urlsplit(EVENTBRITE_UK_URL).netloc}
+    prefixes = set()
+    for event_url in event_urls:
+        parts = urlsplit(event_url.split('?')[0].rstrip('/'))
+        for host in hosts | {parts.netloc}:
+            prefixes.add(parts._replace(netloc=host).geturl())
+    return sorted(prefixes)
+
+
+def format_listing_date(start_date, start_time=''):
+    """
+    Turn the ISO date (and time) found in a listing page's data into the
+    two date fields the scrapers store.
+
+    Args:
+        start_date (str): An ISO date or datetime, eg. '2024-10-19' or
+                        '2024-10-19T16:30:00+01:00'.
+        start_time (str, optional): A separate 'HH:MM' time. Defaults to ''.
+
+    Returns:
+        tuple: (show_date_time, event_date_time) or None if the date
+            can't be read.
+    """
+    try:
+        dt = parser.isoparse(f'{start_date}T{start_time}' if start_time
+                             else start_date)
+    except (ValueError, TypeError):
+        return None
+    has_time = bool(start_time) or 'T' in start_date
+    show_date_time = (dt.strftime('%A, %B %d · %I:%M%p') if has_time
+                      else dt.strftime('%A, %B %d'))
+    # Similar to the date shown on the detail page,
+    # eg. 'Saturday, October 19 · 04:30PM'
+    return show_date_time, dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def format_listing_price(price, currency):
+    """
+    Format a numeric offer price the way Eventbrite shows prices.
+
+    Args:
+        price (str or float): The price of the cheapest ticket.
+        currency (str): The ISO currency code, eg. 'GBP'.
+
+    Returns:
+        str: eg. 'Free', '£12.50' or '12.50 EUR', or None if the price
+            isn't a number.
+    """
+    try:
+        price = float(price)
+    except (TypeError, ValueError):
+        return None
+    if price == 0:
+        return 'Free'
+    if currency in (None, '', 'GBP'):
+        return f'£{price:.2f}'
+    return f'{price:.2f} {currency}'
+
+
+def read_json_ld_events(script_text):
+    """
+    Read the events out of a listing page's JSON-LD (schema.org) block.
+
+    Args:
+        script_text (str): The contents of a
+                        <script type="application/ld+json"> tag.
+
+    Yields:
+        dict: The fields found for each event, including its 'url'.
+    """
+    try:
+        data = json.loads(script_text)
+    except ValueError:
+        return
+    items = data if isinstance(data, list) else [data]
+    while items:
+        item = items.pop(0)
+        if not isinstance(item, dict):
+            continue
+        if 'itemListElement' in item:
+            items.extend(item['itemListElement'])
+            # An ItemList of ListItems, each wrapping an Event
+            continue
+        if 'item' in item and isinstance(item['item'], dict):
+            items.append(item['item'])
+            continue
+        if not str(item.get('@type', '')).endswith('Event'):
+            continue
 
-    # For cases where users enter date ranges, only take the first date
-    date_time_parts = date_time.split(' ')
-    # Only take the first 5 parts of the date_time
-    if len(date_time_parts) > 3:
-        date_time = ' '.join(date_time_parts[:3])
-    # If the length of the date_time is less than 3, return the date_time as is
-    # If the length of the date_time is greater than 3,
-    # only take the first 5 parts of the date_time
-    # parts example: ['2024-10-19', '16:30:00']
+        fields = {'url': item.get('url'), 'name': item.get('name')}
+        dates = format_listing_date(item.get('startDate', ''))
+        if dates:
+            fields['show_date_time'], fields['event_date_time'] = dates
+        if item.get('description'):
+            fields['summary'] = item['description']
+
+        place = item.get('location')
+        if isinstance(place, dict):
+            address = place.get('address')
+            if isinstance(address, dict):
+                address = ', '.join(str(address[part]) for part in (
+                    'streetAddress', 'addressLocality', 'postalCode',
+                    'addressCountry') if address.get(part))
+            location = ' '.join(part for part in (
+                place.get('name'), address) if isinstance(part, str) and part)
+            if location:
+                fields['location'] = location
+
+        offers = item.get('offers')
+        offers = offers[0] if isinstance(offers, list) and offers else offers
+        if isinstance(offers, dict):
+            price = format_listing_price(
+                offers.get('lowPrice', offers.get('price')),
+                offers.get('priceCurrency'))
+            if price:
+                fields['event_price'] = price
+
+        organiser = item.get('organizer')
+        if isinstance(organiser, dict) and organiser.get('name'):
+            fields['event_organiser_name'] = organiser['name']
+            fields['event_organiser_link'] = organiser.get('url')
+        yield fields
+
+
+def read_server_data_events(script_text):
+    """
+    Read the events out of the window.__SERVER_DATA__ state that Eventbrite
+    renders into its listing pages.
+
+    Args:
+        script_text (str): The contents of the <script> tag.
 
+    Yields:
+        dict: The fields found for each event, including its 'url'.
+    """
+    match = SERVER_DATA_PATTERN.search(script_text)
+    if not match:
+        return
     try:
-        # Use dateutil.parser to parse the date
-        dt = parser.parse(date_time, fuzzy=True)
-        # example: 2024-10-19 16:30:00
+        data, _ = json.JSONDecoder().raw_decode(script_text, match.end())
+        # raw_decode stops at the end of the object so the trailing ';'
+        # and any other script after it doesn't matter
     except ValueError:
-        # parser.parse will try to parse the date and time from the string
-        # fuzzy=True allows for more flexibility in the date format
-        parts = date_time.split()
-        # example ['2024-10-19', '16:30:00']
-        if len(parts) >= 2:
-            try:
-                year, month, day = map(int, parts[0].split('-'))
-                last_valid_day = calendar.monthrange(year, month)[1]
+        return
+    results = (data.get('search_data', {}).get('events', {})
+               .get('results', []))
 
-                if day > last_valid_day:
-                    day = last_valid_day
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        fields = {'url': result.get('url'), 'name': result.get('name')}
+        dates = format_listing_date(result.get('start_date', ''),
+                                    result.get('start_time', ''))
+        if dates:
+            fields['show_date_time'], fields['event_date_time'] = dates
+        if result.get('summary'):
+            fields['summary'] = result['summary']
+
+        venue = result.get('primary_venue') or {}
+        address = (venue.get('address') or {}).get(
+            'localized_address_display')
+        location = ' '.join(part for part in (venue.get('name'), address)
+                            if part)
+        if location:
+            fields['location'] = location
+
+        ticket_price = ((result.get('ticket_availability') or {}).get(
+            'minimum_ticket_price') or {})
+        if result.get('is_free'):
+            fields['event_price'] = 'Free'
+        elif ticket_price.get('display'):
+            fields['event_price'] = ticket_price['display']
+
+        organiser = result.get('primary_organizer') or {}
+        if organiser.get('name'):
+            fields['event_organiser_name'] = organiser['name']
+            fields['event_organiser_link'] = organiser.get('url')
+
+        tags = [tag.get('display_name') for tag in result.get('tags') or []
+                if isinstance(tag, dict) and tag.get('display_name')]
+        if tags:
+            fields['tags'] = tags
+        yield fields
+
+
+def extract_listing_events(soup):
+    """
+    Collect the event data embedded in a listing page, from both its
+    JSON-LD block and its server state.
 
-                corrected_date = f'{year}-{month}-{day} {parts[1]}'
-                dt = parser.parse(corrected_date, fuzzy=True)
-            except ValueError:
-                return 'N/A'
+    Args:
+        soup (BeautifulSoup): The parsed listing page, including its
+                            <script> tags.
 
-    # Format the datetime object into the desired format
-    formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
+    Returns:
+        dict: Event fields keyed by event_url_key, where both sources
+            describe the same event their fields are merged.
+    """
+    listing_events = {}
+    for script in soup.find_all('script'):
+        script_text = script.string or script.get_text()
+        if not script_text:
+            continue
+        if script.get('type') == 'application/ld+json':
+            found = read_json_ld_events(script_text)
+        elif '__SERVER_DATA__' in script_text:
+            found = read_server_data_events(script_text)
+        else:
+            continue
+        for fields in found:
+            if not fields.get('url'):
+                continue
+            merged = listing_events.setdefault(
+                event_url_key(fields['url']), {})
+            for field, value in fields.items():
+                if value not in (None, ''):
+                    merged.setdefault(field, value)
+                    # The first source to give a value keeps it
+    return listing_events
 
-    return formatted_date
 
+def scrape_event_detail(event_info, revalidate=False):
+    """
+    Fetch an event's detail page and add its details to event_info.
+    Fields event_info already has (eg. from the listing page's data)
+    are kept, and events that already have every field aren't fetched.
 
-def display_events(events, start_index, end_index, user_selection, search_key):
+    Args:
+        event_info (dict): The event found on a listing page,
+                        with its 'name' and 'url'.
+        revalidate (bool, optional): Check a cached copy of the page with
+                                Eventbrite, see http_get.
+                                Defaults to False.
+
+    Returns:
+        tuple: The updated event_info and a list of the event's tags,
+            event_info is None if its page couldn't be fetched.
     """
-    Display events to the user in a readable, friendley format.
+    listing_tags = event_info.pop('tags', None)
+    event_info.setdefault('scraped_at', datetime.now())
+    # Events reused from the collection keep the time they were scraped
+    if all(field in event_info for field in EVENT_DETAIL_FIELDS):
+        return event_info, listing_tags or []
+
+    try:
+        page_detail = http_get(event_info['url'], revalidate)
+        page_detail.raise_for_status()
+    except requests.RequestException as e:
+        print(f'\nSkipping {event_info["url"]}: {e}')
+        return None, []
+        # Don't parse an error page as if it were the event
+    details = extract_event_details(page_detail.content)
+    event_tags = details.pop('tags')
+    for field, value in details.items():
+        event_info.setdefault(field, value)
+    if 'event_date_time' not in event_info:
+        event_info['event_date_time'] = parsed_scraped_date(
+            event_info['show_date_time'])
+    return event_info, listing_tags or event_tags
+
+
+def iter_eventbrite_listing(url, max_workers=None, listing_only=None,
+                            incremental=True, revalidate=False):
+    """
+    Scrape an Eventbrite listing page and the detail page of every
+    event on it, yielding each event as soon as it is parsed. This is
+    shared by all of the Eventbrite scrapers. Progress is checkpointed
+    to the search's CrawlFrontier, so scraping a page that was cut short
+    only fetches what wasn't finished.
 
     Args:
-        events (list of dict): Scraped event data.
-        start_index (int): The start index of the events to display.
-        end_index (int): The end index of the events to display.
-        user_selection (str): A backend string to determine what to do
-        search_key (str): The phrase the user used to search for events.
+        url (str): The listing page URL.
+        max_workers (int, optional): How many event detail pages to fetch
+                                    at once. Defaults to SCRAPE_WORKERS.
+        listing_only (bool, optional): Take event details from the data
+                                    embedded in the listing page, and only
+                                    fetch detail pages for events missing
+                                    a field. Defaults to LISTING_ONLY.
+        incremental (bool, optional): Reuse events already in the collection
+                                    that are fresher than
+                                    EVENT_FRESHNESS_HOURS instead of
+                                    fetching their detail pages.
+                                    Defaults to True.
+        revalidate (bool, optional): Scrape the page again for a background
+                                    refresh, checking every page with
+                                    Eventbrite rather than using saved
+                                    progress, fresh stored events or
+                                    fresh cached pages. Defaults to False.
+
+    Yields:
+        tuple: (event_info, event_tags) for each event, in listing order.
 
     Returns:
-        List of dict: The events displayed to the user.
+        bool: more_events_check, if there may be more events
+            on the next page.
     """
-    collected_events = events[start_index:end_index]
-    for data in collected_events:
-        if isinstance(data, dict):
-            show_date_time = data.get('show_date_time',
-                                      'No date and time available')
-            summary = data.get('summary', '')
-            truncated_summary = (
-                summary[:120] + '...' if len(summary) > 120 else summary)
-            if show_date_time != 'No date and time available':
-                print(f'-------------------------------------\n{data["name"]},'
-                      f'\n{data["location"]}\n{data["show_date_time"]}'
-                      f'\nPrice: {data["event_price"]}'
-                      f'\nSummary: {truncated_summary}'
-                      f'\nEvent URL: {data["url"]}'
-                      f'\nOrganiser: {data["event_organiser_name"]}'
-                      f'\nOrganiser\'s Link: {data["event_organiser_link"]}'
-                      f'\n-------------------------------------')
-            else:
-                continue  # Skip invalid event data
-        else:
-            continue  # Skip invalid event data
+    if listing_only is None:
+        listing_only = LISTING_ONLY
+
+    frontier = get_crawl_frontier(url)
+    page_number = CrawlFrontier.split_page(url)[1]
+    state = frontier.load(page_number) if frontier else None
+    if state is not None and (revalidate or state['more'] is not None):
+        state = None
+        # A finished page is scraped again like any other, so the HTTP
+        # cache and EVENT_FRESHNESS_HOURS decide what is fetched, not
+        # the checkpoint. Only a page that was cut short is resumed.
+
+    if state is None:
+        try:
+            page = http_get(url, revalidate)
+            page.raise_for_status()
+        except requests.RequestException as e:
+            print(f'\n-------------------------------------'
+                  f'\nCould not fetch events from Eventbrite: {e}'
+                  f'\n-------------------------------------')
+            return False
+            # Stop rather than read the error page as a page with no events
+        soup = BeautifulSoup(page.content, HTML_PARSER, parse_only=(
+            LISTING_DATA_STRAINER if listing_only else LISTING_PAGE_STRAINER))
+        events = soup.find_all('a', class_='event-card-link')
+        listing_events = extract_listing_events(soup) if listing_only else {}
 
-    if user_selection == 'data-manipulation':
-        return print('-------------------------------------'
-                     '\nEvents displayed in relevance bottom to top.')
+        seen_urls = set()
+        pending_events = []
 
-    if user_selection in ('eventbrite', 'eventbrite_top',
-                          'eventbrite_top_no_category'):
-        save_to_mongodb(search_key, collected_events)
+        for event in events:
+            event_url = event['href']
+            if event_url in seen_urls:
+                continue
+            seen_urls.add(event_url)
+
+            event_info = {
+                key: value for key, value in listing_events.get(
+                    event_url_key(event_url), {}).items() if key != 'url'}
+            # Start from whatever the listing page's data says about it
+            event_info.update({
+                'name': (event.get('aria-label', '').replace(
+                    'View', '').strip() or event_info.get('name', '')),
+                'url': event_url
+            })
+            pending_events.append(event_info)
+
+        if frontier is not None:
+            state = frontier.start_page(
+                page_number, [dict(event_info) for event_info
+                              in pending_events])
+            # Copies, the events are filled in as their details arrive
+    else:
+        completed = state['completed']
+        pending_events = [
+            dict(completed.get(event_info['url'], event_info))
+            for event_info in state['events']]
+        # Progress saved by an earlier scrape of this page that was cut
+        # short. Finished events already have every field, so
+        # scrape_event_detail hands them straight back.
+
+    more_events_check = len(pending_events) > 0
+    # Check if more events on next page
+    completed = state['completed'] if state is not None else {}
+
+    if incremental and not revalidate:
+        fresh_events = find_fresh_events(
+            [event_info['url'] for event_info in pending_events
+             if event_info['url'] not in completed])
+        pending_events = [
+            dict(fresh_events[event_info['url']])
+            if event_info['url'] in fresh_events else event_info
+            for event_info in pending_events]
+        # A stored event already has every field, so scrape_event_detail
+        # hands it straight back without fetching its page
+
+    for event_info, event_tags in iter_event_details(
+            pending_events,
+            lambda pending: scrape_event_detail(pending, revalidate),
+            max_workers):
+        # Results come back in listing order, the tags are counted by
+        # the caller rather than in the worker threads
+        if event_info is None:
+            continue
+        event_info['tags'] = event_tags
+        # Kept with the event so it is saved to the collection too
+        if state is not None and event_info['url'] not in completed:
+            completed[event_info['url']] = dict(event_info)
+            frontier.save(page_number, state)
+            # Checkpoint after every event, a resumed scrape only
+            # fetches the events that weren't finished
+        yield event_info, event_tags
 
-    if user_selection == 'data-manipulation-done':
-        save_choice = input('-------------------------------------'
-                            '\nWould you like to save the events to a CSV or'
-                            ' Excel file? (C/E)\nOr type anything else'
-                            ' to continue: ').strip().lower()
-        if save_choice == 'c':
-            try:
-                save_to_csv(collected_events)
-                return
-            except ValueError as e:
-                print(f'Error saving events to CSV: {e}')
-        elif save_choice == 'e':
-            try:
-                save_to_excel(collected_events)
-                return
-            except ValueError as e:
-                print(f'Error saving events to Excel: {e}')
-        else:
-            return
+    if state is not None and state['more'] is None:
+        frontier.finish_page(page_number, state, more_events_check)
+        # The whole page is done, the bulk crawl reads the marker of the
+        # search's last page
 
-    # Cache the events in the hashtable
-    cache[search_key] = events
+    return more_events_check
+
+
+def scrape_eventbrite_listing(url, max_workers=None, listing_only=None,
+                              incremental=True):
+    """
+    Scrape an Eventbrite listing page and the detail page of every event on
+    it, see iter_eventbrite_listing for the arguments.
+
+    Returns:
+        tuple: A tuple containing:
+            - event_data (list): A list of dictionaries,
+                each representing an event.
+            - tags_counter (Counter): A Counter object counting
+                the occurrences of tags.
+            - more_events_check (bool): A boolean indicating if there
+                are more events to fetch.
+    """
+    return collect_events(iter_eventbrite_listing(
+        url, max_workers, listing_only, incremental))
 
 
 def scrape_eventbrite_events(location, day, product, page_number,
-                             start_date, end_date):
+                             start_date, end_date, max_workers=None):
     """
     Scrape events from Eventbrite using a quick search.
 
@@ -555,6 +4175,9 @@ def scrape_eventbrite_events(location, day, product, page_number,
 
         end_date (str): The users given date to end the search. (optional)
 
+        max_workers (int, optional): How many event detail pages to fetch
+                        at once. Defaults to SCRAPE_WORKERS.
+
     Returns:
         tuple: A tuple containing:
             - event_data (list): A list of dictionaries,
@@ -564,111 +4187,32 @@ def scrape_eventbrite_events(location, day, product, page_number,
             - more_events_check (bool): A boolean indicating if there
                 are more events to fetch.
     """
+    return collect_events(iter_eventbrite_events(
+        location, day, product, page_number, start_date, end_date,
+        max_workers))
+
+
+def iter_eventbrite_events(location, day, product, page_number,
+                           start_date, end_date, max_workers=None,
+                           revalidate=False):
+    """
+    Generator version of scrape_eventbrite_events, yielding
+    (event_info, event_tags) for each event as soon as it is scraped.
+    Takes the same arguments, plus iter_eventbrite_listing's revalidate,
+    and returns more_events_check.
+    """
     url = (
-        f'https://www.eventbrite.com/d/united-kingdom--{location}/events--'
+        f'{EVENTBRITE_URL}/d/united-kingdom--{location}/events--'
         f'{day}/{product}/?page={page_number}&start_date={start_date}&end_date'
         f'={end_date}'
     )
-    page = requests.get(url, timeout=20)
-    soup = BeautifulSoup(page.content, 'html.parser')
-    events = soup.find_all('a', class_='event-card-link')
-
-    event_data = []
-    tags_counter = Counter()
-    seen_urls = set()
-
-    for event in events:
-        event_url = event['href']
-        if event_url in seen_urls:
-            continue
-        seen_urls.add(event_url)
-
-        event_info = {
-            'name': event.get('aria-label', '').replace('View', '').strip(),
-            'url': event_url
-        }
-
-        page_detail = requests.get(event_url, timeout=20)
-        page_detail_soup = BeautifulSoup(page_detail.content, 'html.parser')
-
-        price_div = page_detail_soup.find('div',
-                                          class_="conversion-bar__panel-info")
-        event_price = price_div.get_text(strip=True) if price_div else 'Free'
-
-        location_div = page_detail_soup.find('div',
-                                             class_='location-info__address')
-        if location_div:
-            event_location = location_div.get_text(separator=' ', strip=True)
-            # Code with help from Co-Pilot
-            event_location = re.sub(r'Show map$', '', event_location)
-            # End of Co-Pilot code, this code removes the 'Show map' text
-            # from the location even if its preceeded by another word,
-            # the issue was "United KingdomShow map"
-        else:
-            location_div = page_detail_soup.find(
-                'div', class_='location-info__address-text')
-            if location_div:
-                event_location = location_div.get_text(
-                    separator=' ', strip=True)
-
-        summary_div = page_detail_soup.find('div', class_='eds-text--left')
-        event_summary = ''
-        if summary_div:
-            p_elements = summary_div.find_all('p')
-            summary_texts = [p_element.get_text(
-                separator=' ', strip=True) for p_element in p_elements]
-            event_summary = ' '.join(summary_texts)
-        elif not summary_div:
-            summary = page_detail_soup.find('p', class_='summary')
-            event_summary = summary.get_text(
-                strip=True) if summary else 'No summary available'
-
-        date_time = page_detail_soup.find(
-            'span', class_='date-info__full-datetime')
-        event_date_time = date_time.get_text(
-            strip=True) if date_time else 'No date and time available'
-
-        event_organiser_name = 'No organiser available'
-        event_organiser_link = None
-
-        event_organiser_divs = page_detail_soup.find_all(
-            'div', class_='descriptive-organizer-info-heading-signal-container'
-            )
-
-        for div in event_organiser_divs:
-            organiser_link = div.find(
-                'a', class_='descriptive-organizer-info-mobile__name-link')
-            if organiser_link:
-                event_organiser_name = organiser_link.get_text(strip=True)
-                event_organiser_link = organiser_link['href']
-
-        date_parsed = parsed_scraped_date(event_date_time)
-
-        tags = page_detail_soup.find_all(
-            'a', class_='tags-link listing-tag eds-l-mar-top-4'
-            ' eds-text-bs eds-text--center')
-        for tag in tags:
-            tags_counter[tag.get_text(strip=True)] += 1
-
-        event_info.update({
-            'location': event_location,
-            'show_date_time': event_date_time,  # User clear date
-            'event_date_time': date_parsed,
-            'summary': event_summary,
-            'event_price': event_price,
-            'event_organiser_name': event_organiser_name,
-            'event_organiser_link': event_organiser_link,
-        })
-
-        event_data.append(event_info)
-
-    more_events_check = len(events) > 0  # Check if more events on next page
-
-    return event_data, tags_counter, more_events_check
+    return (yield from iter_eventbrite_listing(
+        url, max_workers, revalidate=revalidate))
 
 
 def scrape_eventbrite_categories(location, category_slug, day,
-                                 page_number, start_date, end_date):
+                                 page_number, start_date, end_date,
+                                 max_workers=None):
     """
     Scrape events from Eventbrite using a set category search.
 
@@ -688,6 +4232,9 @@ def scrape_eventbrite_categories(location, category_slug, day,
 
         end_date (string): The users given date to end the search. (optional)
 
+        max_workers (interger, optional): How many event detail pages to
+        fetch at once. Defaults to SCRAPE_WORKERS.
+
     Returns:
         tuple: A tuple containing:
         - event_data (list): A list of dictionaries,
@@ -697,110 +4244,43 @@ def scrape_eventbrite_categories(location, category_slug, day,
         - more_events_check (bool): A boolean indicating if
             there are more events to fetch.
     """
-    url = (
-        f'https://www.eventbrite.com/d/united-kingdom--{location}/'
-        f'{category_slug}--events--{day}/?page={page_number}&start_date='
-        f'{start_date}&end_date={end_date}'
-    )
-    page = requests.get(url, timeout=20)
-    soup = BeautifulSoup(page.content, 'html.parser')
-    events = soup.find_all('a', class_='event-card-link')
-
-    event_data = []
-    tags_counter = Counter()
-    seen_urls = set()
-
-    for event in events:
-        event_url = event['href']
-        if event_url in seen_urls:
-            continue
-        seen_urls.add(event_url)
+    return collect_events(iter_eventbrite_categories(
+        location, category_slug, day, page_number, start_date, end_date,
+        max_workers))
 
-        event_info = {
-            'name': event.get('aria-label', '').replace('View', '').strip(),
-            'url': event_url
-        }
 
-        page_detail = requests.get(event_url, timeout=20)
-        page_detail_soup = BeautifulSoup(page_detail.content, 'html.parser')
-
-        price_div = page_detail_soup.find(
-            'span', class_="eds-text-bm eds-text-weight--heavy")
-        event_price = price_div.get_text(strip=True) if price_div else 'Free'
-
-        location_div = page_detail_soup.find(
-            'div', class_='location-info__address')
-        if location_div:
-            event_location = location_div.get_text(separator=' ', strip=True)
-            # Code with help from Co-Pilot
-            event_location = re.sub(r'Show map$', '', event_location)
-            # End of Co-Pilot code, this code removes the 'Show map'
-            # text from the location even if its preceeded by another word,
-            # the issue was "United KingdomShow map"
-        else:
-            location_div = page_detail_soup.find(
-                'div', class_='location-info__address-text')
-            if location_div:
-                event_location = location_div.get_text(
-                    separator=' ', strip=True)
-
-        summary_div = page_detail_soup.find('div', class_='eds-text--left')
-        event_summary = ''
-        if summary_div:
-            p_elements = summary_div.find_all('p')
-            summary_texts = [p_element.get_text(
-                separator=' ', strip=True) for p_element in p_elements]
-            event_summary = ' '.join(summary_texts)
-        elif not summary_div:
-            summary = page_detail_soup.find('p', class_='summary')
-            event_summary = summary.get_text(
-                strip=True) if summary else 'No summary available'
-
-        date_time = page_detail_soup.find(
-            'span', class_='date-info__full-datetime')
-        event_date_time = date_time.get_text(
-            strip=True) if date_time else 'No date and time available'
-
-        event_organiser_name = 'No organiser available'
-        event_organiser_link = None
-
-        event_organiser_divs = page_detail_soup.find_all(
-            'div', class_='descriptive-organizer-info-heading-signal-container'
-            )
-
-        for div in event_organiser_divs:
-            organiser_link = div.find(
-                'a', class_='descriptive-organizer-info-mobile__name-link')
-            if organiser_link:
-                event_organiser_name = organiser_link.get_text(strip=True)
-                event_organiser_link = organiser_link['href']
-
-        date_parsed = parsed_scraped_date(event_date_time)
-
-        tags = page_detail_soup.find_all(
-            'a', class_='tags-link listing-tag eds-l-mar-top-4 eds-text-bs'
-            ' eds-text--center')
-        for tag in tags:
-            tags_counter[tag.get_text(strip=True)] += 1
-
-        event_info.update({
-            'location': event_location,
-            'show_date_time': event_date_time,
-            'event_date_time': date_parsed,
-            'summary': event_summary,
-            'event_price': event_price,
-            'event_organiser_name': event_organiser_name,
-            'event_organiser_link': event_organiser_link,
-        })
+def iter_eventbrite_categories(location, category_slug, day,
+                               page_number, start_date, end_date,
+                               max_workers=None, revalidate=False):
+    """
+    Generator version of scrape_eventbrite_categories, yielding
+    (event_info, event_tags) for each event as soon as it is scraped.
+    Takes the same arguments, plus iter_eventbrite_listing's revalidate,
+    and returns more_events_check.
+    """
+    url = eventbrite_category_url(location, category_slug, day,
+                                  page_number, start_date, end_date)
+    return (yield from iter_eventbrite_listing(
+        url, max_workers, revalidate=revalidate))
 
-        event_data.append(event_info)
 
-    more_events_check = len(events) > 0
+def eventbrite_category_url(location, category_slug, day, page_number,
+                            start_date, end_date):
+    """
+    Build the listing page URL of a category search, takes the same
+    arguments as scrape_eventbrite_categories.
 
-    return event_data, tags_counter, more_events_check
+    Returns:
+        str: The listing page URL.
+    """
+    return (
+        f'{EVENTBRITE_URL}/d/united-kingdom--{location}/'
+        f'{category_slug}--events--{day}/?page={page_number}&start_date='
+        f'{start_date}&end_date={end_date}'
+    )
 
 
-def scrape_eventbrite_top_events(location):
+def scrape_eventbrite_top_events(location, max_workers=None):
     """
     Scrape events from Eventbrite using a given
     location to find top events there.
@@ -808,6 +4288,9 @@ def scrape_eventbrite_top_events(location):
     Args:
         location (string): The users given location. (optional)
 
+        max_workers (interger, optional): How many event detail pages to
+        fetch at once. Defaults to SCRAPE_WORKERS.
+
     Returns:
         tuple: A tuple containing:
         - event_data (list): A list of dictionaries,
@@ -817,103 +4300,55 @@ def scrape_eventbrite_top_events(location):
         - more_events_check (bool): A boolean indicating if
             there are more events to fetch.
     """
-    url = f'https://www.eventbrite.co.uk/d/united-kingdom--{location}/events/'
-    page = requests.get(url, timeout=20)
-    soup = BeautifulSoup(page.content, 'html.parser')
-    events = soup.find_all('a', class_='event-card-link')
-
-    event_data = []
-    tags_counter = Counter()
-    seen_urls = set()
+    return collect_events(iter_eventbrite_top_events(location, max_workers))
 
-    for event in events:
-        event_url = event['href']
-        if event_url in seen_urls:
-            continue
-        seen_urls.add(event_url)
 
-        event_info = {
-            'name': event.get('aria-label', '').replace('View', '').strip(),
-            'url': event_url
-        }
+def iter_eventbrite_top_events(location, max_workers=None,
+                               revalidate=False):
+    """
+    Generator version of scrape_eventbrite_top_events, yielding
+    (event_info, event_tags) for each event as soon as it is scraped.
+    Takes the same arguments, plus iter_eventbrite_listing's revalidate,
+    and returns more_events_check.
+    """
+    url = f'{EVENTBRITE_UK_URL}/d/united-kingdom--{location}/events/'
+    return (yield from iter_eventbrite_listing(
+        url, max_workers, revalidate=revalidate))
 
-        page_detail = requests.get(event_url, timeout=20)
-        page_detail_soup = BeautifulSoup(page_detail.content, 'html.parser')
-
-        price_div = page_detail_soup.find(
-            'div', class_="conversion-bar__panel-info")
-        event_price = price_div.get_text(strip=True) if price_div else 'Free'
-
-        location_div = page_detail_soup.find(
-            'div', class_='location-info__address')
-        if location_div:
-            event_location = location_div.get_text(separator=' ', strip=True)
-            # Code with help from Co-Pilot
-            event_location = re.sub(r'Show map$', '', event_location)
-            # End of Co-Pilot code, this code removes the 'Show map'
-            # text from the location even if its preceeded by another word,
-            # the issue was "United KingdomShow map"
-        else:
-            location_div = page_detail_soup.find(
-                'div', class_='location-info__address-text')
-            if location_div:
-                event_location = location_div.get_text(
-                    separator=' ', strip=True)
-
-        summary_div = page_detail_soup.find('div', class_='eds-text--left')
-        event_summary = ''
-        if summary_div:
-            p_elements = summary_div.find_all('p')
-            summary_texts = [p_element.get_text(
-                separator=' ', strip=True) for p_element in p_elements]
-            event_summary = ' '.join(summary_texts)
-        elif not summary_div:
-            summary = page_detail_soup.find('p', class_='summary')
-            event_summary = summary.get_text(
-                strip=True) if summary else 'No summary available'
-
-        date_time = page_detail_soup.find(
-            'span', class_='date-info__full-datetime')
-        event_date_time = date_time.get_text(
-            strip=True) if date_time else 'No date and time available'
-
-        event_organiser_name = 'No organiser available'
-        event_organiser_link = None
-
-        event_organiser_divs = page_detail_soup.find_all(
-            'div', class_='descriptive-organizer-info-heading-signal-container'
-            )
-
-        for div in event_organiser_divs:
-            organiser_link = div.find(
-                'a', class_='descriptive-organizer-info-mobile__name-link')
-            if organiser_link:
-                event_organiser_name = organiser_link.get_text(strip=True)
-                event_organiser_link = organiser_link['href']
-
-        date_parsed = parsed_scraped_date(event_date_time)
-
-        tags = page_detail_soup.find_all(
-            'a', class_='tags-link listing-tag eds-l-mar-top-4'
-            ' eds-text-bs eds-text--center')
-        for tag in tags:
-            tags_counter[tag.get_text(strip=True)] += 1
-
-        event_info.update({
-            'location': event_location,
-            'show_date_time': event_date_time,  # User clear date
-            'event_date_time': date_parsed,
-            'summary': event_summary,
-            'event_price': event_price,
-            'event_organiser_name': event_organiser_name,
-            'event_organiser_link': event_organiser_link,
-        })
 
-        event_data.append(event_info)
+def scrape_organiser_page(organiser_url):
+    """
+    Find the events listed on an organiser's Eventbrite page, from its
+    event links and the event data embedded in the page. Detail pages
+    aren't fetched here.
 
-    more_events_check = len(events) > 0  # Check if more events on next page
+    Args:
+        organiser_url (str): The organiser's page.
 
-    return event_data, tags_counter, more_events_check
+    Returns:
+        list of dict: An event_info with at least a 'url' for each event,
+                    empty if the page couldn't be fetched.
+    """
+    try:
+        page = http_get(organiser_url)
+        page.raise_for_status()
+    except requests.RequestException as e:
+        print(f'\nSkipping organiser {organiser_url}: {e}')
+        return []
+    soup = BeautifulSoup(page.content, HTML_PARSER,
+                         parse_only=LISTING_DATA_STRAINER)
+    found = extract_listing_events(soup)
+    for link in soup.find_all('a', href=True):
+        event_url = urljoin(organiser_url, link['href'])
+        if '/e/' not in urlsplit(event_url).path:
+            continue
+        event_info = found.setdefault(event_url_key(event_url),
+                                      {'url': event_url})
+        if not event_info.get('name'):
+            event_info['name'] = (
+                link.get('aria-label', '').replace('View', '').strip()
+                or link.get_text(strip=True))
+    return list(found.values())
 
 
 def collection_menu():
@@ -921,10 +4356,17 @@ def collection_menu():
     This menu provides the user with options to view
     the events in the collection
     """
+    event_writer.flush(report=True)
+    # Make sure the events just viewed are written before reading them
+    try:
+        ensure_indexes()
+    except STORAGE_ERRORS as e:
+        print(f'Could not reach the collection: {e}')
     while True:
         print('\n-------------------------------------'
               '\nOn this menu you may view your all your collected events,'
-              '\nview recentley searched events, or clear the database.'
+              '\nview recentley searched events, search them by keyword,'
+              '\nor clear the database.'
               '\nAfter here when you choose how to view the events,'
               '\nyou may export to CSV (C) and Excel (E) or perform'
               '\ndata tasks with these events (T).'
@@ -933,7 +4375,8 @@ def collection_menu():
               ' print to Excel or CSV:')
         print('1. View all searched events and perform data tasks')
         print('2. View recently searched events and perform data tasks')
-        print('3. Main Menu')
+        print('3. Search collected events by keyword')
+        print('4. Main Menu')
         print('#. Clear Database')
         choice = input('Enter your choice: ').strip()
 
@@ -942,11 +4385,14 @@ def collection_menu():
         elif choice == '2':
             search_events_in_collection()
         elif choice == '3':
+            search_events_by_keyword()
+        elif choice == '4':
             print("Going back to the main menu.")
             main()
             return
         elif choice == '#':
-            collection.delete_many({})
+            event_writer.flush()
+            get_event_store().clear()
             print('-------------------------------------\nDatabase cleared'
                   '\n-------------------------------------.')
             main()
@@ -956,38 +4402,6 @@ def collection_menu():
                   '\nInvalid choice. Please try again.'
                   '\n-------------------------------------')
 
-# extract_price was built with help from Co-Pilot when asked how could
-# I extract the price from the event_price field
-# Its suggestion was the re module. As I needed to remove other strings and
-# currency symbols from the event_price field
-
-
-def extract_price(price_str):
-    """
-    The extract_price function uses a regular expression to find the first
-    occurrence of a number in the event_price string.
-    If a number is found, it is converted to a float and returned. If no number
-    is found, 0.0 is returned. The sort_events function uses the extract_price
-    function to extract the numeric part of the event_price before sorting.
-
-    Args:
-        price_str (str): The price string to extract the price from.
-
-    Returns:
-        Float: The numeric part of the event price string, or 0.0 if no number
-                is found.
-    """
-
-    match = re.search(r'\d+(\.\d+)?', price_str)
-    # \d+(\.\d+)? means match one or more digits followed by an
-    # optional decimal point and one or more digits
-    if match:
-        return float(match.group())
-    return 0.0
-
-
-# End of Co-Pilot code
-
 
 def check_file_unique(image_path):
     """
@@ -1017,15 +4431,107 @@ def check_file_unique(image_path):
     return image_path
 
 
-def compare_events(events):
+def priced_events_filter(query):
+    """
+    Narrow a MongoDB filter to the events with a price to compare, free,
+    donation and sold out events are left out as in compare_events.
+
+    Args:
+        query (dict): Fields the events must equal.
+
+    Returns:
+        dict: The narrowed filter.
+    """
+    return {'$and': [query, {'price_min': {'$ne': None},
+                             'is_free': {'$ne': True},
+                             'is_sold_out': {'$ne': True}}]}
+
+
+def priced_event_prices(events):
+    """
+    The prices of the events with a price to compare, left out by the
+    same rule as priced_events_filter so both compare paths agree.
+
+    Args:
+        events (list): The events to read the prices from.
+
+    Returns:
+        list: The lowest price of each priced event.
+    """
+    prices = []
+    for event in events:
+        price = parse_event_price(event.get('event_price'))
+        if is_priced(price):
+            prices.append(price['price_min'])
+    return prices
+
+
+def is_priced(price, sold_out=False):
+    """
+    Whether a parsed price has an amount to compare or sort on, the
+    in-memory match for priced_events_filter and the stored price sorts.
+
+    Args:
+        price (dict): The fields from parse_event_price.
+        sold_out (bool): Keep sold out events, as the most expensive
+            sort does.
+
+    Returns:
+        bool: True if the event is priced.
+    """
+    return (price['price_min'] is not None and not price['is_free']
+            and (sold_out or not price['is_sold_out']))
+
+
+def stored_price_histogram(query, bins=20):
+    """
+    Count the prices of the stored events matching query in equal
+    width bins, the same bins plt.hist would use, with only the counts
+    read back from the event store.
+
+    Args:
+        query (dict): Fields the events must equal.
+        bins (int, optional): Number of bins. Defaults to 20.
+
+    Returns:
+        tuple: (counts, edges), the count in each bin and the bins'
+            bins + 1 edges, both empty if no event has a price.
+    """
+    low, high = get_event_store().price_range(query)
+    if low is None:
+        return [], []
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+        # plt.hist spreads a single price over one unit the same way
+    edges = [low + (high - low) * i / bins for i in range(bins)] + [high]
+    return get_event_store().price_bin_counts(query, edges), edges
+
+
+def compare_events(events, query=None):
     """
     A menu to compare collected events with different
     analytics and visualisations.
 
     Args:
         events (list of dict): The user's collected events.
+        query (dict, optional): Fields the stored events being compared
+                                must equal. When given the statistics are
+                                worked out by the event store and events
+                                isn't used. Defaults to None.
     """
-    if len(events) < 2:
+    if query is not None and get_event_store().count_untyped_events(query):
+        print('Some of these events were saved before prices and dates were'
+              ' stored for comparing,\nrun "python run.py migrate" to compare'
+              ' them in the database. Comparing them here instead.')
+        events = list(load_stored_events(query))
+        query = None
+        # The store works from the typed fields, without them its
+        # statistics would leave these events out
+    if query is not None:
+        event_count = get_event_store().count_events(query)
+    else:
+        event_count = len(events)
+    if event_count < 2:
         print('Not enough events to compare.')
         return
 
@@ -1050,13 +4556,13 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                price = [extract_price(event.get(
-                    'event_price', '0')) for event in events if event.get(
-                        'event_price', 'N/A').lower() not in [
-                            'sold out', 'free', 'donation']]
-                # Extract the price from the event_price field for each event,
-                # not including 'sold out', 'free', and 'donation' events
-                result = sum(price) / len(price) if price else 0
+                if query is not None:
+                    result = get_event_store().average_price(query)
+                else:
+                    price = priced_event_prices(events)
+                    # The prices of the priced events, free, donation and
+                    # sold out events are left out as on the store path
+                    result = sum(price) / len(price) if price else 0
                 # Calculate the average price of the events, sum the prices
                 # and divide by the number of prices
                 floored_result = math.floor(result)
@@ -1068,30 +4574,30 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                price = [extract_price(event.get(
-                    'event_price', '0')) for event in events if event.get(
-                        'event_price', 'N/A').lower() not in [
-                            'sold out', 'free', 'donation']]
-                # Extract the price from the event_price field for each event,
-                # not including 'sold out', 'free', and 'donation' events
-                if price:
-                    price.sort()
-                    # Sort the list of prices in ascending order
-                    n = len(price)
-                    # Get length of list
-                    mid = n // 2
-                    # Find the middle index
-                    if n % 2 == 0:
-                        result = (price[mid - 1] + price[mid]) / 2
-                        # If the list length is even, the median is
-                        # the average of the two middle elements
-                    else:
-                        result = price[mid]
-                        # If the list length is odd,
-                        # the median is the middle element
+                if query is not None:
+                    result = get_event_store().median_price(query)
                 else:
-                    result = 0
-                    # If empty list, return 0
+                    price = priced_event_prices(events)
+                    # The prices of the priced events, free, donation and
+                    # sold out events are left out as on the store path
+                    if price:
+                        price.sort()
+                        # Sort the list of prices in ascending order
+                        n = len(price)
+                        # Get length of list
+                        mid = n // 2
+                        # Find the middle index
+                        if n % 2 == 0:
+                            result = (price[mid - 1] + price[mid]) / 2
+                            # If the list length is even, the median is
+                            # the average of the two middle elements
+                        else:
+                            result = price[mid]
+                            # If the list length is odd,
+                            # the median is the middle element
+                    else:
+                        result = 0
+                        # If empty list, return 0
                 print(f'\nThe median price of events is: £{result}')
             finally:
                 spinner.stop()
@@ -1099,20 +4605,29 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                event_days = [datetime.strptime(
-                    event['event_date_time'], '%Y-%m-%d %H:%M:%S').strftime(
-                        '%Y-%d') for event in events if event.get(
-                            'event_date_time', 'N/A') != 'N/A']
+                if query is not None:
+                    days_counts = dict(get_event_store().date_counts(
+                        query, '%Y-%d'))
+                    # Grouped and counted by the store, only the counts of
+                    # each day are sent back
+                else:
+                    days_counts = Counter(datetime.strptime(
+                        event['event_date_time'],
+                        '%Y-%m-%d %H:%M:%S').strftime('%Y-%d')
+                        for event in events if event.get(
+                            'event_date_time', 'N/A') != 'N/A')
                 # List comprehension to extract the day and year from the
                 # event_date_time field for each event, the date is expected
                 # to be in the format 'YYYY-MM-DD HH:MM:SS' and
                 # is parsed to a datetime object. The second argument formats
                 # the datetime object to 'YYYY-DD' to be used to group
-                # the events by day
-                days_counts = Counter(event_days)
-                # Use the Counter class to count the occurrences of each day,
-                # works by setting a dictionary key with each collected day
-                # and incrementing the value each time the day is found
+                # the events by day, then use the Counter class to count
+                # the occurrences of each day, works by setting a dictionary
+                # key with each collected day and incrementing the value each
+                # time the day is found
+                if not days_counts:
+                    print('\nNo events with a date to count.')
+                    continue
                 days, counts = zip(*sorted(days_counts.items()))
                 # Take the dictionary days_counts and retrieve its items as a
                 # list of tuples with items(), then sort the tuples by the keys
@@ -1149,19 +4664,29 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                event_months = [datetime.strptime(
-                    event['event_date_time'], '%Y-%m-%d %H:%M:%S').strftime(
-                        '%Y-%m') for event in events if event.get(
-                            'event_date_time', 'N/A') != 'N/A']
+                if query is not None:
+                    months_counts = dict(get_event_store().date_counts(
+                        query, '%Y-%m'))
+                    # Grouped and counted by the store, only the counts of
+                    # each month are sent back
+                else:
+                    months_counts = Counter(datetime.strptime(
+                        event['event_date_time'],
+                        '%Y-%m-%d %H:%M:%S').strftime('%Y-%m')
+                        for event in events if event.get(
+                            'event_date_time', 'N/A') != 'N/A')
                 # List comprehension to extract the month and year from the
                 # event_date_time field for each event, the date is expected
                 # to be in the format 'YYYY-MM-DD HH:MM:SS' and is parsed to a
                 # datetime object. The second argument formats the datetime
-                # object to 'YYYY-MM' to be used to group the events by month
-                months_counts = Counter(event_months)
-                # Use the Counter class to count the occurrences of each month,
-                # works by setting a dictionary key with each collected month
-                # and incrementing the value each time the month is found
+                # object to 'YYYY-MM' to be used to group the events by
+                # month, then use the Counter class to count the occurrences
+                # of each month, works by setting a dictionary key with each
+                # collected month and incrementing the value each time the
+                # month is found
+                if not months_counts:
+                    print('\nNo events with a date to count.')
+                    continue
                 months, counts = zip(*sorted(months_counts.items()))
                 # Take the dictionary months_counts and retrieve its items as
                 # a list of tuples with items(), then sort the tuples by the
@@ -1198,15 +4723,23 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                price = [extract_price(event.get(
-                    'event_price', '0')) for event in events if event.get(
-                        'event_price', 'N/A').lower() not in [
-                            'sold out', 'free', 'donation']]
-                # List comprehension to extract the prices from the events,
-                # not including 'sold out', 'free', and 'donation' events,
-                # then calling the extract_price function to extract
-                # the numeric part of the price
-                plt.hist(price, bins=20, edgecolor='black')
+                if query is not None:
+                    counts, edges = stored_price_histogram(query, bins=20)
+                    if not counts:
+                        print('\nNo events with a price to plot.')
+                        continue
+                    plt.hist(edges[:-1], bins=edges, weights=counts,
+                             edgecolor='black')
+                    # The store counts the prices in each bin, each bin's
+                    # count is drawn as the weight of its left edge
+                else:
+                    price = priced_event_prices(events)
+                    # The prices of the priced events, free, donation and
+                    # sold out events are left out as on the store path
+                    if not price:
+                        print('\nNo events with a price to plot.')
+                        continue
+                    plt.hist(price, bins=20, edgecolor='black')
                 # A bin is a range of values that is used to group the data,
                 # the bins argument specifies the number of bins to use,
                 # the edgecolor argument specifies the
@@ -1231,15 +4764,24 @@ def compare_events(events):
             spinner = Spinner('Processing...')
             spinner.start()
             try:
-                event_dates = [
-                    datetime.strptime(event['event_date_time'],
-                                      '%Y-%m-%d %H:%M:%S').date()
-                    for event in events
-                    if event.get('event_date_time', 'N/A') != 'N/A']
+                if query is not None:
+                    date_counts = {
+                        datetime.strptime(day, '%Y-%m-%d').date(): count
+                        for day, count in get_event_store().date_counts(
+                            query, '%Y-%m-%d')}
+                    # Counted by the store, each day is read back as a date
+                else:
+                    date_counts = Counter(
+                        datetime.strptime(event['event_date_time'],
+                                          '%Y-%m-%d %H:%M:%S').date()
+                        for event in events
+                        if event.get('event_date_time', 'N/A') != 'N/A')
                 # Grab all the event dates from the event_date_time field,
                 # parse the date and time to a datetime object, extract date
-                date_counts = Counter(event_dates)
-                # Count each occurrence of the different dates
+                # and count each occurrence of the different dates
+                if not date_counts:
+                    print('\nNo events with a date to plot.')
+                    continue
                 dates, counts = zip(*sorted(date_counts.items()))
                 # Sort the dates and counts, then unpack them into two lists,
                 # it works by taking the date_counts Counter dictionary with
@@ -1300,7 +4842,10 @@ def get_coordinates(location, api_key):
         f'https://maps.googleapis.com/maps/api/geocode/json?address={location}'
         f'&key={api_key}')
     # Construct the URL for the Google Maps Geocoding API
-    response = requests.get(url, timeout=20)
+    try:
+        response = http_get(url)
+    except requests.RequestException:
+        return None
     # Send a GET request to the URL
     if response.status_code == 200:
         data = response.json()
@@ -1360,14 +4905,93 @@ def find_closest_events(user_location, events, api_key):
     # Return the sorted events in reverse order
 
 
-def sort_events(events):
+def sorted_events_order(choice):
+    """
+    The MongoDB filter and sort order for one of the sort menu's
+    options, matching what sort_events does with a list of events.
+
+    Args:
+        choice (str): The sort menu option, '1' to '4'.
+
+    Returns:
+        tuple: (filter, field, direction), the events are sorted on
+            field and then _id, both in direction.
+    """
+    if choice == '1':
+        return {'is_free': True}, 'price_min', ASCENDING
+        # Free and donation events
+    if choice == '2':
+        return ({'is_free': {'$ne': True}, 'is_sold_out': {'$ne': True},
+                 'price_min': {'$ne': None}}, 'price_min', ASCENDING)
+    if choice == '3':
+        return ({'is_free': {'$ne': True}, 'price_min': {'$ne': None}},
+                'price_min', DESCENDING)
+    return {'event_start': {'$gt': datetime.now()}}, 'event_start', ASCENDING
+
+
+def iter_events_by_id(event_ids):
+    """
+    Load the full stored events with the given _ids, in that order. The
+    events are only read once the generator is iterated.
+
+    Args:
+        event_ids (list): The events' _ids.
+
+    Yields:
+        dict: Each event still stored.
+    """
+    found = get_event_store().events_by_id(event_ids)
+    for event_id in event_ids:
+        if event_id in found:
+            yield found[event_id]
+
+
+def page_sorted_events(query, choice):
+    """
+    Show the stored events matching query sorted by a sort menu option,
+    5 per console page, fetching each page from the store only when the
+    user asks to see more. The events shown can then be saved.
+
+    Args:
+        query (dict): Fields the stored events must equal.
+        choice (str): The sort menu option, '1' to '4'.
+    """
+    shown = []
+    for page in get_event_store().iter_sorted_pages(query, choice):
+        for data in page:
+            print_event(data)
+        shown.extend(event['_id'] for event in page)
+        user_input = input('-------------------------------------'
+                           '\nPress "Y" to see more events, or anything'
+                           ' else to stop: ').strip().lower()
+        if user_input != 'y':
+            break
+    if not shown:
+        print('\n-------------------------------------'
+              '\nNo events found.'
+              '\n-------------------------------------')
+        return
+    offer_to_save(iter_events_by_id(shown))
+    # Summaries were cut short for display, the full events are saved
+
+
+def sort_events(events=None, query=None):
     """
     A menu to sort the collected events by different criteria.
 
     Args:
-        events (list of dict): The user's collected events.
+        events (list of dict, optional): The user's collected events.
+        query (dict, optional): Fields stored events must equal, used
+                                instead of events. Options 1 to 4 are
+                                then sorted and paged by the store, the
+                                events are only loaded to sort by
+                                distance.
     """
-    if len(events) < 2:
+    if query is not None:
+        event_count = get_event_store().count_events(query)
+    else:
+        event_count = len(events)
+    if event_count < 2:
         print('Not enough events to sort.')
         return
 
@@ -1394,7 +5018,11 @@ def sort_events(events):
             # Lambda functions are a powerful tool for writing concise,
             # one-off functions, especially useful in situations like sorting,
             # filtering, and mapping.
-            if choice == '1':
+            if query is not None and choice in ('1', '2', '3', '4'):
+                spinner.stop()
+                page_sorted_events(query, choice)
+                # Sorted by the store on an index, one page at a time
+            elif choice == '1':
                 free_events = [event for event in events if event.get(
                     'event_price', '').lower() in ['free', 'donation']]
             # Filter in events with event_price of 'free' and 'donation' with
@@ -1404,42 +5032,35 @@ def sort_events(events):
                                'data-manipulation-done', 'None')
             # Display the sorted events from bottom to top
             elif choice == '2':
-                cheap_events = [event for event in events if event.get(
-                    'event_price', '').lower() not in ['sold out', 'free']]
-            # Filter out events with event_price of 'free' and 'sold out' with
-            # list comprehension, if not found, return an empty list
-                cheap_events_sorted = sorted(
-                    cheap_events, key=lambda event: extract_price(event.get(
-                        'event_price', '0')))
-            # Sort the remaining events in order based on event_price, the key
-            # argument specifies a custom sorting function for the sorted()
-            # method, and extracts a comparison key from each element.
-            # The lambda function is given as the key argument to the sorted()
-            # method, it takes argument x that represents each element in the
-            # list, and extracts the price from the event_price field
-            # with help from the extract_price function. The sorted() method
-            # will sort the events in ascending order based on extracted price.
+                cheap_events = [
+                    (price['price_min'], event) for event, price in (
+                        (event, parse_event_price(event.get('event_price')))
+                        for event in events) if is_priced(price)]
+            # Keep the priced events with their lowest price, free, donation,
+            # sold out and unpriced events are left out as in the stored sort
+                cheap_events_sorted = [event for _, event in sorted(
+                    cheap_events, key=lambda pair: pair[0])]
+            # Sort the remaining events in ascending order of their lowest
+            # price, the key only compares the prices so events priced the
+            # same keep their order
                 spinner.stop()
                 display_events(cheap_events_sorted[::-1], 0, len(
                     cheap_events_sorted), 'data-manipulation-done', 'None')
             # Display the sorted events from bottom to top,
             # ::-1 is used to reverse the list
             elif choice == '3':
-                paid_events = [event for event in events if event.get(
-                    'event_price', '').lower() not in ['free', 'donation']]
-            # Filter out events with event_price of 'free' and 'donation' with
-            # list comprehension, if not found, return an empty list
-                expensive_events_sorted = sorted(
-                    paid_events, key=lambda event: extract_price(event.get(
-                        'event_price', '0')), reverse=True)
-            # Sort the remaining events in reverse order based on event_price,
-            # the key argument specifies a custom sorting function for the
-            # sorted() method, and extracts a comparison key from each element.
-            # The lambda function is given as the key argument to the sorted()
-            # method, it takes argument x that represents each element in the
-            # list, and extracts the price from the event_price field
-            # with help from the extract_price function. The sorted() method
-            # will sort the events in decending order based on extracted price.
+                paid_events = [
+                    (price['price_min'], event) for event, price in (
+                        (event, parse_event_price(event.get('event_price')))
+                        for event in events)
+                    if is_priced(price, sold_out=True)]
+            # Keep the priced events with their lowest price, free, donation
+            # and unpriced events are left out as in the stored sort
+                expensive_events_sorted = [event for _, event in sorted(
+                    paid_events, key=lambda pair: pair[0], reverse=True)]
+            # Sort the remaining events in descending order of their lowest
+            # price, the key only compares the prices so events priced the
+            # same keep their order
                 spinner.stop()
                 display_events(expensive_events_sorted[::-1], 0, len(
                     expensive_events_sorted), 'data-manipulation-done', 'None')
@@ -1478,6 +5099,8 @@ def sort_events(events):
                 spinner = Spinner("Sorting events...")
                 spinner.start()
                 try:
+                    if events is None:
+                        events = list(load_stored_events(query))
                     api_key = os.getenv('GOOGLE_MAPS_API_KEY')
                     closest_events = find_closest_events(user_location,
                                                          events, api_key)
@@ -1521,12 +5144,15 @@ def sort_events(events):
             return
 
 
-def event_manipulation_menu(events):
+def event_manipulation_menu(events=None, query=None):
     """
     A menu to manipulate the collected events data the user wants to view.
 
     Args:
-        events (list of dict): The user's collected events.
+        events (list of dict, optional): The user's collected events.
+        query (dict, optional): Fields stored events must equal, used
+                                instead of events. Sorting and comparisons
+                                are then worked out by the store.
     """
     while True:
         print('\nChoose an option to manipulate the events data:')
@@ -1536,9 +5162,9 @@ def event_manipulation_menu(events):
         choice = input('Enter your choice: ').strip()
 
         if choice == '1':
-            sort_events(events)
+            sort_events(events, query)
         elif choice == '2':
-            compare_events(events)
+            compare_events(events, query)
         elif choice == '3':
             print('Returning to the main menu.')
             main()
@@ -1555,29 +5181,14 @@ def get_unique_search_keys():
     when the user searches for events, the search key is stored
     along with each event in the collection. This works like a
     class to identify the events under groups of search keys.
+    The keys are read from the small search catalogue collection
+    rather than grouping every event in the collection.
 
     Returns:
         List of strings: A list of all the unique search keys
                         in the collection.
     """
-    pipeline = [
-        {'$group': {'_id': '$search_key'}},
-    ]
-    # A pipeline is a list of operations that MongoDB
-    # applies to the documents in a collection,
-    # the $group operator groups documents by a specified expression,
-    # _id is a system variable that holds the value of the field
-    # that the $group operator groups by, in this case, the search_key field,
-    # without the $ mongodb would treat it as a litteral string
-    # rather than a reference to a field
-    unique_search_keys = list(collection.aggregate(pipeline))
-    # Make a list of all the unique search keys in the collection (mongo db)
-    # and aggregate it against the pipeline
-    # example of the pipeline output: [{'_id': 'data-manipulation_london'},
-    # {'_id': 'data-manipulation_birmingham'}]
-    return [key['_id'] for key in unique_search_keys]
-    # For every key in the unique_search_keys list, return the value
-    # of the item with its '_id' field
+    return [entry['_id'] for entry in get_search_catalogue()]
 
 
 def search_events_in_collection():
@@ -1589,18 +5200,23 @@ def search_events_in_collection():
     Returns:
         List of dict: A list of all the events under the selected search key.
     """
-    unique_search_keys = get_unique_search_keys()
-    user_selection = 'data-manipulation'
+    searches = get_search_catalogue()
+    unique_search_keys = [entry['_id'] for entry in searches]
 
     if len(unique_search_keys) == 0:
         print("No events found in the collection.")
         return
 
     print("-------------------------------------\nChoose a search key:")
-    for i, key in enumerate(unique_search_keys, 1):
+    for i, entry in enumerate(searches, 1):
         # Enumerate will number each unique search key starting from 1,
-        # 'i' will be the number and 'key' will be the search key
-        print(f"{i}. {key}")
+        # 'i' will be the number and 'entry' will be the search
+        last_scraped = entry.get('last_scraped')
+        scraped_note = ''
+        if isinstance(last_scraped, datetime):
+            scraped_note = f', last scraped {last_scraped:%d %b %H:%M}'
+        print(f"{i}. {entry['_id']} ({entry['event_count']} events"
+              f"{scraped_note})")
 
     while True:
         try:
@@ -1612,10 +5228,6 @@ def search_events_in_collection():
                 # of the unique search keys
                 raise IndexError
                 # Raise an IndexError if the choice is out of range
-            all_events = list(collection.find(
-                {'search_key': unique_search_keys[choice_index]}))
-            # Make a list of all mongodb data with the search_key that
-            # matches the user choice
             break
         except ValueError:
             print('\n-------------------------------------'
@@ -1627,31 +5239,44 @@ def search_events_in_collection():
                   f' between 1 and {len(unique_search_keys)}.'
                   f'\n-------------------------------------')
 
-    if not all_events:
+    query = {'search_key': unique_search_keys[choice_index]}
+    # Every event stored with the search_key that matches the user choice
+    shown = display_stored_events(query)
+    if shown != searches[choice_index]['event_count']:
+        update_search_counts([unique_search_keys[choice_index]],
+                             scraped=False)
+        # Events saved again under another search move to its key, the
+        # count of the search they left is put right here
+    if not shown:
         print("No events found for the selected search key.")
         return
 
-    display_events(all_events, 0, len(all_events), user_selection,
-                   search_key=unique_search_keys[int(choice) - 1])
+    params = searches[choice_index].get('params')
+    rerun_option = '\nOr run this search again? (R)' if params else ''
+    # Only searches run since the catalogue was added can be run again
     while True:
         save_choice = input('-------------------------------------'
                             '\nWould you like to save the events to a CSV or'
                             ' Excel file? (C/E)\nOr perform tasks'
-                            ' on the data? (T): ').strip().lower()
+                            f' on the data? (T){rerun_option}: '
+                            ).strip().lower()
         if save_choice == 'c':
             try:
-                save_to_csv(all_events)
+                save_to_csv(load_stored_events(query))
                 return
             except ValueError as e:
                 print(f'Error saving events to CSV: {e}')
         elif save_choice == 'e':
             try:
-                save_to_excel(all_events)
+                save_to_excel(load_stored_events(query))
                 return
             except ValueError as e:
                 print(f'Error saving events to Excel: {e}')
         elif save_choice == 't':
-            event_manipulation_menu(all_events)
+            event_manipulation_menu(query=query)
+        elif save_choice == 'r' and params:
+            run_search(unique_search_keys[choice_index], **params)
+            return
         else:
             print('\n-------------------------------------'
                   '\nInvalid choice. Please C to print to CSV, E to print to'
@@ -1660,20 +5285,47 @@ def search_events_in_collection():
             continue
 
 
+def search_events_by_keyword():
+    """
+    Ask the user for keywords and show the collected events with them in
+    their name, summary, location or organiser, best matches at the
+    bottom, using the event store's text index.
+    """
+    keywords = TEXT_TOKEN_PATTERN.findall(
+        input('Enter keywords to search your collected events for,'
+              ' eg. jazz workshop: ').lower())
+    if not keywords:
+        print('\n-------------------------------------'
+              '\nPlease enter at least one word to search for.'
+              '\n-------------------------------------')
+        return
+    try:
+        events = get_event_store().search_text(keywords, {}, TEXT_SEARCH_LIMIT)
+    except (ValueError, *STORAGE_ERRORS) as e:
+        print(f'Could not search the collection: {e}')
+        return
+    if not events:
+        print(f'\n-------------------------------------'
+              f'\nNo collected events found for: {" ".join(keywords)}'
+              f'\n-------------------------------------')
+        return
+
+    display_events(events[::-1], 0, len(events),
+                   'data-manipulation-done', search_key='None')
+    # Reversed so the best match is shown last, next to the prompt
+
+
 def view_all_events():
     """
     This function displays all the events in the collection
     with the option to save the events to a CSV, Excel file or
     perform tasks on the data.
     """
-    all_events = list(collection.find({}))
-    user_selection = 'data-manipulation'
-    if len(all_events) == 0:
+    query = {}
+    if not display_stored_events(query):
         print('No events found')
         return
 
-    display_events(all_events, 0, len(all_events),
-                   user_selection, search_key='None')
     while True:
         save_choice = input('-------------------------------------'
                             '\nWould you like to save the events to a CSV or'
@@ -1681,18 +5333,18 @@ def view_all_events():
                             ' the data? (T): ').strip().lower()
         if save_choice == 'c':
             try:
-                save_to_csv(all_events)
+                save_to_csv(load_stored_events(query))
                 return
             except ValueError as e:
                 print(f"Error saving events to CSV: {e}")
         elif save_choice == 'e':
             try:
-                save_to_excel(all_events)
+                save_to_excel(load_stored_events(query))
                 return
             except ValueError as e:
                 print(f"Error saving events to Excel: {e}")
         elif save_choice == 't':
-            event_manipulation_menu(all_events)
+            event_manipulation_menu(query=query)
         else:
             print('\n-------------------------------------'
                   '\nInvalid choice. Please C to print to CSV, E to print to'
@@ -1701,6 +5353,72 @@ def view_all_events():
             continue
 
 
+def run_search(search_key, user_selection, location, day='', start_date='',
+               end_date='', category_slug=None, product=None):
+    """
+    Show the events of a search, from the hashtable cache, from the events
+    stored the last time it was run (refreshed in the background) or
+    scraped from scratch. The search is recorded in the search catalogue
+    so it can be run again from the recently searched menu.
+
+    Args:
+        search_key (str): The search's key, eg. 'music_london'.
+        user_selection (str): Which scraper the search uses.
+        location (str): The user given location.
+        day (str, optional): The user given day.
+        start_date (str, optional): The user given event start date.
+        end_date (str, optional): The user given event end date.
+        category_slug (str, optional): The category slug for the top
+                                    categories search.
+        product (str, optional): The users given event type.
+    """
+    record_search(search_key, {
+        'user_selection': user_selection, 'location': location, 'day': day,
+        'start_date': start_date, 'end_date': end_date,
+        'category_slug': category_slug, 'product': product})
+    spinner = Spinner("Fetching events...")
+    spinner.start()
+    unique_events = []
+    tags_counter = Counter()
+    page_number = 1
+    stream = None
+
+    try:
+        # Check if the search term is in the cache
+        if search_key in cache:
+            spinner.stop()
+            print("Using cached events from hashtable.")
+            unique_events = cache[search_key]
+        else:
+            unique_events.extend(find_stored_search(search_key))
+            spinner.stop()
+            if unique_events:
+                print(f'Showing the {len(unique_events)} events saved the'
+                      f' last time this was searched, checking Eventbrite'
+                      f' for new and changed events in the background.')
+            else:
+                print('Loading times may vary depending on'
+                      ' the scope of the search.'
+                      '\nBroader searches may take longer to load.'
+                      ' Avrg time: 20sec-3min')
+            stream = start_event_stream(
+                user_selection, location, day, start_date, end_date,
+                category_slug, product, page_number, unique_events,
+                merge=bool(unique_events))
+            # Events are shown as they are scraped, the stream keeps
+            # filling unique_events in the background
+    finally:
+        spinner.stop()
+
+    result = display_paginated_events(
+        unique_events, search_key, user_selection, location, day,
+        start_date, end_date, tags_counter, category_slug=category_slug,
+        product=product, page_number=page_number, stream=stream)
+
+    if result == 'new_search':
+        main()
+
+
 def search_events():
     """
     Option 1 on the main menu, allows the user to search for events
@@ -1717,7 +5435,6 @@ def search_events():
     start_date = ''
     end_date = ''
     day = ''
-    tags_counter = Counter()
 
     if date_choice == 'y':
         print('Please enter an option: ')
@@ -1737,40 +5454,22 @@ def search_events():
             end_date = input('Enter the end date (YYYY-MM-DD): ')
 
     search_key = f'{product}_{location}'
-    user_selection = 'eventbrite'
-    spinner = Spinner("Fetching events...")
-    spinner.start()
-    unique_events = []
-    page_number = 1
+    run_search(search_key, 'eventbrite', location, day, start_date,
+               end_date, product=product)
 
-    try:
-        # Check if the search term is in the cache
-        if search_key in cache:
-            spinner.stop()
-            print("Using cached events from hashtable.")
-            unique_events = cache[search_key]
-        else:
-            spinner.stop()
-            print('Loading times may vary depending on'
-                  ' the scope of the search.'
-                  '\nBroader searches may take longer to load.'
-                  ' Avrg time: 20sec-3min')
-            spinner = Spinner("Scraping new events...")
-            spinner.start()
-            events_data, tags_counter, _ = scrape_eventbrite_events(
-                location, day, product, page_number, start_date, end_date)
-            unique_events.extend(events_data)
-            cache[search_key] = unique_events
-    finally:
-        spinner.stop()
 
-    result = display_paginated_events(
-        unique_events, search_key, user_selection, location, day,
-        start_date, end_date, tags_counter, product, page_number)
+def generate_slug(category):
+    """
+    Turn a category name into the slug Eventbrite uses in its URLs.
 
-    if result == 'new_search':
-        main()
-        return
+    Args:
+        category (str): eg. 'Food & Drink'.
+
+    Returns:
+        str: eg. 'food-and-drink'.
+    """
+    category = category.replace('&', 'and')
+    return re.sub(r'\s+', '-', category.strip().lower())
 
 
 def search_top_categories():
@@ -1782,18 +5481,7 @@ def search_top_categories():
         List of dict: A list of scraped events from the selected category,
                     and optional location and date range.
     """
-    categories = [
-        'Home & Lifestyle', 'Business', 'Health', 'Performing & Visual Arts',
-        'Family & Education', 'Holidays', 'Music', 'Community',
-        'Hobbies', 'Charity & Causes', 'Food & Drink', 'Science & Tech',
-        'Sports & Fitness', 'Travel & Outdoor', 'Spirituality', 'Nightlife',
-        'Dating', 'Film & Media', 'Fashion', 'Government', 'Auto, Boat & Air',
-        'School Activities'
-    ]
-
-    user_selection = 'eventbrite_top'
-    product = None
-    tags_counter = Counter()
+    categories = TOP_CATEGORIES
 
     def display_categories():
         print('\nPlease choose a category:')
@@ -1817,10 +5505,6 @@ def search_top_categories():
                       '\nInvalid input. Please enter a number.'
                       '\n-------------------------------------')
 
-    def generate_slug(category):
-        category = category.replace('&', 'and')
-        return re.sub(r'\s+', '-', category.strip().lower())
-
     country = 'united-kingdom'
     location = input('Enter location: ').replace(' ', '')
     print('Would you like to enter a date? (Y/N)')
@@ -1849,42 +5533,8 @@ def search_top_categories():
     display_categories()
     category = get_user_choice()
     search_key = f'{generate_slug(category)}_{location}_{country}'
-    spinner = Spinner("Fetching events...")
-    spinner.start()
-    category_slug = generate_slug(category)
-    unique_events = []
-    page_number = 1
-
-    try:
-        # Check if the search term is in the cache
-        if search_key in cache:
-            spinner.stop()
-            print("Using cached events from hashtable.")
-            unique_events = cache[search_key]
-        else:
-            spinner.stop()
-            print('Loading times may vary depending on'
-                  ' the scope of the search.'
-                  '\nBroader searches may take longer to load.'
-                  ' Avrg time: 20sec-3min')
-            spinner = Spinner("Scraping new events...")
-            spinner.start()
-            events_data, tags_counter, _ = scrape_eventbrite_categories(
-                location, category_slug, day, page_number,
-                start_date, end_date)
-            unique_events.extend(events_data)
-            cache[search_key] = unique_events
-    finally:
-        spinner.stop()
-
-    result = display_paginated_events(
-        unique_events, search_key, user_selection, location, day,
-        start_date, end_date, tags_counter, category_slug, product,
-        page_number)
-
-    if result == 'new_search':
-        main()
-        return
+    run_search(search_key, 'eventbrite_top', location, day, start_date,
+               end_date, category_slug=generate_slug(category))
 
 
 def search_top_events():
@@ -1898,41 +5548,7 @@ def search_top_events():
     """
     location = input('Enter location: ').replace(' ', '')
     search_key = f'all_top_events_{location}'
-    spinner = Spinner("Fetching events...")
-    spinner.start()
-    unique_events = []
-    user_selection = 'eventbrite_top_no_category'
-    day = ''
-    start_date = ''
-    end_date = ''
-    tags_counter = Counter()
-
-    try:
-        if search_key in cache:
-            spinner.stop()
-            print("Using cached events from hashtable.")
-            unique_events = cache[search_key]
-        else:
-            spinner.stop()
-            print('Loading times may vary depending on'
-                  ' the scope of the search.'
-                  '\nBroader searches may take longer to load.'
-                  ' Avrg time: 20sec-3min')
-            spinner = Spinner("Scraping new events...")
-            spinner.start()
-            events_data, tags_counter, _ = scrape_eventbrite_top_events(
-                location)
-            unique_events.extend(events_data)
-            cache[search_key] = unique_events
-    finally:
-        spinner.stop()
-
-    result = display_paginated_events(
-        unique_events, search_key, user_selection, location,
-        day, start_date, end_date, tags_counter)
-    if result == 'new_search':
-        main()
-        return
+    run_search(search_key, 'eventbrite_top_no_category', location)
 
 
 def display_common_tags(tags_counter):
@@ -1957,6 +5573,561 @@ def display_common_tags(tags_counter):
             print(f'{tag}: {count}')
 
 
+def parse_date_window(window):
+    """
+    Turn a crawl date window into the day, start_date and end_date the
+    scrapers take.
+
+    Args:
+        window (str): 'any', 'today', 'tomorrow', 'this-weekend' or a
+                    'YYYY-MM-DD:YYYY-MM-DD' range (or a single date).
+
+    Returns:
+        tuple: (day, start_date, end_date).
+
+    Raises:
+        ValueError: If the window isn't one of the above.
+    """
+    if window in ('', 'any'):
+        return '', '', ''
+    if window in ('today', 'tomorrow', 'this-weekend'):
+        return window, '', ''
+    start_date, _, end_date = window.partition(':')
+    end_date = end_date or start_date
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"'{window}' isn't a date window, use 'any',"
+                         " 'today', 'tomorrow', 'this-weekend' or"
+                         " YYYY-MM-DD:YYYY-MM-DD") from None
+    return '', start_date, end_date
+
+
+def init_crawl_worker(rate_per_host):
+    """
+    Runs once in each crawl worker process. Every process paces its own
+    requests, so each one gets a share of the per-host rate.
+
+    Args:
+        rate_per_host (float): Requests per second this process may send
+                            to each host.
+    """
+    global HTTP_RATE_PER_HOST  # pylint: disable=global-statement
+    HTTP_RATE_PER_HOST = rate_per_host
+
+
+def crawl_listing_page(task):
+    """
+    Scrape one listing page of a category search, run in a crawl
+    worker process.
+
+    Args:
+        task (tuple): (location, category_slug, date window, page_number).
+
+    Returns:
+        tuple: The task, the scraped events, more_events_check, the
+            seconds the page took, and the worker's process ID with its
+            http_session_stats so far.
+    """
+    location, category_slug, window, page_number = task
+    day, start_date, end_date = parse_date_window(window)
+    started = time.perf_counter()
+    event_data, _, more_events_check = scrape_eventbrite_categories(
+        location, category_slug, day, page_number, start_date, end_date)
+    return (task, event_data, more_events_check,
+            time.perf_counter() - started, os.getpid(), http_session_stats())
+
+
+def bulk_crawl(locations, categories, windows, pages, processes=None):
+    """
+    Crawl every combination of location, category and date window without
+    the menus, spreading the listing pages across a pool of processes, and
+    save the events to MongoDB under the same search keys as option 3.
+
+    Args:
+        locations (list of str): Locations to search, eg. ['london'].
+        categories (list of str): Category names or slugs.
+        windows (list of str): Date windows, see parse_date_window.
+        pages (int): The most listing pages to scrape per search.
+        processes (int, optional): Worker processes. Defaults to the
+                                number of CPUs.
+
+    Returns:
+        dict: The crawl's totals, also printed as a summary.
+    """
+    processes = processes or os.cpu_count() or 1
+    for window in windows:
+        parse_date_window(window)
+        # Fail before starting any work if a window is mistyped
+    searches = [(location.replace(' ', '').lower(), generate_slug(category),
+                 window) for location in locations
+                for category in categories for window in windows]
+    totals = Counter()
+    writes = Counter()
+    tasks = []
+    for location, category_slug, window in searches:
+        last_page = pages
+        day, start_date, end_date = parse_date_window(window)
+        record_search(f'{category_slug}_{location}_united-kingdom', {
+            'user_selection': 'eventbrite_top', 'location': location,
+            'day': day, 'start_date': start_date, 'end_date': end_date,
+            'category_slug': category_slug, 'product': None})
+        # So a crawled search can be run again from the menu
+        frontier = get_crawl_frontier(eventbrite_category_url(
+            location, category_slug, day, 1, start_date, end_date))
+        if frontier is not None:
+            known_last_page = frontier.last_page()
+            if known_last_page is not None and known_last_page < pages:
+                totals['skipped_pages'] += pages - known_last_page
+                last_page = known_last_page
+            # An earlier crawl of this search already found its last page
+        tasks.extend((location, category_slug, window, page_number)
+                     for page_number in range(1, last_page + 1))
+    unique_urls = set()
+    worker_http = {}
+    # Each worker's latest http_session_stats, by process ID, the counts
+    # are running totals for the worker's own session
+    started = time.perf_counter()
+
+    print(f'Crawling {len(searches)} searches ({len(tasks)} listing pages)'
+          f' with {processes} processes...')
+    with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_crawl_worker,
+            initargs=(HTTP_RATE_PER_HOST / processes,)) as executor:
+        # spawn starts each worker with a fresh import, so no worker
+        # shares the parent's database connection. Importing run.py has
+        # no side effects, a worker only connects when it first looks up
+        # fresh events.
+        futures = {executor.submit(crawl_listing_page, task): task
+                   for task in tasks}
+        for future in as_completed(futures):
+            location, category_slug, window, page_number = futures[future]
+            if future.cancelled():
+                continue
+            try:
+                (_, event_data, more_events_check, _, pid,
+                 worker_http[pid]) = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                totals['failed_pages'] += 1
+                print(f'Page {page_number} of {category_slug} in {location}'
+                      f' ({window or "any"}) failed: {e}')
+                continue
+
+            totals['pages'] += 1
+            totals['events'] += len(event_data)
+            unique_urls.update(event['url'] for event in event_data)
+            writes.update(save_to_mongodb(
+                f'{category_slug}_{location}_united-kingdom', event_data))
+            # The same search key option 3 uses, so crawled searches show
+            # up in the recently searched menu
+
+            if not more_events_check:
+                for other, other_task in futures.items():
+                    if (other_task[:3] == (location, category_slug, window)
+                            and other_task[3] > page_number
+                            and other.cancel()):
+                        totals['skipped_pages'] += 1
+                # No point scraping pages after the last one with events
+
+    http = Counter()
+    for stats in worker_http.values():
+        http.update(stats)
+    elapsed = time.perf_counter() - started
+    summary = {
+        'searches': len(searches),
+        'pages': totals['pages'],
+        'failed_pages': totals['failed_pages'],
+        'skipped_pages': totals['skipped_pages'],
+        'events': totals['events'],
+        'unique_events': len(unique_urls),
+        'inserted': writes['inserted'],
+        'modified': writes['modified'],
+        'failed_writes': writes['failed'],
+        'http': dict(http),
+        'elapsed_sec': round(elapsed, 1),
+        'events_per_sec': round(totals['events'] / elapsed, 2),
+        'pages_per_sec': round(totals['pages'] / elapsed, 2),
+    }
+    print(f'\n-------------------------------------'
+          f'\nCrawl finished in {summary["elapsed_sec"]}s'
+          f'\nListing pages scraped: {summary["pages"]}'
+          f' ({summary["failed_pages"]} failed,'
+          f' {summary["skipped_pages"]} skipped)'
+          f'\nEvents scraped: {summary["events"]}'
+          f' ({summary["unique_events"]} unique)'
+          f'\nSaved to {get_event_store().LABEL}:'
+          f' {summary["inserted"]} new,'
+          f' {summary["modified"]} updated,'
+          f' {summary["failed_writes"]} failed'
+          f'\nThroughput: {summary["events_per_sec"]} events/sec,'
+          f' {summary["pages_per_sec"]} pages/sec'
+          f'\nHTTP: {http["requests"]} requests,'
+          f' {http["connections_opened"]} connections opened,'
+          f' {http["connections_reused"]} reused,'
+          f' {http["paced"]} paced, {http["throttled"]} throttled,'
+          f' {http["retried"]} retried,'
+          f' {http["circuit_opened"]} circuit breaks'
+          f'\n-------------------------------------')
+    return summary
+
+
+def reprocess_archive(directory=None, batch_size=1000):
+    """
+    Parse every archived event detail page again with the current
+    extraction rules and update the stored events to match, without
+    fetching anything. Only fields a rule matched on the page are written,
+    so a rule that stopped matching doesn't overwrite good data with its
+    default, while a value that happens to equal the default (a 'Free'
+    price) still corrects the stored one. Archived listing pages are
+    counted but not reprocessed, the events on them are updated from
+    their detail pages.
+
+    Args:
+        directory (str, optional): The archive to read.
+                                Defaults to ARCHIVE_DIR.
+        batch_size (int, optional): Updates sent to the store at a time.
+
+    Returns:
+        dict: The reprocessing totals, also printed as a summary.
+    """
+    directory = directory or ARCHIVE_DIR
+    if not directory or not os.path.isdir(directory):
+        raise ValueError('No page archive found, set ARCHIVE_DIR'
+                         ' or pass --archive-dir')
+    archive = PageArchive(directory, ARCHIVE_SEGMENT_BYTES)
+    totals = Counter()
+    updates = []
+    started = time.perf_counter()
+
+    def flush_updates():
+        if not updates:
+            return
+        try:
+            totals.update(get_event_store().update_events(updates))
+        except STORAGE_ERRORS as e:
+            totals['failed'] += len(updates)
+            print(f'Error updating events: {e}')
+        updates.clear()
+
+    for url, _, content in archive.iter_latest():
+        totals['pages'] += 1
+        if HttpDiskCache.url_class(url) != 'detail':
+            continue
+        fields = extract_matched_details(content)
+        if not fields['tags']:
+            del fields['tags']
+            # No tags on the page is as likely a layout change as none set
+        if 'show_date_time' in fields:
+            fields['event_date_time'] = parsed_scraped_date(
+                fields['show_date_time'])
+            fields['event_start'] = parse_event_start(
+                fields['event_date_time'])
+        if 'event_price' in fields:
+            fields.update(parse_event_price(fields['event_price']))
+        totals['details'] += 1
+        if fields:
+            updates.append((url, fields))
+        if len(updates) >= batch_size:
+            flush_updates()
+    flush_updates()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'pages': totals['pages'],
+        'detail_pages': totals['details'],
+        'events_matched': totals['matched'],
+        'events_updated': totals['modified'],
+        'failed_updates': totals['failed'],
+        'elapsed_sec': round(elapsed, 1),
+        'pages_per_sec': round(totals['pages'] / elapsed, 1)
+        if elapsed else 0.0,
+    }
+    print(f'\n-------------------------------------'
+          f'\nReprocessed {summary["pages"]} archived pages'
+          f' ({summary["detail_pages"]} event pages)'
+          f' in {summary["elapsed_sec"]}s,'
+          f' {summary["pages_per_sec"]} pages/sec'
+          f'\nEvents matched: {summary["events_matched"]},'
+          f' updated: {summary["events_updated"]},'
+          f' failed: {summary["failed_updates"]}'
+          f'\n-------------------------------------')
+    return summary
+
+
+def crawl_organisers(top=20, max_workers=None):
+    """
+    Grow the collection from the organisers it already knows, rather than
+    with broad searches that mostly return events already stored. The
+    pages of the organisers with the most stored events are fetched
+    concurrently, and detail pages are only fetched for the events on
+    them that aren't in the collection yet.
+
+    Args:
+        top (int, optional): How many organisers to crawl. Defaults to 20.
+        max_workers (int, optional): How many pages to fetch at once.
+                                    Defaults to SCRAPE_WORKERS.
+
+    Returns:
+        dict: The crawl's totals, also printed as a summary.
+    """
+    max_workers = max_workers or SCRAPE_WORKERS
+    started = time.perf_counter()
+    organisers = find_top_organisers(top)
+    totals = Counter()
+    found_events = []
+    new_events = []
+    search_keys = []
+
+    print(f'Crawling the pages of {len(organisers)} organisers...')
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        organiser_pages = executor.map(
+            scrape_organiser_page,
+            [urljoin(EVENTBRITE_UK_URL, organiser['_id'])
+             for organiser in organisers])
+        for organiser, found in zip(organisers, organiser_pages):
+            search_key = 'organiser_' + urlsplit(
+                organiser['_id']).path.rstrip('/').rsplit('/', 1)[-1]
+            totals['found'] += len(found)
+            found_events.extend((search_key, event_info)
+                                for event_info in found)
+
+    known_keys = get_event_store().stored_event_keys(
+        [event_info['url'] for _, event_info in found_events])
+    # Matched by event ID, the same event is stored under differently
+    # formatted URLs
+    for search_key, event_info in found_events:
+        key = event_url_key(event_info['url'])
+        if key in known_keys:
+            totals['known'] += 1
+            continue
+        known_keys.add(key)
+        new_events.append(event_info)
+        search_keys.append(search_key)
+
+    scraped = {}
+    for search_key, (event_info, event_tags) in zip(
+            search_keys, iter_event_details(
+                new_events, scrape_event_detail, max_workers)):
+        # Every new event from every organiser shares the one pool,
+        # results come back in the order they were queued
+        if event_info is None:
+            totals['failed'] += 1
+            continue
+        event_info['tags'] = event_tags
+        scraped.setdefault(search_key, []).append(event_info)
+    for search_key, events in scraped.items():
+        counts = save_to_mongodb(search_key, events)
+        totals['inserted'] += counts['inserted']
+        totals['write_failed'] += counts['failed']
+        # Kept apart from 'failed', which counts detail pages that
+        # couldn't be fetched
+        totals['saved'] += len(events)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'organisers': len(organisers),
+        'events_found': totals['found'],
+        'already_stored': totals['known'],
+        'new_events': totals['saved'],
+        'failed_events': totals['failed'],
+        'failed_writes': totals['write_failed'],
+        'inserted': totals['inserted'],
+        'elapsed_sec': round(elapsed, 1),
+    }
+    print(f'\n-------------------------------------'
+          f'\nCrawled {summary["organisers"]} organisers'
+          f' in {summary["elapsed_sec"]}s'
+          f'\nEvents found: {summary["events_found"]}'
+          f' ({summary["already_stored"]} already stored)'
+          f'\nNew events saved: {summary["new_events"]}'
+          f' ({summary["failed_events"]} failed,'
+          f' {summary["inserted"]} added to {get_event_store().LABEL},'
+          f' {summary["failed_writes"]} could not be written)'
+          f'\n-------------------------------------')
+    return summary
+
+
+def migrate_typed_fields(batch_size=1000, redo=False):
+    """
+    Backfill the native date and price fields (see typed_event_fields) on
+    events saved before they existed, a batch of updates at a time.
+
+    Args:
+        batch_size (int, optional): Updates sent to the store at a time.
+        redo (bool, optional): Rebuild the fields on every event, eg. after
+                            the price parsing changes. Defaults to False.
+
+    Returns:
+        dict: The migration totals, also printed as a summary.
+    """
+    event_writer.flush()
+    started = time.perf_counter()
+    totals = Counter()
+    updates = []
+
+    def flush_updates():
+        if not updates:
+            return
+        try:
+            totals.update(get_event_store().update_events(updates))
+        except STORAGE_ERRORS as e:
+            totals['failed'] += len(updates)
+            print(f'Error updating events: {e}')
+        updates.clear()
+
+    for event in get_event_store().iter_untyped_events(redo):
+        # Only the fields the new ones are worked out from
+        totals['events'] += 1
+        updates.append((event['url'], typed_event_fields(event)))
+        if len(updates) >= batch_size:
+            flush_updates()
+    flush_updates()
+
+    summary = {
+        'events': totals['events'],
+        'updated': totals['modified'],
+        'failed': totals['failed'],
+        'elapsed_sec': round(time.perf_counter() - started, 1),
+    }
+    print(f'\n-------------------------------------'
+          f'\nMigrated {summary["events"]} events'
+          f' in {summary["elapsed_sec"]}s'
+          f' ({summary["updated"]} updated, {summary["failed"]} failed)'
+          f'\n-------------------------------------')
+    return summary
+
+
+def summarise_explain(explain_output):
+    """
+    Pull the parts that matter out of MongoDB explain output: how the
+    query was run and how much it read to do it.
+
+    Args:
+        explain_output (dict): What explain returned for a find
+                            or an aggregate.
+
+    Returns:
+        dict: The winning plan's 'stages' and 'indexes', and the keys and
+            documents examined, documents returned and milliseconds taken
+            (None where explain didn't report them).
+    """
+    if 'stages' in explain_output:
+        explain_output = explain_output['stages'][0].get('$cursor', {})
+        # An aggregate's first stage holds the plan of its query
+    plan = explain_output.get('queryPlanner', {}).get('winningPlan', {})
+    plan = plan.get('queryPlan', plan)
+    # Newer servers nest the plan one level deeper
+    stages = []
+    indexes = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        stages.append(node.get('stage', '?'))
+        if node.get('indexName'):
+            indexes.append(node['indexName'])
+        nodes.extend(node.get('inputStages', []))
+        if 'inputStage' in node:
+            nodes.append(node['inputStage'])
+    stats = explain_output.get('executionStats', {})
+    return {
+        'stages': stages,
+        'indexes': indexes,
+        'keys_examined': stats.get('totalKeysExamined'),
+        'docs_examined': stats.get('totalDocsExamined'),
+        'returned': stats.get('nReturned'),
+        'millis': stats.get('executionTimeMillis'),
+    }
+
+
+def run_diagnostics():
+    """
+    Make sure the indexes exist, then show them and how the event store
+    runs the queries the program runs most, see
+    MongoEventStore.diagnostics and SQLiteEventStore.diagnostics.
+
+    Returns:
+        dict: Each query's label mapped to its plan.
+    """
+    ensure_indexes()
+    return get_event_store().diagnostics()
+
+
+def run_cli(argv):
+    """
+    Run one of the command line tasks instead of the menus,
+    eg. 'python run.py crawl --locations london leeds --pages 2'.
+
+    Args:
+        argv (list of str): The command line arguments.
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog='run.py', description='Event Hoarder command line tasks,'
+        ' run without any arguments for the menus.')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    crawl_parser = commands.add_parser(
+        'crawl', help='scrape categories across locations into the event'
+        ' store')
+    crawl_parser.add_argument('--locations', nargs='+', required=True)
+    crawl_parser.add_argument(
+        '--categories', nargs='+', default=TOP_CATEGORIES,
+        help='category names or slugs, all top categories by default')
+    crawl_parser.add_argument(
+        '--dates', nargs='+', default=['any'],
+        help="'any', 'today', 'tomorrow', 'this-weekend'"
+        " or YYYY-MM-DD:YYYY-MM-DD")
+    crawl_parser.add_argument('--pages', type=int, default=3)
+    crawl_parser.add_argument('--processes', type=int, default=None)
+    crawl_parser.set_defaults(handler=lambda args: bulk_crawl(
+        args.locations, args.categories, args.dates, args.pages,
+        args.processes))
+
+    reprocess_parser = commands.add_parser(
+        'reprocess', help='parse archived event detail pages again and'
+        ' update the stored events, listing pages are not reprocessed')
+    reprocess_parser.add_argument(
+        '--archive-dir', default=None,
+        help='the page archive to read, ARCHIVE_DIR by default')
+    reprocess_parser.set_defaults(
+        handler=lambda args: reprocess_archive(args.archive_dir))
+
+    organisers_parser = commands.add_parser(
+        'organisers', help="scrape new events from the top organisers'"
+        " pages into the event store")
+    organisers_parser.add_argument(
+        '--top', type=int, default=20,
+        help='how many of the organisers with the most events to crawl')
+    organisers_parser.add_argument('--workers', type=int, default=None)
+    organisers_parser.set_defaults(handler=lambda args: crawl_organisers(
+        args.top, args.workers))
+
+    migrate_parser = commands.add_parser(
+        'migrate', help='add the native date and price fields to'
+        ' stored events')
+    migrate_parser.add_argument(
+        '--redo', action='store_true',
+        help='rebuild the fields on every event, not just the ones'
+        ' without them')
+    migrate_parser.set_defaults(handler=lambda args: migrate_typed_fields(
+        redo=args.redo))
+
+    diagnostics_parser = commands.add_parser(
+        'diagnostics', help='create the indexes and explain how the main'
+        ' queries use them')
+    diagnostics_parser.set_defaults(handler=lambda args: run_diagnostics())
+
+    args = arg_parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except ValueError as e:
+        arg_parser.error(str(e))
+    except STORAGE_ERRORS as e:
+        arg_parser.exit(1, f'Event store error: {e}\n')
+
+
 def main():
     """
     The first function to run when the program starts.
@@ -2008,7 +6179,9 @@ def main():
             else:
                 continue
         elif choice == '#':
-            collection.delete_many({})
+            event_writer.flush()
+            # Otherwise events still being written would reappear
+            get_event_store().clear()
             print('-------------------------------------'
                   '\nDatabase cleared\n-------------------------------------.')
             main()
@@ -2019,12 +6192,59 @@ def main():
                   '\n-------------------------------------')
 
 
+def start_event_stream(user_selection, location, day, start_date, end_date,
+                       category_slug, product, page_number, events,
+                       merge=False):
+    """
+    Start scraping a page of events in the background for the search
+    the user is viewing.
+
+    Args:
+        user_selection (str): Which scraper the search uses.
+        location (str): The user given location.
+        day (str): The user given day.
+        start_date (str): The user given event start date.
+        end_date (str): The user given event end date.
+        category_slug (str): The category slug for category searches.
+        product (str): The users given event type.
+        page_number (int): The page of search results to scrape.
+        events (list of dict): The list the scraped events are added to.
+        merge (bool, optional): Replace events already in the list, for
+                            refreshing stored results. The page is then
+                            scraped with revalidate, so the refresh
+                            checks Eventbrite for changes.
+                            Defaults to False.
+
+    Returns:
+        EventStream: The running stream, or None if user_selection
+                    isn't an Eventbrite search.
+    """
+    if user_selection == 'eventbrite':
+        event_iterator = iter_eventbrite_events(
+            location, day, product, page_number, start_date, end_date,
+            revalidate=merge)
+    elif user_selection == 'eventbrite_top':
+        event_iterator = iter_eventbrite_categories(
+            location, category_slug, day, page_number, start_date, end_date,
+            revalidate=merge)
+    elif user_selection == 'eventbrite_top_no_category':
+        event_iterator = iter_eventbrite_top_events(location,
+                                                    revalidate=merge)
+    else:
+        return None
+    return EventStream(event_iterator, events, merge)
+
+
 def display_paginated_events(unique_events, search_key, user_selection,
                              location, day, start_date, end_date, tags_counter,
-                             category_slug=None, product=None, page_number=1):
+                             category_slug=None, product=None, page_number=1,
+                             stream=None):
     """
     Display the scraped events in a paginated format with 5 per
     console page and fetch more events if requested and available.
+    Events are shown as soon as they have been scraped, the rest of
+    the page keeps loading in the background, and the next page starts
+    loading before the user reaches the end of this one.
 
     Args:
        - unique_events (list of dict): A list of unique scraped events.
@@ -2043,93 +6263,118 @@ def display_paginated_events(unique_events, search_key, user_selection,
                                     Defaults to None.
        - page_number (int, optional): Page number used for URL pagination.
                                     Defaults to 1.
+       - stream (EventStream, optional): A stream still adding events to
+                                        unique_events. Defaults to None.
 
     Returns:
         str: 'done' if the user is done viewing events or no more events,
         'new_search' if the user wants to start a new search.
     """
     page_size = 5
-    total_events = len(unique_events)
-    current_page = 0
+    start_index = 0
+    # Where the next console page of events starts
     more_events_check = True
-    should_break = False
-
-    while more_events_check:
-        start_index = current_page * page_size
-        # The start index is the current page number multiplied by the page
-        # size (number of events per console page)
-        end_index = min(start_index + page_size, total_events)
-        # The end index is the minimum of the start index plus the page size
-        # and the total number of events
-        display_events(unique_events, start_index,
-                       end_index, user_selection, search_key)
-
-        if end_index >= total_events:
-            # Fetch more events if available
-            page_number += 1
-            print('Loading times may vary depending on'
-                  ' the scope of the search.'
-                  '\nBroader searches may take longer to load.'
-                  ' Avrg time: 20sec-3min')
-            spinner = Spinner("Fetching more events...")
-            spinner.start()
-            try:
-                if user_selection == 'eventbrite':
-                    events_data, new_tags_counter, more_events_check = \
-                        scrape_eventbrite_events(
-                            location, day, product,
-                            page_number, start_date, end_date)
-                elif user_selection == 'eventbrite_top':
-                    events_data, new_tags_counter, more_events_check = \
-                        scrape_eventbrite_categories(
-                            location, category_slug, day,
-                            page_number, start_date, end_date)
-                elif user_selection == 'eventbrite_top_no_category':
-                    events_data, new_tags_counter, more_events_check = \
-                        scrape_eventbrite_top_events(location)
-                else:
-                    break
+    merge = stream is not None and stream.merge
+    # Refreshing stored results, the later pages are merged in too
+    prefetcher = ListingPrefetcher(
+        lambda next_page, events: start_event_stream(
+            user_selection, location, day, start_date, end_date,
+            category_slug, product, next_page, events, merge))
 
-                print(f'Fetched {len(events_data)}'
-                      f' events for page number: {page_number} ')
-                unique_events.extend(events_data)
-                # Add the new events to the unique events list
-                tags_counter.update(new_tags_counter)
-                # Update the tags counter with the new tags
-                total_events = len(unique_events)
-                # Update the total number of events
-                print(f'Total events after fetching: {total_events}'
-                      '\nNext page of events has been fetched.'
-                      '\nYou may press "Y" and view more events.')
-                # Display the most common tags
-                display_common_tags(tags_counter)
-            finally:
-                spinner.stop()
+    try:
+        while True:
+            if stream is not None:
+                if stream.wait_for(0) < start_index + page_size:
+                    spinner = Spinner("Fetching more events...")
+                    spinner.start()
+                    try:
+                        stream.wait_for(start_index + page_size)
+                        # Only wait for the events this console page
+                        # shows, not for the whole Eventbrite page
+                    finally:
+                        spinner.stop()
+                if stream.done:
+                    more_events_check = stream.more_events_check
+                    if not more_events_check:
+                        prefetcher.cancel()
+                        # The pages after the last one won't have events
+                    tags_counter.update(stream.tags_counter)
+                    # Update the tags counter with the new tags
+                    print(f'Fetched {stream.fetched()}'
+                          f' events for page number: {page_number} ')
+                    if stream.merge:
+                        print(f'{len(stream.changed)} of them were new or'
+                              f' had changed since they were stored')
+                        save_to_mongodb(search_key, stream.changed,
+                                        wait=False)
+                        # Keep the stored results up to date for the
+                        # next time this search is run
+                    print(f'Total events after fetching: '
+                          f'{len(unique_events)}')
+                    display_common_tags(tags_counter)
+                    # Display the most common tags
+                    stream = None
+
+            total_events = len(unique_events)
+            end_index = min(start_index + page_size, total_events)
+            # The end index is the minimum of the start index plus the page
+            # size and the total number of events
+            display_events(unique_events, start_index,
+                           end_index, user_selection, search_key)
+
+            if (stream is None and more_events_check
+                    and total_events - end_index <= PREFETCH_THRESHOLD):
+                prefetcher.prefetch(page_number)
+                # Nearly at the end of what has been loaded, start
+                # fetching the next page while the user reads these
+
+            if end_index >= total_events and stream is None:
                 if not more_events_check:
                     print("No more events to fetch.")
-                    should_break = True
-
-            if should_break:
-                break
-
-        user_input = input('-------------------------------------'
-                           '\nPress "Y" to see more events, "T" to quickly go'
-                           ' and view/manipulate this data\n'
-                           '"S" go back to main menu: ').strip().lower()
-        if user_input == 's':
-            return 'new_search'
-        elif user_input == 't':
-            collection_menu()
-        elif user_input == 'y':
-            current_page += 1
-        else:
-            print('\n-------------------------------------'
-                  '\nInvalid choice. Please try again.'
-                  '\n-------------------------------------')
-            continue
+                    break
+                # Fetch more events if available
+                page_number += 1
+                stream = prefetcher.take(page_number, unique_events)
+                if stream is None:
+                    break
+                print('Fetching the next page of events in the background.'
+                      '\nYou may press "Y" and view more events'
+                      ' as they arrive.')
+
+            user_input = input('-------------------------------------'
+                               '\nPress "Y" to see more events, "T" to'
+                               ' quickly go and view/manipulate this data\n'
+                               '"S" go back to main menu: ').strip().lower()
+            if user_input == 's':
+                return 'new_search'
+            elif user_input == 't':
+                collection_menu()
+            elif user_input == 'y':
+                start_index = end_index
+                # Carry on from the last event shown, so a short console
+                # page doesn't skip the first events of the next page
+            else:
+                print('\n-------------------------------------'
+                      '\nInvalid choice. Please try again.'
+                      '\n-------------------------------------')
+                continue
+    finally:
+        if stream is not None:
+            stream.stop()
+        prefetcher.cancel()
+        # Stop scraping in the background once the user leaves
 
     return 'done'
 
 
 if __name__ == "__main__":
-    main()
+    write_google_credentials()
+    start_expiry_sweep()
+    prune_crawl_state()
+    # Done here rather than on import, so importing run.py (as every
+    # crawl worker process does) doesn't write the credentials, open
+    # the event store or build its indexes
+    if len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+    else:
+        main()